@@ -2,13 +2,14 @@
 
 from paty.bus.events import AudioStream, BusAction, BusCommand, Event, EventType
 from paty.bus.observer import BusObserver
-from paty.bus.server import WebSocketBus
+from paty.bus.server import BusSession, WebSocketBus
 
 __all__ = [
     "AudioStream",
     "BusAction",
     "BusCommand",
     "BusObserver",
+    "BusSession",
     "Event",
     "EventType",
     "WebSocketBus",
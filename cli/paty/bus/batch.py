@@ -0,0 +1,119 @@
+"""Server-side audio coalescing for subscribers that don't need every frame.
+
+Pipecat pushes audio in 10-20 ms frames, so a raw subscriber gets 50-100
+binary messages per second per stream. A subscriber can instead ask the
+bus to batch ``batch_ms`` of PCM into one frame, to compress it
+(``paty.bus.compress``), or to receive only per-band levels
+(``paty.bus.levels``) — all an equalizer needs.
+
+One :class:`AudioBatcher` exists per (stream, batch_ms, levels, codec)
+variant and is shared by every subscriber that asked for it, so the work is
+done once per variant rather than once per subscriber.
+"""
+
+from __future__ import annotations
+
+from paty.bus.codec import (
+    FLAG_COALESCED,
+    FLAG_LEVELS,
+    AudioCodec,
+    codec_flags,
+    encode_audio_frame,
+)
+from paty.bus.compress import OPUS_SAMPLE_RATES, OpusEncoder, ulaw_encode
+from paty.bus.events import AudioStream
+from paty.bus.levels import band_levels, pack_levels
+
+MAX_BATCH_MS = 1000
+
+
+class AudioBatcher:
+    """Accumulates one stream's PCM and emits a frame per ``batch_ms``."""
+
+    def __init__(
+        self,
+        stream: AudioStream,
+        batch_ms: int,
+        levels: bool,
+        codec: AudioCodec = AudioCodec.PCM16,
+    ) -> None:
+        self.stream = stream
+        self.batch_ms = batch_ms
+        self.levels = levels
+        # Levels replace the PCM payload, so there is nothing to compress.
+        self.codec = AudioCodec.PCM16 if levels else codec
+        self._flags = (FLAG_COALESCED if batch_ms > 0 else 0) | (
+            FLAG_LEVELS if levels else 0
+        )
+        self._opus: OpusEncoder | None = None
+        self._buf = bytearray()
+        self._sample_rate = 0
+        self._channels = 0
+        self._ts_ms = 0
+        self._target = 0
+        self._seq = 0
+
+    def push(
+        self,
+        sample_rate: int,
+        channels: int,
+        ts_ms: int,
+        pcm: bytes | bytearray | memoryview,
+    ) -> list[memoryview]:
+        """Add one pipeline frame; return the frames now ready to send."""
+        out: list[memoryview] = []
+        if self._buf and (sample_rate, channels) != (
+            self._sample_rate,
+            self._channels,
+        ):
+            # Never mix formats in one batch: ship what we have first.
+            out.append(self._flush())
+        if not self._buf:
+            self._sample_rate = sample_rate
+            self._channels = channels
+            self._ts_ms = ts_ms
+            frame_bytes = 2 * max(channels, 1)
+            self._target = sample_rate * self.batch_ms // 1000 * frame_bytes
+        self._buf += pcm
+        if len(self._buf) >= self._target:
+            out.append(self._flush())
+        return [f for f in out if f is not None]
+
+    def _flush(self) -> memoryview | None:
+        codec, payload = self._payload()
+        self._buf = bytearray()
+        if not payload and (codec is AudioCodec.OPUS or self.levels):
+            return None  # still short of one Opus frame, or of the bands
+        self._seq += 1
+        return encode_audio_frame(
+            stream=self.stream,
+            sample_rate=self._sample_rate,
+            channels=self._channels,
+            seq=self._seq,
+            ts_ms=self._ts_ms,
+            pcm=payload,
+            flags=self._flags | codec_flags(codec),
+        )
+
+    def _payload(self) -> tuple[AudioCodec, bytes | bytearray]:
+        if self.levels:
+            levels = band_levels(self._buf, self._sample_rate)
+            return AudioCodec.PCM16, b"" if levels is None else pack_levels(levels)
+        if self.codec is AudioCodec.OPUS:
+            if self._sample_rate in OPUS_SAMPLE_RATES:
+                return AudioCodec.OPUS, self._opus_encoder().encode(self._buf)
+            # Opus can't take this rate; mu-law still halves the bandwidth.
+            return AudioCodec.ULAW, ulaw_encode(self._buf)
+        if self.codec is AudioCodec.ULAW:
+            return AudioCodec.ULAW, ulaw_encode(self._buf)
+        return AudioCodec.PCM16, self._buf
+
+    def _opus_encoder(self) -> OpusEncoder:
+        opus = self._opus
+        if opus is None or (opus.sample_rate, opus.channels) != (
+            self._sample_rate,
+            self._channels,
+        ):
+            opus = OpusEncoder(self._sample_rate, self._channels)
+            self._opus = opus
+        return opus
@@ -0,0 +1,528 @@
+"""`paty bus bench` — load-test a WebSocketBus with a synthetic session.
+
+Starts a bus on a free localhost port and drives it with a scripted
+conversation at real-time rate. Mic audio streams continuously and agent
+audio streams while the agent "speaks", both as 20 ms PCM16 frames. The
+script also emits partial/final transcripts, a burst of response deltas and
+a ``metrics.tick`` per second. N subscribers attach, some optionally
+reading slowly. No audio hardware or models are involved.
+
+Each subscriber runs its own event loop in its own thread, so
+``time.thread_time`` isolates its CPU from the bus's. Latency is measured
+publish → receive with ``perf_counter_ns``. Control events carry their
+publish time in ``data.bench_ns``; audio publish times are looked up by
+(stream, seq). Drops are counted from seq gaps and from the bus's own
+delivery counters (``paty.metrics.bus``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import websockets
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from rich.console import Console
+from rich.table import Table
+
+from paty.bus.codec import is_audio_frame, unpack_audio_frame
+from paty.bus.encoding import SUBPROTOCOLS, Encoding, decode_event
+from paty.bus.events import AudioStream, EventType
+from paty.bus.server import WebSocketBus
+
+_TICK_S = 0.020
+_MIC_RATE = 16000
+_AGENT_RATE = 24000
+# One conversational turn, in 20 ms ticks: the user speaks for 2 s, the
+# agent thinks (streaming deltas) for 1 s, then speaks for 2 s.
+_TURN_TICKS = 250
+_USER_END = 100
+_THINK_END = 150
+_PARTIAL_EVERY = 15
+_METRICS_EVERY = 50
+
+
+@dataclass
+class BenchConfig:
+    subscribers: int = 4
+    slow_subscribers: int = 0
+    slow_delay_ms: float = 20.0
+    duration_s: float = 10.0
+    encoding: Encoding = Encoding.JSON
+
+
+@dataclass
+class SubscriberResult:
+    name: str
+    slow: bool
+    control_latency_ms: list[float] = field(default_factory=list)
+    audio_latency_ms: list[float] = field(default_factory=list)
+    events: int = 0
+    audio_frames: int = 0
+    event_gaps: int = 0
+    audio_gaps: int = 0
+    disconnected: bool = False
+    cpu_s: float = 0.0
+
+
+@dataclass
+class BenchReport:
+    config: BenchConfig
+    elapsed_s: float
+    published_events: int
+    published_audio: int
+    bus_cpu_s: float
+    counters: dict[str, int]
+    subscribers: list[SubscriberResult]
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    return float(np.percentile(values, q))
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _Publisher:
+    """Drives the scripted session into the bus at real-time rate."""
+
+    def __init__(self, bus: WebSocketBus) -> None:
+        self._bus = bus
+        self.audio_sent_ns: dict[tuple[int, int], int] = {}
+        self.events = 0
+        self.audio = 0
+        self._mic = (
+            np.random.default_rng(0)
+            .integers(-2000, 2000, _MIC_RATE // 50, dtype=np.int16)
+            .tobytes()
+        )
+        self._agent = (
+            np.random.default_rng(1)
+            .integers(-8000, 8000, _AGENT_RATE // 50, dtype=np.int16)
+            .tobytes()
+        )
+
+    def _event(self, event_type: EventType, **data) -> None:
+        data["bench_ns"] = time.perf_counter_ns()
+        self._bus.publish(event_type, data)
+        self.events += 1
+
+    def _audio(self, stream: AudioStream, rate: int, pcm: bytes) -> None:
+        sent = time.perf_counter_ns()
+        self._bus.publish_audio(stream, rate, 1, pcm)
+        # Frames are only queued here; the senders run after we yield, so
+        # the entry is always in place before the frame can arrive.
+        seq = self._bus.default_session.audio_seq(stream)
+        self.audio_sent_ns[(int(stream), seq)] = sent
+        self.audio += 1
+
+    def tick(self, n: int) -> None:
+        t = n % _TURN_TICKS
+        self._audio(AudioStream.MIC, _MIC_RATE, self._mic)
+        if t == 0:
+            self._event(EventType.STATE_CHANGED, state="listening")
+            self._event(EventType.USER_SPEECH_STARTED)
+        elif t < _USER_END and t % _PARTIAL_EVERY == 0:
+            self._event(EventType.USER_TRANSCRIPT_PARTIAL, text="so what I was")
+        elif t == _USER_END:
+            self._event(EventType.USER_SPEECH_STOPPED, duration_ms=2000)
+            self._event(EventType.USER_TRANSCRIPT_FINAL, text="so what I was saying")
+            self._event(EventType.STATE_CHANGED, state="thinking")
+            self._event(EventType.AGENT_THINKING_STARTED)
+        elif t < _THINK_END:
+            self._event(EventType.AGENT_RESPONSE_DELTA, text="word ")
+        elif t == _THINK_END:
+            self._event(EventType.AGENT_RESPONSE_COMPLETED, text="word " * 49)
+            self._event(EventType.STATE_CHANGED, state="speaking")
+            self._event(EventType.AGENT_SPEECH_STARTED)
+        elif t == _TURN_TICKS - 1:
+            self._event(EventType.AGENT_SPEECH_STOPPED)
+            self._event(EventType.STATE_CHANGED, state="idle")
+        if t > _THINK_END:
+            self._audio(AudioStream.AGENT, _AGENT_RATE, self._agent)
+        if t % _METRICS_EVERY == 0:
+            self._event(EventType.METRICS_TICK, ttfb_ms=180.0, llm_ms=240.0)
+
+    async def run(self, duration_s: float) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for n in range(int(duration_s / _TICK_S)):
+            # Schedule against the start time so the rate doesn't drift.
+            await asyncio.sleep(max(0.0, start + n * _TICK_S - loop.time()))
+            self.tick(n)
+
+
+async def _subscribe(
+    url: str,
+    encoding: Encoding,
+    delay_s: float,
+    audio_sent_ns: dict[tuple[int, int], int],
+    result: SubscriberResult,
+    ready: threading.Event,
+    stop: threading.Event,
+) -> None:
+    last_event_seq = 0
+    last_audio_seq: dict[int, int] = {}
+    try:
+        async with websockets.connect(
+            url, subprotocols=[SUBPROTOCOLS[encoding]], close_timeout=1
+        ) as ws:
+            ready.set()
+            while not stop.is_set():
+                try:
+                    msg = await asyncio.wait_for(ws.recv(), timeout=0.1)
+                except TimeoutError:
+                    continue
+                now = time.perf_counter_ns()
+                if isinstance(msg, bytes) and is_audio_frame(msg):
+                    frame = unpack_audio_frame(msg)
+                    stream = int(frame.stream)
+                    sent = audio_sent_ns.get((stream, frame.seq))
+                    if sent is not None:
+                        result.audio_latency_ms.append((now - sent) / 1e6)
+                    prev = last_audio_seq.get(stream)
+                    if prev is not None:
+                        result.audio_gaps += max(0, frame.seq - prev - 1)
+                    last_audio_seq[stream] = frame.seq
+                    result.audio_frames += 1
+                else:
+                    event = decode_event(msg) or {}
+                    sent = (event.get("data") or {}).get("bench_ns")
+                    if sent is not None:
+                        result.control_latency_ms.append((now - sent) / 1e6)
+                    seq = event.get("seq", 0)
+                    if last_event_seq:
+                        result.event_gaps += max(0, seq - last_event_seq - 1)
+                    last_event_seq = seq
+                    result.events += 1
+                if delay_s:
+                    await asyncio.sleep(delay_s)
+    except websockets.exceptions.ConnectionClosed:
+        # Closed by the bus mid-run, not by the end-of-run shutdown.
+        result.disconnected = not stop.is_set()
+    finally:
+        ready.set()
+
+
+def _subscriber_thread(
+    url: str,
+    encoding: Encoding,
+    delay_s: float,
+    audio_sent_ns: dict[tuple[int, int], int],
+    result: SubscriberResult,
+    ready: threading.Event,
+    stop: threading.Event,
+) -> None:
+    cpu_start = time.thread_time()
+    try:
+        asyncio.run(
+            _subscribe(url, encoding, delay_s, audio_sent_ns, result, ready, stop)
+        )
+    except OSError:
+        result.disconnected = True
+        ready.set()
+    result.cpu_s = time.thread_time() - cpu_start
+
+
+def _read_counters(reader: InMemoryMetricReader) -> dict[str, int]:
+    counters: dict[str, int] = {}
+    data = reader.get_metrics_data()
+    for rm in data.resource_metrics if data else []:
+        for sm in rm.scope_metrics:
+            for metric in sm.metrics:
+                counters[metric.name] = sum(dp.value for dp in metric.data.data_points)
+    return counters
+
+
+async def run_bench(config: BenchConfig) -> BenchReport:
+    """Run one benchmark and return its raw results."""
+    reader = InMemoryMetricReader()
+    provider = MeterProvider(metric_readers=[reader])
+    bus = WebSocketBus(port=_free_port(), meter=provider.get_meter("paty-bench"))
+    await bus.start()
+    publisher = _Publisher(bus)
+    url = f"ws://{bus.host}:{bus.port}"
+    stop = threading.Event()
+    results: list[SubscriberResult] = []
+    threads: list[threading.Thread] = []
+    readies: list[threading.Event] = []
+    total = config.subscribers + config.slow_subscribers
+    for i in range(total):
+        slow = i >= config.subscribers
+        result = SubscriberResult(name=f"{'s' if slow else 'f'}{i}", slow=slow)
+        ready = threading.Event()
+        delay_s = config.slow_delay_ms / 1000 if slow else 0.0
+        thread = threading.Thread(
+            target=_subscriber_thread,
+            args=(url, config.encoding, delay_s, publisher.audio_sent_ns),
+            kwargs={"result": result, "ready": ready, "stop": stop},
+            name=f"paty-bench-{result.name}",
+            daemon=True,
+        )
+        thread.start()
+        results.append(result)
+        threads.append(thread)
+        readies.append(ready)
+    try:
+        # Wait for every subscriber to connect (without blocking the bus).
+        for ready in readies:
+            await asyncio.to_thread(ready.wait, 5.0)
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        await publisher.run(config.duration_s)
+        # Give queues a moment to drain before stopping the clock.
+        await asyncio.sleep(0.2)
+        elapsed = time.perf_counter() - wall_start
+        bus_cpu = time.thread_time() - cpu_start
+    finally:
+        stop.set()
+        # Stop the bus first: a slow subscriber's close handshake would
+        # otherwise queue behind everything still buffered for it.
+        await bus.stop()
+        for thread in threads:
+            await asyncio.to_thread(thread.join, 5.0)
+    counters = _read_counters(reader)
+    provider.shutdown()
+    return BenchReport(
+        config=config,
+        elapsed_s=elapsed,
+        published_events=publisher.events,
+        published_audio=publisher.audio,
+        bus_cpu_s=bus_cpu,
+        counters=counters,
+        subscribers=results,
+    )
+
+
+def _fmt_ms(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.2f}" if value < 100 else f"{value:.0f}"
+
+
+def render_report(report: BenchReport, console: Console) -> None:
+    cfg = report.config
+    table = Table(
+        title=(
+            f"Bus bench — {cfg.subscribers} subscribers"
+            f" + {cfg.slow_subscribers} slow ({cfg.slow_delay_ms:g} ms/msg),"
+            f" {report.elapsed_s:.1f}s, {cfg.encoding.value}"
+        ),
+        expand=False,
+    )
+    table.add_column("sub", style="bold")
+    table.add_column("ctl p50", justify="right")
+    table.add_column("ctl p99", justify="right")
+    table.add_column("aud p50", justify="right")
+    table.add_column("aud p99", justify="right")
+    table.add_column("evts", justify="right")
+    table.add_column("frames", justify="right")
+    table.add_column("coal", justify="right")
+    table.add_column("drops", justify="right")
+    table.add_column("cpu%", justify="right")
+    for sub in report.subscribers:
+        name = f"[red]{sub.name}✗[/]" if sub.disconnected else sub.name
+        table.add_row(
+            name,
+            _fmt_ms(_percentile(sub.control_latency_ms, 50)),
+            _fmt_ms(_percentile(sub.control_latency_ms, 99)),
+            _fmt_ms(_percentile(sub.audio_latency_ms, 50)),
+            _fmt_ms(_percentile(sub.audio_latency_ms, 99)),
+            f"{sub.events:,}",
+            f"{sub.audio_frames:,}",
+            f"{sub.event_gaps:,}",
+            f"{sub.audio_gaps:,}",
+            f"{100 * sub.cpu_s / report.elapsed_s:.1f}",
+        )
+    console.print(table)
+    c = report.counters
+    console.print(
+        f"published {report.published_events:,} events + "
+        f"{report.published_audio:,} audio frames · "
+        f"bus+publisher cpu {100 * report.bus_cpu_s / report.elapsed_s:.1f}% · "
+        f"coalesced {c.get('paty_bus_events_coalesced_total', 0):,} · "
+        f"audio dropped {c.get('paty_bus_audio_frames_dropped_total', 0):,} · "
+        f"disconnects {c.get('paty_bus_subscribers_dropped_total', 0):,}"
+    )
+    console.print(
+        "[dim]f = fast, s = slow, ✗ = disconnected · latencies in ms, "
+        "publish → receive · coal = control seqs coalesced away · "
+        "drops = audio frames dropped[/]"
+    )
+
+
+def run(config: BenchConfig) -> None:
+    console = Console()
+    console.print(f"[dim]running for {config.duration_s:g}s...[/]")
+    with contextlib.suppress(KeyboardInterrupt):
+        render_report(asyncio.run(run_bench(config)), console)
+
+
+# --- BusObserver micro-benchmark -------------------------------------------
+
+# Edges of the pipeline `paty run` builds (see paty.pipeline.builder), in
+# push order; a frame is observed on every edge downstream of its origin.
+_PIPELINE = (
+    "transport.input",
+    "input_mute",
+    "stt_mute",
+    "WhisperSTTService",
+    "text_injector",
+    "user_aggregator",
+    "OpenAILLMService",
+    "KokoroTTSService",
+    "transport.output",
+    "assistant_aggregator",
+    "sink",
+)
+_STT, _LLM, _TTS, _OUT = 3, 6, 7, 8
+
+
+@dataclass
+class ObserverBenchReport:
+    turns: int
+    frames: int
+    observations: int
+    elapsed_s: float
+
+    @property
+    def ns_per_observation(self) -> float:
+        return self.elapsed_s * 1e9 / self.observations
+
+    @property
+    def us_per_frame(self) -> float:
+        return self.elapsed_s * 1e6 / self.frames
+
+
+def _observer_turn() -> list[tuple[Any, int]]:
+    """One scripted turn as (frame, origin edge), in push order."""
+    from pipecat.frames.frames import (
+        BotStartedSpeakingFrame,
+        BotStoppedSpeakingFrame,
+        InputAudioRawFrame,
+        InterimTranscriptionFrame,
+        LLMFullResponseEndFrame,
+        LLMFullResponseStartFrame,
+        LLMTextFrame,
+        MetricsFrame,
+        TranscriptionFrame,
+        TTSAudioRawFrame,
+        TTSStartedFrame,
+        TTSStoppedFrame,
+        TTSTextFrame,
+        UserStartedSpeakingFrame,
+        UserStoppedSpeakingFrame,
+    )
+    from pipecat.metrics.metrics import TTFBMetricsData
+
+    mic = bytes(2 * _MIC_RATE // 50)
+    agent = bytes(2 * _AGENT_RATE // 50)
+
+    def metrics(origin: int) -> tuple[Any, int]:
+        entry = TTFBMetricsData(processor=_PIPELINE[origin], value=0.2)
+        return MetricsFrame(data=[entry]), origin
+
+    turn: list[tuple[Any, int]] = [(UserStartedSpeakingFrame(), 0)]
+    for t in range(_USER_END):
+        turn.append((InputAudioRawFrame(mic, _MIC_RATE, 1), 0))
+        if t % _PARTIAL_EVERY == 0:
+            turn.append((InterimTranscriptionFrame("so what", "u", "t"), _STT))
+    turn += [
+        (UserStoppedSpeakingFrame(), 0),
+        (TranscriptionFrame("so what I was saying", "u", "t"), _STT),
+        metrics(_STT),
+        (LLMFullResponseStartFrame(), _LLM),
+        metrics(_LLM),
+    ]
+    for _ in range(_THINK_END - _USER_END):
+        turn.append((LLMTextFrame("word "), _LLM))
+        turn.append((InputAudioRawFrame(mic, _MIC_RATE, 1), 0))
+    turn += [(LLMFullResponseEndFrame(), _LLM), (TTSStartedFrame(), _TTS)]
+    turn += [metrics(_TTS), (BotStartedSpeakingFrame(), _OUT)]
+    for t in range(_TURN_TICKS - _THINK_END):
+        if t % 2 == 0:
+            turn.append((TTSTextFrame("word", "word"), _TTS))
+        turn.append((TTSAudioRawFrame(agent, _AGENT_RATE, 1), _TTS))
+        turn.append((InputAudioRawFrame(mic, _MIC_RATE, 1), 0))
+    turn += [(TTSStoppedFrame(), _TTS), (BotStoppedSpeakingFrame(), _OUT)]
+    return turn
+
+
+async def run_observer_bench(
+    turns: int = 20, ring_size: int = 0
+) -> ObserverBenchReport:
+    """Time ``BusObserver.on_push_frame`` over ``turns`` scripted turns.
+
+    Every frame is pushed across each pipeline edge downstream of where it
+    originates, as Pipecat does. The bus is never started, so ``publish``
+    returns immediately and only the observer's own cost is measured. With
+    ``ring_size``, that is the push-path cost alone: translation happens in
+    the observer's drain task, which never gets to run during the timing.
+    """
+    from types import SimpleNamespace
+
+    from pipecat.observers.base_observer import FramePushed
+    from pipecat.processors.frame_processor import FrameDirection
+
+    from paty.bus.observer import BusObserver
+
+    observer = BusObserver(WebSocketBus(port=0), ring_size=ring_size)
+    procs = [SimpleNamespace(name=name) for name in _PIPELINE]
+    pushes: list[FramePushed] = []
+    frames = 0
+    for _ in range(turns):
+        for frame, origin in _observer_turn():
+            frames += 1
+            pushes.extend(
+                FramePushed(
+                    source=procs[i],
+                    destination=procs[i + 1],
+                    frame=frame,
+                    direction=FrameDirection.DOWNSTREAM,
+                    timestamp=0,
+                )
+                for i in range(origin, len(procs) - 1)
+            )
+    start = time.perf_counter()
+    for push in pushes:
+        await observer.on_push_frame(push)
+    elapsed = time.perf_counter() - start
+    await observer.cleanup()
+    return ObserverBenchReport(
+        turns=turns, frames=frames, observations=len(pushes), elapsed_s=elapsed
+    )
+
+
+def render_observer_report(
+    report: ObserverBenchReport, console: Console, label: str = "BusObserver"
+) -> None:
+    turn_s = report.turns * _TURN_TICKS * _TICK_S
+    console.print(
+        f"{label}: {report.frames:,} frames over {report.observations:,} "
+        f"edge observations ({report.turns} turns) in {report.elapsed_s * 1000:.1f} ms"
+    )
+    console.print(
+        f"  {report.ns_per_observation:,.0f} ns per observation · "
+        f"{report.us_per_frame:.2f} µs per frame · "
+        f"{100 * report.elapsed_s / turn_s:.3f}% of one core at real time"
+    )
+
+
+def run_observer(turns: int = 20, ring_size: int = 0) -> None:
+    console = Console()
+    render_observer_report(asyncio.run(run_observer_bench(turns)), console)
+    if ring_size:
+        report = asyncio.run(run_observer_bench(turns, ring_size))
+        render_observer_report(report, console, f"push path, ring={ring_size}")
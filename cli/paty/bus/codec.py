@@ -6,27 +6,56 @@ Header layout (16 bytes, little-endian):
     0       1     magic        (0xA5)
     1       1     version      (protocol version)
     2       1     stream       (AudioStream: mic=1, agent=2)
-    3       1     reserved     (0)
+    3       1     flags        (FLAG_* bits; 0 for a plain frame)
     4       2     sample_rate  (Hz)
     6       2     channels
     8       4     seq          (per-stream monotonic)
     12      4     ts_ms        (ms since session start)
-    16+     ...   PCM16LE payload
+    16+     ...   payload: PCM16LE unless flags say otherwise
+
+Flags (low nibble) and codec (high nibble):
+
+    FLAG_COALESCED  the payload is several consecutive pipeline frames
+                    batched server-side; seq/ts_ms are those of the first
+    FLAG_LEVELS     the payload is one uint8 level per band
+                    (``paty.bus.levels``) instead of PCM samples
+    codec           AudioCodec of the payload (PCM16 = 0, so frames from
+                    older servers read as PCM16); see ``paty.bus.compress``
 """
 
 from __future__ import annotations
 
 import struct
 from dataclasses import dataclass
+from enum import IntEnum
 
 from paty.bus.events import PROTOCOL_VERSION, AudioStream
 
 MAGIC = 0xA5
 HEADER_FORMAT = "<BBBBHHII"
-HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+_HEADER = struct.Struct(HEADER_FORMAT)
+HEADER_SIZE = _HEADER.size
 
 assert HEADER_SIZE == 16, "audio header must be 16 bytes"
 
+FLAG_COALESCED = 0x01
+FLAG_LEVELS = 0x02
+_CODEC_SHIFT = 4
+
+
+class AudioCodec(IntEnum):
+    PCM16 = 0
+    ULAW = 1
+    OPUS = 2
+
+
+_CODECS = frozenset(AudioCodec)
+
+
+def codec_flags(codec: AudioCodec) -> int:
+    """The flags-byte bits that mark a payload as ``codec``."""
+    return int(codec) << _CODEC_SHIFT
+
 
 @dataclass(frozen=True)
 class AudioFrame:
@@ -36,6 +65,19 @@ class AudioFrame:
     seq: int
     ts_ms: int
     pcm: bytes
+    flags: int = 0
+
+    @property
+    def coalesced(self) -> bool:
+        return bool(self.flags & FLAG_COALESCED)
+
+    @property
+    def levels(self) -> bool:
+        return bool(self.flags & FLAG_LEVELS)
+
+    @property
+    def codec(self) -> AudioCodec:
+        return AudioCodec(self.flags >> _CODEC_SHIFT)
 
 
 def pack_audio_frame(
@@ -45,13 +87,13 @@ def pack_audio_frame(
     seq: int,
     ts_ms: int,
     pcm: bytes,
+    flags: int = 0,
 ) -> bytes:
-    header = struct.pack(
-        HEADER_FORMAT,
+    header = _HEADER.pack(
         MAGIC,
         PROTOCOL_VERSION,
         int(stream),
-        0,
+        flags & 0xFF,
         sample_rate & 0xFFFF,
         channels & 0xFFFF,
         seq & 0xFFFFFFFF,
@@ -60,23 +102,65 @@ def pack_audio_frame(
     return header + pcm
 
 
-def unpack_audio_frame(data: bytes) -> AudioFrame:
+def encode_audio_frame(
+    stream: AudioStream,
+    sample_rate: int,
+    channels: int,
+    seq: int,
+    ts_ms: int,
+    pcm: bytes | bytearray | memoryview,
+    flags: int = 0,
+) -> memoryview:
+    """Pack a frame into one buffer and return a read-only view of it.
+
+    The publish hot path: the header is packed in place at the front of a
+    single buffer sized for header + payload, so a frame costs exactly one
+    allocation and one payload copy no matter how many subscribers it is
+    fanned out to. The returned view is immutable, so the same object can
+    sit in every subscriber queue and be handed straight to
+    ``websocket.send`` (which accepts any bytes-like object).
+    """
+    buf = bytearray(HEADER_SIZE + len(pcm))
+    _HEADER.pack_into(
+        buf,
+        0,
+        MAGIC,
+        PROTOCOL_VERSION,
+        int(stream),
+        flags & 0xFF,
+        sample_rate & 0xFFFF,
+        channels & 0xFFFF,
+        seq & 0xFFFFFFFF,
+        ts_ms & 0xFFFFFFFF,
+    )
+    buf[HEADER_SIZE:] = pcm
+    return memoryview(buf).toreadonly()
+
+
+def is_audio_frame(data: bytes | bytearray | memoryview) -> bool:
+    """Cheap check that a binary message is an audio frame (vs. an event)."""
+    return len(data) >= HEADER_SIZE and data[0] == MAGIC
+
+
+def unpack_audio_frame(data: bytes | bytearray | memoryview) -> AudioFrame:
     if len(data) < HEADER_SIZE:
         raise ValueError(f"audio frame too short: {len(data)} bytes")
     (
         magic,
         version,
         stream,
-        _reserved,
+        flags,
         sample_rate,
         channels,
         seq,
         ts_ms,
-    ) = struct.unpack(HEADER_FORMAT, data[:HEADER_SIZE])
+    ) = _HEADER.unpack_from(data)
     if magic != MAGIC:
         raise ValueError(f"bad magic byte: 0x{magic:02x}")
     if version != PROTOCOL_VERSION:
         raise ValueError(f"unsupported protocol version: {version}")
+    if flags >> _CODEC_SHIFT not in _CODECS:
+        raise ValueError(f"unsupported audio codec: {flags >> _CODEC_SHIFT}")
     return AudioFrame(
         stream=AudioStream(stream),
         sample_rate=sample_rate,
@@ -84,4 +168,5 @@ def unpack_audio_frame(data: bytes) -> AudioFrame:
         seq=seq,
         ts_ms=ts_ms,
         pcm=bytes(data[HEADER_SIZE:]),
+        flags=flags,
     )
@@ -0,0 +1,142 @@
+"""Compressed audio payloads for remote bus subscribers.
+
+Raw 24 kHz PCM16 is ~384 kbit/s per subscriber — fine on localhost, heavy
+for remote monitoring. A subscriber can ask for:
+
+- ``ulaw``: G.711 mu-law, 8 bits per sample (half the bandwidth). Pure
+  numpy, always available.
+- ``opus``: ~24 kbit/s for speech. Needs the optional ``opuslib`` binding and
+  the system libopus (``pip install paty[opus]``). Each payload is one or
+  more 20 ms Opus packets, each prefixed with its length as a u16 LE.
+
+The codec is carried in the high nibble of the frame's flags byte (see
+``paty.bus.codec``). Encoding runs on the bus's codec thread, never on the
+event loop that drives the pipeline.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+
+from paty.bus.codec import AudioCodec
+
+try:
+    import opuslib
+except (ImportError, OSError, AttributeError):
+    # optional: pip install paty[opus]. opuslib raises at import time
+    # (not ImportError) when the system libopus can't be loaded.
+    opuslib = None
+
+OPUS_FRAME_MS = 20
+OPUS_SAMPLE_RATES = frozenset({8000, 12000, 16000, 24000, 48000})
+_OPUS_BITRATE = 24_000
+_PACKET_LEN = struct.Struct("<H")
+
+# G.711 mu-law bias/clip: the encoder works on 14-bit magnitudes, the
+# decoder expands straight to 16-bit.
+_ULAW_BIAS = 0x84
+_ULAW_BIAS_14 = _ULAW_BIAS >> 2
+_ULAW_CLIP_14 = 8159
+
+
+def available_codecs() -> tuple[AudioCodec, ...]:
+    if opuslib is None:
+        return (AudioCodec.PCM16, AudioCodec.ULAW)
+    return (AudioCodec.PCM16, AudioCodec.ULAW, AudioCodec.OPUS)
+
+
+def negotiate_codec(requested: AudioCodec) -> AudioCodec:
+    """``requested`` if this process can encode it, else mu-law."""
+    if requested in available_codecs():
+        return requested
+    return AudioCodec.ULAW
+
+
+def _ulaw_encode_table() -> np.ndarray:
+    # G.711 on 14-bit magnitudes, indexed by the int16 sample reinterpreted
+    # as uint16 so encoding is a single table lookup.
+    x = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(x < 0, 0x7F, 0xFF)
+    mag = np.minimum(np.abs(x), _ULAW_CLIP_14) + _ULAW_BIAS_14
+    segment = np.maximum(np.frexp(mag.astype(np.float64))[1] - 6, 0)
+    mantissa = (mag >> (segment + 1)) & 0x0F
+    code = np.where(segment >= 8, 0x7F, (segment << 4) | mantissa)
+    return (code ^ mask).astype(np.uint8)
+
+
+def _ulaw_decode_table() -> np.ndarray:
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    mag = ((((u & 0x0F) << 3) + _ULAW_BIAS) << exponent) - _ULAW_BIAS
+    return np.where(u & 0x80, -mag, mag).astype("<i2")
+
+
+_ULAW_ENCODE = _ulaw_encode_table()
+_ULAW_DECODE = _ulaw_decode_table()
+
+
+def ulaw_encode(pcm: bytes | bytearray | memoryview) -> bytes:
+    return _ULAW_ENCODE[np.frombuffer(pcm, dtype="<u2")].tobytes()
+
+
+def ulaw_decode(payload: bytes | bytearray | memoryview) -> bytes:
+    return _ULAW_DECODE[np.frombuffer(payload, dtype=np.uint8)].tobytes()
+
+
+class OpusEncoder:
+    """Stateful Opus encoder for one stream.
+
+    Pipeline frames rarely line up with Opus frame sizes, so PCM is buffered
+    and only whole 20 ms frames are encoded; the remainder waits for the
+    next call.
+    """
+
+    def __init__(self, sample_rate: int, channels: int) -> None:
+        if opuslib is None:
+            raise RuntimeError("opus support needs: pip install paty[opus]")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._encoder = opuslib.Encoder(sample_rate, channels, opuslib.APPLICATION_VOIP)
+        self._encoder.bitrate = _OPUS_BITRATE
+        self._frame_samples = sample_rate * OPUS_FRAME_MS // 1000
+        self._frame_bytes = self._frame_samples * channels * 2
+        self._pending = bytearray()
+
+    def encode(self, pcm: bytes | bytearray | memoryview) -> bytes:
+        """Length-prefixed packets for every complete frame buffered so far."""
+        self._pending += pcm
+        out = bytearray()
+        n = len(self._pending) // self._frame_bytes
+        for i in range(n):
+            chunk = bytes(
+                self._pending[i * self._frame_bytes : (i + 1) * self._frame_bytes]
+            )
+            packet = self._encoder.encode(chunk, self._frame_samples)
+            out += _PACKET_LEN.pack(len(packet))
+            out += packet
+        del self._pending[: n * self._frame_bytes]
+        return bytes(out)
+
+
+class OpusDecoder:
+    """Client-side counterpart of :class:`OpusEncoder`."""
+
+    def __init__(self, sample_rate: int, channels: int) -> None:
+        if opuslib is None:
+            raise RuntimeError("opus support needs: pip install paty[opus]")
+        self._decoder = opuslib.Decoder(sample_rate, channels)
+        self._frame_samples = sample_rate * OPUS_FRAME_MS // 1000
+
+    def decode(self, payload: bytes | bytearray | memoryview) -> bytes:
+        out = bytearray()
+        view = memoryview(payload)
+        offset = 0
+        while offset + _PACKET_LEN.size <= len(view):
+            (length,) = _PACKET_LEN.unpack_from(view, offset)
+            offset += _PACKET_LEN.size
+            packet = bytes(view[offset : offset + length])
+            offset += length
+            out += self._decoder.decode(packet, self._frame_samples)
+        return bytes(out)
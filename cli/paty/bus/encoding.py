@@ -0,0 +1,158 @@
+"""Control-event wire encodings, negotiated per subscriber.
+
+JSON text frames are the default and what every existing subscriber
+speaks. A subscriber can opt into compact msgpack binary frames, either by
+offering the ``paty.msgpack.v1`` WebSocket subprotocol or by connecting
+with ``?encoding=msgpack`` in the URL. msgpack is an optional dependency
+(``paty[msgpack]``); without it the bus only speaks JSON.
+
+Events are encoded straight from their fields by per-EventType encoders
+that pre-render everything constant for a session (version, session id,
+type), so the publish path never builds or validates a Pydantic envelope.
+The wire shape is identical to :class:`paty.bus.events.Event`.
+
+msgpack events never collide with binary audio frames: an event is always
+a msgpack map (first byte ``0x80``-``0x8f``) while audio frames start with
+the codec's magic byte (``0xA5``).
+"""
+
+from __future__ import annotations
+
+import json
+from enum import StrEnum
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from paty.bus.codec import is_audio_frame
+from paty.bus.events import PROTOCOL_VERSION, EventType
+
+try:
+    import msgpack
+except ImportError:  # optional: pip install paty[msgpack]
+    msgpack = None
+
+
+class Encoding(StrEnum):
+    JSON = "json"
+    MSGPACK = "msgpack"
+
+
+SUBPROTOCOLS: dict[Encoding, str] = {
+    Encoding.JSON: "paty.json.v1",
+    Encoding.MSGPACK: "paty.msgpack.v1",
+}
+_BY_SUBPROTOCOL = {proto: enc for enc, proto in SUBPROTOCOLS.items()}
+
+_JSON_SEPARATORS = (",", ":")
+_DECODE_ERRORS: tuple[type[Exception], ...] = (ValueError,)
+
+if msgpack is not None:
+    _MP_SEQ = msgpack.packb("seq")
+    _MP_TS_MS = msgpack.packb("ts_ms")
+    _MP_DATA = msgpack.packb("data")
+    _DECODE_ERRORS = (ValueError, msgpack.UnpackException)
+
+
+def available_encodings() -> tuple[Encoding, ...]:
+    """Encodings this process can produce, preferred first."""
+    if msgpack is None:
+        return (Encoding.JSON,)
+    return (Encoding.MSGPACK, Encoding.JSON)
+
+
+def select_subprotocol(offered: list[str] | tuple[str, ...]) -> str | None:
+    """Pick the first supported subprotocol the client offered.
+
+    Clients that offer none (or only unknown ones) get no subprotocol and
+    fall back to JSON — unlike websockets' default, which would reject them.
+    """
+    for enc in available_encodings():
+        if SUBPROTOCOLS[enc] in offered:
+            return SUBPROTOCOLS[enc]
+    return None
+
+
+def negotiate(subprotocol: str | None, path: str | None) -> Encoding:
+    """Resolve a subscriber's encoding from its subprotocol or URL query."""
+    if subprotocol in _BY_SUBPROTOCOL:
+        return _BY_SUBPROTOCOL[subprotocol]
+    if path:
+        requested = parse_qs(urlsplit(path).query).get("encoding", [])
+        for value in requested:
+            try:
+                enc = Encoding(value)
+            except ValueError:
+                continue
+            if enc in available_encodings():
+                return enc
+    return Encoding.JSON
+
+
+class EventEncoder:
+    """Encoder for one EventType within one session.
+
+    The constant part of the envelope is rendered once at construction;
+    per-event work is only seq, ts_ms and the payload.
+    """
+
+    __slots__ = ("_json_prefix", "_msgpack_prefix")
+
+    def __init__(self, session_id: str, event_type: EventType) -> None:
+        self._json_prefix = (
+            f'{{"v":{PROTOCOL_VERSION},'
+            f'"session_id":{json.dumps(session_id)},'
+            f'"type":{json.dumps(event_type.value)},'
+        )
+        self._msgpack_prefix = b""
+        if msgpack is not None:
+            self._msgpack_prefix = (
+                b"\x86"  # fixmap, 6 entries
+                + msgpack.packb("v")
+                + msgpack.packb(PROTOCOL_VERSION)
+                + msgpack.packb("session_id")
+                + msgpack.packb(session_id)
+                + msgpack.packb("type")
+                + msgpack.packb(event_type.value)
+            )
+
+    def to_json(self, seq: int, ts_ms: int, data: dict[str, Any]) -> str:
+        payload = json.dumps(data, separators=_JSON_SEPARATORS)
+        return f'{self._json_prefix}"seq":{seq},"ts_ms":{ts_ms},"data":{payload}}}'
+
+    def to_msgpack(self, seq: int, ts_ms: int, data: dict[str, Any]) -> bytes:
+        return b"".join(
+            (
+                self._msgpack_prefix,
+                _MP_SEQ,
+                msgpack.packb(seq),
+                _MP_TS_MS,
+                msgpack.packb(ts_ms),
+                _MP_DATA,
+                msgpack.packb(data),
+            )
+        )
+
+    def encode(
+        self, encoding: Encoding, seq: int, ts_ms: int, data: dict[str, Any]
+    ) -> str | bytes:
+        if encoding is Encoding.MSGPACK:
+            return self.to_msgpack(seq, ts_ms, data)
+        return self.to_json(seq, ts_ms, data)
+
+
+def decode_event(raw: str | bytes) -> dict[str, Any] | None:
+    """Decode a control event in either encoding; ``None`` if malformed.
+
+    Callers should route audio frames (see :func:`is_audio_frame`) before
+    calling this — binary frames that aren't msgpack events return ``None``.
+    """
+    try:
+        if isinstance(raw, str):
+            event = json.loads(raw)
+        elif msgpack is None or is_audio_frame(raw):
+            return None
+        else:
+            event = msgpack.unpackb(raw)
+    except _DECODE_ERRORS:
+        return None
+    return event if isinstance(event, dict) else None
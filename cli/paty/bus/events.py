@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from enum import IntEnum, StrEnum
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel
 
@@ -44,14 +44,30 @@ class BusAction(StrEnum):
     MUTE_TOGGLE = "mute.toggle"
     MUTE_SET = "mute.set"
     CHAT_SEND = "chat.send"
+    SUBSCRIBE = "subscribe"
 
 
 class BusCommand(BaseModel):
-    """Wire envelope for a control action sent by a subscriber."""
+    """Wire envelope for a control action sent by a subscriber.
+
+    ``subscribe`` is handled by the bus itself and never reaches the
+    command handler.  ``events`` lists EventType prefixes (``"user"``,
+    ``"metrics.tick"``); ``audio`` lists the audio streams to receive.
+    Either left unset keeps its current filter; an empty list means none.
+    ``audio_batch_ms`` coalesces that many ms of PCM into each audio frame
+    (``0`` for every pipeline frame), ``audio_levels`` swaps PCM for
+    per-band levels, and ``audio_codec`` compresses the PCM; see
+    ``paty.bus.batch``.
+    """
 
     action: BusAction
     muted: bool | None = None
     text: str | None = None
+    events: list[str] | None = None
+    audio: list[Literal["mic", "agent"]] | None = None
+    audio_batch_ms: int | None = None
+    audio_levels: bool | None = None
+    audio_codec: Literal["pcm16", "ulaw", "opus"] | None = None
 
 
 class AgentState(StrEnum):
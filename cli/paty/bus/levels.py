@@ -0,0 +1,51 @@
+"""Per-band audio levels for visualizers.
+
+Shared by the bus, which can send level-only audio frames to subscribers
+that only draw bars (see ``FLAG_LEVELS`` in ``paty.bus.codec``), and by the
+TUI equalizer, which computes the same bands from raw PCM.
+
+On the wire a level frame's payload is one byte per band, ``0..255`` for
+``0.0..1.0``.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+LEVEL_BANDS = 16
+# Magnitude scaling. FFT magnitudes from PCM16 normalized to [-1, 1] sit
+# well below 1.0; this gain plus the sqrt curve below gives full bars on
+# loud speech without clipping on peaks.
+_GAIN = 7.0
+# Floor for the log-spaced frequency edges; below this is mostly mic
+# rumble / DC drift and would just make the lowest band sit lit.
+_F_MIN_HZ = 60.0
+
+
+def band_levels(
+    pcm: bytes | bytearray | memoryview, sample_rate: int, bands: int = LEVEL_BANDS
+) -> np.ndarray | None:
+    """Bucket PCM16LE into log-spaced FFT bands, each in ``[0, 1]``.
+
+    Returns ``None`` when there are too few samples to fill the bands.
+    """
+    if len(pcm) < bands * 4 or sample_rate <= 0:
+        return None
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    n = samples.size
+    mag = np.abs(np.fft.rfft(samples))
+    freqs = np.fft.rfftfreq(n, 1.0 / sample_rate)
+    edges = np.logspace(np.log10(_F_MIN_HZ), np.log10(sample_rate / 2.0), bands + 1)
+    sums, _ = np.histogram(freqs, bins=edges, weights=mag)
+    counts, _ = np.histogram(freqs, bins=edges)
+    buckets = sums / np.maximum(counts, 1)
+    buckets = np.sqrt(buckets / np.sqrt(n) * _GAIN)
+    return np.minimum(1.0, buckets)
+
+
+def pack_levels(levels: np.ndarray) -> bytes:
+    return np.rint(np.clip(levels, 0.0, 1.0) * 255.0).astype(np.uint8).tobytes()
+
+
+def unpack_levels(payload: bytes | bytearray | memoryview) -> list[float]:
+    return (np.frombuffer(payload, dtype=np.uint8) / 255.0).tolist()
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from collections import deque
+from collections.abc import Callable
+from typing import Any
 
+from loguru import logger
+from opentelemetry import metrics
 from pipecat.frames.frames import (
     BotStartedSpeakingFrame,
     BotStoppedSpeakingFrame,
     ErrorFrame,
+    Frame,
     InputAudioRawFrame,
     InterimTranscriptionFrame,
     LLMFullResponseEndFrame,
@@ -25,7 +32,7 @@ from pipecat.metrics.metrics import (
     ProcessingMetricsData,
     TTFBMetricsData,
 )
-from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.observers.base_observer import FramePushed
 
 from paty.bus.events import (
     AgentState,
@@ -39,8 +46,14 @@ from paty.bus.events import (
     Transcript,
 )
 from paty.bus.server import WebSocketBus
+from paty.metrics.bus import BusMetrics
+from paty.metrics.observer import FirstPushObserver
 
-_DEDUP_SIZE = 4096
+# Ring entries handled per event-loop turn before the drain task yields.
+_DRAIN_SLICE = 32
+
+# Control frames queue past a full ring up to this many times its size.
+_OVERFLOW_FACTOR = 4
 
 _STT_KEYWORDS = ("stt", "whisper", "assemblyai", "deepgram")
 _LLM_KEYWORDS = ("llm", "openai", "ollama", "llama")
@@ -58,21 +71,48 @@ def _classify(processor: str) -> str:
     return "unknown"
 
 
-class BusObserver(BaseObserver):
+class BusObserver(FirstPushObserver):
     """Observer that republishes Pipecat frames to a WebSocketBus.
 
-    Frames are observed on every pipeline edge, so a small LRU of recently
-    seen frame ids deduplicates so each logical event is emitted once.
+    Frames are dispatched by class through a table resolved once per frame
+    class; classes with no handler return before any other work. Frames are
+    observed on every pipeline edge; only the first push is handled (see
+    ``FirstPushObserver``), so each logical event is emitted once.
 
     Agent state (idle/listening/thinking/speaking) is derived from the
     speaking/thinking flags and published on transitions.
+
+    With ``ring_size`` > 0, ``on_push_frame`` only appends a (handler,
+    frame) reference to a bounded ring; a drain task does the translation
+    and publishing in slices of ``_DRAIN_SLICE``, yielding to the pipeline
+    between slices. When the ring is full, audio frames are dropped; control
+    frames still queue past ``ring_size``, since the state machine needs
+    every one, and are counted as ring overflow, up to ``_OVERFLOW_FACTOR``
+    times ``ring_size``: past that, a drain that can't keep up would only
+    grow the backlog, so they are dropped too. Events are timestamped with
+    when their frame was pushed, not when it was drained, so speech
+    durations don't include ring lag. Ring lag, drops and overflow are
+    recorded in ``paty.metrics.bus.BusMetrics``.
     """
 
-    def __init__(self, bus: WebSocketBus, **kwargs):
+    def __init__(
+        self,
+        bus: WebSocketBus,
+        *,
+        ring_size: int = 0,
+        meter: metrics.Meter | None = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self._bus = bus
-        self._seen: deque[int] = deque(maxlen=_DEDUP_SIZE)
-        self._seen_set: set[int] = set()
+        self._ring_size = ring_size
+        self._ring: deque[tuple[_Handler, Frame, FramePushed, float, int]] = deque()
+        self._ring_ready = asyncio.Event()
+        self._drain_task: asyncio.Task | None = None
+        self._metrics = BusMetrics(meter) if ring_size else None
+        # Bus time of the frame being handled when it came off the ring;
+        # None means now (no ring).
+        self._frame_ts_ms: int | None = None
 
         self._user_speaking = False
         self._bot_speaking = False
@@ -84,15 +124,6 @@ class BusObserver(BaseObserver):
         self._bot_speech_start_ms: int | None = None
         self._response_text: list[str] = []
 
-    def _first_time_seeing(self, frame_id: int) -> bool:
-        if frame_id in self._seen_set:
-            return False
-        if len(self._seen) == _DEDUP_SIZE:
-            self._seen_set.discard(self._seen[0])
-        self._seen.append(frame_id)
-        self._seen_set.add(frame_id)
-        return True
-
     def _recompute_state(self) -> None:
         if self._bot_speaking:
             new_state = AgentState.SPEAKING
@@ -104,140 +135,185 @@ class BusObserver(BaseObserver):
             new_state = AgentState.IDLE
         if new_state != self._state:
             self._state = new_state
-            self._bus.publish(EventType.STATE_CHANGED, StateChanged(state=new_state))
+            self._publish(EventType.STATE_CHANGED, StateChanged(state=new_state))
 
-    async def on_push_frame(self, data: FramePushed) -> None:
-        frame = data.frame
+    def _now_ms(self) -> int:
+        """Bus time of the frame being handled."""
+        if self._frame_ts_ms is not None:
+            return self._frame_ts_ms
+        return self._bus.ts_ms()
 
-        # Audio frames dedupe per-edge too — emit once from the first push.
-        if isinstance(frame, InputAudioRawFrame):
-            if self._user_muted:
-                return
-            if self._first_time_seeing(frame.id):
-                self._bus.publish_audio(
-                    AudioStream.MIC,
-                    frame.sample_rate,
-                    frame.num_channels,
-                    bytes(frame.audio),
-                )
-            return
-
-        if isinstance(frame, OutputAudioRawFrame):
-            if self._first_time_seeing(frame.id):
-                self._bus.publish_audio(
-                    AudioStream.AGENT,
-                    frame.sample_rate,
-                    frame.num_channels,
-                    bytes(frame.audio),
-                )
-            return
+    def _publish(self, event_type: EventType, data: Any = None) -> None:
+        self._bus.publish(event_type, data, ts_ms=self._frame_ts_ms)
 
-        if not self._first_time_seeing(frame.id):
-            return
-
-        if isinstance(frame, UserMuteStartedFrame):
-            self._user_muted = True
-            if self._user_speaking:
-                self._user_speaking = False
-                self._user_speech_start_ms = None
-                self._recompute_state()
+    async def on_push_frame(self, data: FramePushed) -> None:
+        frame = data.frame
+        cls = type(frame)
+        try:
+            handler = _DISPATCH[cls]
+        except KeyError:
+            handler = _DISPATCH[cls] = _resolve_handler(cls)
+        # Most frames on most edges are ones we never publish: skip them
+        # before paying for de-duplication.
+        if handler is None or not self._first_push(frame):
             return
-
-        if isinstance(frame, UserMuteStoppedFrame):
-            self._user_muted = False
+        if not self._ring_size:
+            handler(self, frame, data)
             return
-
-        if isinstance(frame, UserStartedSpeakingFrame):
-            if self._user_muted:
+        if len(self._ring) >= self._ring_size:
+            if handler in _DROPPABLE:
+                self._metrics.observer_dropped("audio")
                 return
-            self._user_speaking = True
-            self._user_speech_start_ms = self._bus.ts_ms()
-            self._bus.publish(EventType.USER_SPEECH_STARTED)
-            self._recompute_state()
-
-        elif isinstance(frame, UserStoppedSpeakingFrame):
-            if self._user_muted:
+            if len(self._ring) >= self._ring_size * _OVERFLOW_FACTOR:
+                self._metrics.observer_dropped("control")
                 return
+            self._metrics.observer_overflow()
+        self._ring.append(
+            (handler, frame, data, time.perf_counter(), self._bus.ts_ms())
+        )
+        if self._drain_task is None:
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain())
+        self._ring_ready.set()
+
+    async def _drain(self) -> None:
+        while True:
+            await self._ring_ready.wait()
+            self._ring_ready.clear()
+            handled = 0
+            while self._ring:
+                self._handle_next()
+                handled += 1
+                if handled % _DRAIN_SLICE == 0:
+                    await asyncio.sleep(0)
+
+    def _handle_next(self) -> None:
+        handler, frame, data, queued_at, self._frame_ts_ms = self._ring.popleft()
+        self._metrics.observer_lag(time.perf_counter() - queued_at)
+        try:
+            handler(self, frame, data)
+        except Exception:
+            logger.exception("bus: observer handler raised")
+        finally:
+            self._frame_ts_ms = None
+
+    async def cleanup(self) -> None:
+        await super().cleanup()
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
+        # Whatever is still queued is published now, e.g. session teardown.
+        while self._ring:
+            self._handle_next()
+
+    def _on_input_audio(self, frame: InputAudioRawFrame, data: FramePushed) -> None:
+        if self._user_muted:
+            return
+        self._bus.publish_audio(
+            AudioStream.MIC, frame.sample_rate, frame.num_channels, frame.audio
+        )
+
+    def _on_output_audio(self, frame: OutputAudioRawFrame, data: FramePushed) -> None:
+        self._bus.publish_audio(
+            AudioStream.AGENT, frame.sample_rate, frame.num_channels, frame.audio
+        )
+
+    def _on_user_mute_started(self, frame: Frame, data: FramePushed) -> None:
+        self._user_muted = True
+        if self._user_speaking:
             self._user_speaking = False
-            duration_ms = None
-            if self._user_speech_start_ms is not None:
-                duration_ms = self._bus.ts_ms() - self._user_speech_start_ms
-                self._user_speech_start_ms = None
-            self._bus.publish(
-                EventType.USER_SPEECH_STOPPED,
-                SpeechStopped(duration_ms=duration_ms),
-            )
-            self._recompute_state()
-
-        elif isinstance(frame, InterimTranscriptionFrame):
-            self._bus.publish(
-                EventType.USER_TRANSCRIPT_PARTIAL, Transcript(text=frame.text)
-            )
-
-        elif isinstance(frame, TranscriptionFrame):
-            self._bus.publish(
-                EventType.USER_TRANSCRIPT_FINAL, Transcript(text=frame.text)
-            )
-
-        elif isinstance(frame, LLMFullResponseStartFrame):
-            self._llm_active = True
-            self._response_text = []
-            self._bus.publish(EventType.AGENT_THINKING_STARTED)
-            self._recompute_state()
-
-        elif isinstance(frame, LLMTextFrame):
-            self._response_text.append(frame.text)
-            self._bus.publish(
-                EventType.AGENT_RESPONSE_DELTA, Transcript(text=frame.text)
-            )
-
-        elif isinstance(frame, LLMFullResponseEndFrame):
-            self._llm_active = False
-            full = "".join(self._response_text)
-            self._response_text = []
-            self._bus.publish(
-                EventType.AGENT_RESPONSE_COMPLETED,
-                ResponseCompleted(text=full),
-            )
-            self._recompute_state()
-
-        elif isinstance(frame, BotStartedSpeakingFrame):
-            self._bot_speaking = True
-            self._bot_speech_start_ms = self._bus.ts_ms()
-            self._bus.publish(EventType.AGENT_SPEECH_STARTED)
+            self._user_speech_start_ms = None
             self._recompute_state()
 
-        elif isinstance(frame, BotStoppedSpeakingFrame):
-            self._bot_speaking = False
-            duration_ms = None
-            if self._bot_speech_start_ms is not None:
-                duration_ms = self._bus.ts_ms() - self._bot_speech_start_ms
-                self._bot_speech_start_ms = None
-            self._bus.publish(
-                EventType.AGENT_SPEECH_STOPPED,
-                SpeechStopped(duration_ms=duration_ms),
-            )
-            self._recompute_state()
+    def _on_user_mute_stopped(self, frame: Frame, data: FramePushed) -> None:
+        self._user_muted = False
 
-        elif isinstance(frame, MetricsFrame):
-            self._emit_metrics(frame, source_name=getattr(data.source, "name", None))
+    def _on_user_started_speaking(self, frame: Frame, data: FramePushed) -> None:
+        if self._user_muted:
+            return
+        self._user_speaking = True
+        self._user_speech_start_ms = self._now_ms()
+        self._publish(EventType.USER_SPEECH_STARTED)
+        self._recompute_state()
 
-        elif isinstance(frame, ErrorFrame):
-            self._bus.publish(
-                EventType.ERROR,
-                ErrorData(
-                    message=str(frame.error),
-                    recoverable=not getattr(frame, "fatal", False),
-                ),
-            )
+    def _on_user_stopped_speaking(self, frame: Frame, data: FramePushed) -> None:
+        if self._user_muted:
+            return
+        self._user_speaking = False
+        duration_ms = None
+        if self._user_speech_start_ms is not None:
+            duration_ms = self._now_ms() - self._user_speech_start_ms
+            self._user_speech_start_ms = None
+        self._publish(
+            EventType.USER_SPEECH_STOPPED,
+            SpeechStopped(duration_ms=duration_ms),
+        )
+        self._recompute_state()
+
+    def _on_interim_transcription(
+        self, frame: InterimTranscriptionFrame, data: FramePushed
+    ) -> None:
+        self._publish(EventType.USER_TRANSCRIPT_PARTIAL, Transcript(text=frame.text))
+
+    def _on_transcription(self, frame: TranscriptionFrame, data: FramePushed) -> None:
+        self._publish(EventType.USER_TRANSCRIPT_FINAL, Transcript(text=frame.text))
+
+    def _on_llm_response_start(self, frame: Frame, data: FramePushed) -> None:
+        self._llm_active = True
+        self._response_text = []
+        self._publish(EventType.AGENT_THINKING_STARTED)
+        self._recompute_state()
+
+    def _on_llm_text(self, frame: LLMTextFrame, data: FramePushed) -> None:
+        self._response_text.append(frame.text)
+        self._publish(EventType.AGENT_RESPONSE_DELTA, Transcript(text=frame.text))
+
+    def _on_llm_response_end(self, frame: Frame, data: FramePushed) -> None:
+        self._llm_active = False
+        full = "".join(self._response_text)
+        self._response_text = []
+        self._publish(
+            EventType.AGENT_RESPONSE_COMPLETED,
+            ResponseCompleted(text=full),
+        )
+        self._recompute_state()
+
+    def _on_bot_started_speaking(self, frame: Frame, data: FramePushed) -> None:
+        self._bot_speaking = True
+        self._bot_speech_start_ms = self._now_ms()
+        self._publish(EventType.AGENT_SPEECH_STARTED)
+        self._recompute_state()
+
+    def _on_bot_stopped_speaking(self, frame: Frame, data: FramePushed) -> None:
+        self._bot_speaking = False
+        duration_ms = None
+        if self._bot_speech_start_ms is not None:
+            duration_ms = self._now_ms() - self._bot_speech_start_ms
+            self._bot_speech_start_ms = None
+        self._publish(
+            EventType.AGENT_SPEECH_STOPPED,
+            SpeechStopped(duration_ms=duration_ms),
+        )
+        self._recompute_state()
+
+    def _on_metrics(self, frame: MetricsFrame, data: FramePushed) -> None:
+        self._emit_metrics(frame, getattr(data.source, "name", None))
+
+    def _on_error(self, frame: ErrorFrame, data: FramePushed) -> None:
+        self._publish(
+            EventType.ERROR,
+            ErrorData(
+                message=str(frame.error),
+                recoverable=not getattr(frame, "fatal", False),
+            ),
+        )
 
     def _emit_metrics(self, frame: MetricsFrame, source_name: str | None) -> None:
-        # A MetricsFrame crosses every downstream edge; attribute only the
-        # first hop (source matches the processor that emitted the entry)
-        # so one tick = one publish.
+        # Handled on the frame's first push only, so one tick = one publish.
+        # A frame another processor re-emits would also be first pushed by
+        # it; only take the entries from the processor that measured them.
         tick_kwargs: dict[str, float | str] = {}
         for entry in frame.data:
-            if source_name and source_name != entry.processor:
+            if source_name != entry.processor:
                 continue
             category = _classify(entry.processor)
             if isinstance(entry, TTFBMetricsData):
@@ -248,4 +324,41 @@ class BusObserver(BaseObserver):
                 tick_kwargs["llm_ms"] = entry.value * 1000
                 tick_kwargs["processor"] = entry.processor
         if tick_kwargs:
-            self._bus.publish(EventType.METRICS_TICK, MetricsTick(**tick_kwargs))
+            self._publish(EventType.METRICS_TICK, MetricsTick(**tick_kwargs))
+
+
+_Handler = Callable[[BusObserver, Any, FramePushed], None]
+
+# Frame class -> handler. Subclasses resolve through their MRO, so e.g.
+# TTSAudioRawFrame is handled as OutputAudioRawFrame.
+_HANDLERS: dict[type[Frame], _Handler] = {
+    InputAudioRawFrame: BusObserver._on_input_audio,
+    OutputAudioRawFrame: BusObserver._on_output_audio,
+    UserMuteStartedFrame: BusObserver._on_user_mute_started,
+    UserMuteStoppedFrame: BusObserver._on_user_mute_stopped,
+    UserStartedSpeakingFrame: BusObserver._on_user_started_speaking,
+    UserStoppedSpeakingFrame: BusObserver._on_user_stopped_speaking,
+    InterimTranscriptionFrame: BusObserver._on_interim_transcription,
+    TranscriptionFrame: BusObserver._on_transcription,
+    LLMFullResponseStartFrame: BusObserver._on_llm_response_start,
+    LLMTextFrame: BusObserver._on_llm_text,
+    LLMFullResponseEndFrame: BusObserver._on_llm_response_end,
+    BotStartedSpeakingFrame: BusObserver._on_bot_started_speaking,
+    BotStoppedSpeakingFrame: BusObserver._on_bot_stopped_speaking,
+    MetricsFrame: BusObserver._on_metrics,
+    ErrorFrame: BusObserver._on_error,
+}
+
+# Best-effort streams: the handlers whose frames a full ring may drop.
+_DROPPABLE = frozenset({BusObserver._on_input_audio, BusObserver._on_output_audio})
+
+# Filled on first sight of each concrete frame class; None = ignored.
+_DISPATCH: dict[type[Frame], _Handler | None] = {}
+
+
+def _resolve_handler(cls: type[Frame]) -> _Handler | None:
+    for base in cls.__mro__:
+        handler = _HANDLERS.get(base)
+        if handler is not None:
+            return handler
+    return None
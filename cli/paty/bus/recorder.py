@@ -0,0 +1,383 @@
+"""Session recorder: an append-only, chunked on-disk log of a bus session.
+
+Layout of ``<name>.paty``:
+
+    file header   8 bytes   FILE_MAGIC
+    chunk*        CHUNK_HEADER (magic, payload length, record count, crc32)
+                  followed by that many records
+
+    record        RECORD_HEADER (kind, ts_ms, seq, length) + payload
+                  kind EVENT: the control event as UTF-8 JSON
+                  kind AUDIO: the binary audio frame exactly as on the wire
+
+``ts_ms`` and ``seq`` are the bus's own (ms since session start; event seq
+or per-stream audio seq), so a log replays with its original timing.
+
+``<name>.paty.idx`` is a sidecar of fixed-size INDEX_ENTRY rows, one per
+chunk: file offset, record count, first/last ts_ms and first/last event seq.
+It is what makes seeking cheap; if it is missing or behind (e.g. after a
+crash) :class:`SessionReader` rebuilds it by scanning chunks, each of which
+is CRC-checked so a torn final write is detected and ignored.
+
+Writes are buffered into chunks and done on a writer thread, so recording
+never blocks the event loop; records the writer can't keep up with are
+dropped and counted rather than queued without bound. ``close`` joins that
+thread, so async callers run it off the loop. The bus records in-process
+when given a ``record_path``; ``paty bus record`` records a running bus as
+a subscriber.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+
+import websockets
+from loguru import logger
+from rich.console import Console
+
+from paty.bus.codec import _HEADER as _AUDIO_HEADER
+from paty.bus.codec import is_audio_frame
+from paty.bus.encoding import SUBPROTOCOLS, Encoding, decode_event
+
+FILE_MAGIC = b"PATYLOG1"
+CHUNK_MAGIC = b"CHNK"
+CHUNK_HEADER = struct.Struct("<4sIII")
+RECORD_HEADER = struct.Struct("<BIII")
+INDEX_ENTRY = struct.Struct("<QIIIII")
+INDEX_SUFFIX = ".idx"
+
+CHUNK_MAX_BYTES = 256 * 1024
+FLUSH_INTERVAL_S = 1.0
+# Records waiting for the writer thread; past this they are dropped.
+QUEUE_MAX = 16384
+
+_STOP = object()
+
+
+class RecordKind(IntEnum):
+    EVENT = 1
+    AUDIO = 2
+
+
+@dataclass(frozen=True)
+class Record:
+    kind: RecordKind
+    ts_ms: int
+    seq: int
+    payload: bytes
+
+
+@dataclass(frozen=True)
+class ChunkIndex:
+    offset: int
+    count: int
+    first_ts_ms: int
+    last_ts_ms: int
+    first_event_seq: int  # 0 if the chunk holds no events
+    last_event_seq: int
+
+
+class SessionRecorder:
+    """Appends bus events and audio frames to a session log.
+
+    ``record_event`` / ``record_audio`` only enqueue and are safe to call
+    from the event loop; a writer thread packs records into chunks of up to
+    ``chunk_max_bytes`` and writes one at least every ``flush_interval_s``.
+    A record that finds ``max_queued`` already waiting, or no writer running
+    (not started, closed, or died), is counted in ``dropped`` instead.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        chunk_max_bytes: int = CHUNK_MAX_BYTES,
+        flush_interval_s: float = FLUSH_INTERVAL_S,
+        max_queued: int = QUEUE_MAX,
+    ) -> None:
+        self.path = Path(path)
+        self.chunk_max_bytes = chunk_max_bytes
+        self.flush_interval_s = flush_interval_s
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._thread: threading.Thread | None = None
+        self.records = 0
+        self.bytes_written = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._run, name="paty-bus-recorder", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"bus: recording session to {self.path}")
+
+    def close(self) -> None:
+        """Flush everything queued so far and stop the writer thread."""
+        if self._thread is None:
+            return
+        # Waits while the queue is full and the writer is draining it.
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self._thread.join()
+        self._thread = None
+        if self.dropped:
+            logger.warning(f"bus: {self.dropped} records not written to {self.path}")
+
+    def record_event(self, seq: int, ts_ms: int, text: str) -> None:
+        self._put((RecordKind.EVENT, ts_ms, seq, text))
+
+    def record_audio(self, frame: bytes | bytearray | memoryview) -> None:
+        # The frame header already carries ts_ms/seq; parsed on the writer.
+        self._put((RecordKind.AUDIO, 0, 0, frame))
+
+    def _put(self, item: tuple) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if not self.dropped:
+                logger.warning("bus: recorder falling behind; dropping records")
+            self.dropped += 1
+
+    def _run(self) -> None:
+        index_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+        with open(self.path, "wb") as log, open(index_path, "wb") as index:
+            log.write(FILE_MAGIC)
+            chunk = _ChunkBuilder()
+            deadline = time.monotonic() + self.flush_interval_s
+            while True:
+                timeout = max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    self._write_chunk(log, index, chunk)
+                    return
+                if item is not None:
+                    chunk.add(*item)
+                due = time.monotonic() >= deadline
+                if chunk.size >= self.chunk_max_bytes or due:
+                    self._write_chunk(log, index, chunk)
+                    chunk = _ChunkBuilder()
+                    deadline = time.monotonic() + self.flush_interval_s
+
+    def _write_chunk(self, log, index, chunk: _ChunkBuilder) -> None:
+        if not chunk.count:
+            return
+        offset = log.tell()
+        payload = bytes(chunk.buf)
+        log.write(
+            CHUNK_HEADER.pack(
+                CHUNK_MAGIC, len(payload), chunk.count, zlib.crc32(payload)
+            )
+        )
+        log.write(payload)
+        log.flush()
+        # Index after data: an index entry never points past the log.
+        index.write(chunk.index_entry(offset))
+        index.flush()
+        self.records += chunk.count
+        self.bytes_written += CHUNK_HEADER.size + len(payload)
+
+
+class _ChunkBuilder:
+    __slots__ = ("buf", "count", "first_seq", "first_ts", "last_seq", "last_ts")
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+        self.count = 0
+        self.first_ts = self.last_ts = 0
+        self.first_seq = self.last_seq = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.buf)
+
+    def add(self, kind: RecordKind, ts_ms: int, seq: int, payload: str | bytes) -> None:
+        if kind is RecordKind.AUDIO:
+            if not is_audio_frame(payload):
+                return
+            *_, seq, ts_ms = _AUDIO_HEADER.unpack_from(payload)
+        else:
+            payload = payload.encode()
+            if not self.first_seq:
+                self.first_seq = seq
+            self.last_seq = seq
+        if not self.count:
+            self.first_ts = ts_ms
+        self.last_ts = max(self.last_ts, ts_ms)
+        self.buf += RECORD_HEADER.pack(kind, ts_ms, seq, len(payload))
+        self.buf += payload
+        self.count += 1
+
+    def index_entry(self, offset: int) -> bytes:
+        return INDEX_ENTRY.pack(
+            offset,
+            self.count,
+            self.first_ts,
+            self.last_ts,
+            self.first_seq,
+            self.last_seq,
+        )
+
+
+class SessionReader:
+    """Reads a session log written by :class:`SessionRecorder`."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"not a PATY session log: {self.path}")
+        self.index = self._load_index()
+
+    @property
+    def duration_ms(self) -> int:
+        return self.index[-1].last_ts_ms if self.index else 0
+
+    @property
+    def record_count(self) -> int:
+        return sum(c.count for c in self.index)
+
+    def records(
+        self, start_ms: int = 0, kinds: frozenset[RecordKind] | None = None
+    ) -> Iterator[Record]:
+        """Records in log order, starting at the chunk containing ``start_ms``."""
+        first = max(
+            0, bisect.bisect_right([c.last_ts_ms for c in self.index], start_ms) - 1
+        )
+        with open(self.path, "rb") as f:
+            for chunk in self.index[first:]:
+                for record in self._read_chunk(f, chunk.offset):
+                    if record.ts_ms < start_ms:
+                        continue
+                    if kinds is None or record.kind in kinds:
+                        yield record
+
+    def _read_chunk(self, f, offset: int) -> list[Record]:
+        f.seek(offset)
+        header = f.read(CHUNK_HEADER.size)
+        if len(header) < CHUNK_HEADER.size:
+            return []
+        magic, length, count, crc = CHUNK_HEADER.unpack(header)
+        payload = f.read(length)
+        if magic != CHUNK_MAGIC or len(payload) < length or zlib.crc32(payload) != crc:
+            return []
+        records = []
+        view = memoryview(payload)
+        pos = 0
+        for _ in range(count):
+            kind, ts_ms, seq, size = RECORD_HEADER.unpack_from(view, pos)
+            pos += RECORD_HEADER.size
+            records.append(
+                Record(RecordKind(kind), ts_ms, seq, bytes(view[pos : pos + size]))
+            )
+            pos += size
+        return records
+
+    def _load_index(self) -> list[ChunkIndex]:
+        index_path = self.path.with_name(self.path.name + INDEX_SUFFIX)
+        entries: list[ChunkIndex] = []
+        with contextlib.suppress(FileNotFoundError):
+            raw = index_path.read_bytes()
+            usable = len(raw) - len(raw) % INDEX_ENTRY.size
+            entries = [
+                ChunkIndex(*row) for row in INDEX_ENTRY.iter_unpack(raw[:usable])
+            ]
+        # The index is written after each chunk, so it can only lag the log.
+        end = entries[-1].offset if entries else len(FILE_MAGIC)
+        if not entries or self._chunk_end(entries[-1]) < os.path.getsize(self.path):
+            entries = entries[:-1] + self._scan(end)
+        return entries
+
+    def _chunk_end(self, chunk: ChunkIndex) -> int:
+        with open(self.path, "rb") as f:
+            f.seek(chunk.offset)
+            header = f.read(CHUNK_HEADER.size)
+        if len(header) < CHUNK_HEADER.size:
+            return chunk.offset
+        _, length, _, _ = CHUNK_HEADER.unpack(header)
+        return chunk.offset + CHUNK_HEADER.size + length
+
+    def _scan(self, offset: int) -> list[ChunkIndex]:
+        entries = []
+        with open(self.path, "rb") as f:
+            while True:
+                records = self._read_chunk(f, offset)
+                if not records:
+                    break
+                events = [r.seq for r in records if r.kind is RecordKind.EVENT]
+                entries.append(
+                    ChunkIndex(
+                        offset=offset,
+                        count=len(records),
+                        first_ts_ms=records[0].ts_ms,
+                        last_ts_ms=max(r.ts_ms for r in records),
+                        first_event_seq=events[0] if events else 0,
+                        last_event_seq=events[-1] if events else 0,
+                    )
+                )
+                offset = f.tell()
+        return entries
+
+
+async def record(url: str, path: str | Path, *, audio: bool = True) -> None:
+    """Subscribe to a running bus and record it until the connection ends."""
+    from paty.bus.server import resume_url  # server imports this module
+
+    console = Console()
+    recorder = SessionRecorder(path)
+    console.print(f"[dim]connecting to {url}...[/]")
+    recorder.start()
+    try:
+        # resume=0: pick up session.started and whatever preceded us.
+        async with websockets.connect(
+            resume_url(url), subprotocols=[SUBPROTOCOLS[Encoding.JSON]]
+        ) as ws:
+            if not audio:
+                await ws.send(json.dumps({"action": "subscribe", "audio": []}))
+            console.print(
+                f"[green]recording[/] to {recorder.path} — [dim]Ctrl+C to stop[/]"
+            )
+            async for msg in ws:
+                if isinstance(msg, bytes):
+                    recorder.record_audio(msg)
+                    continue
+                event = decode_event(msg)
+                if event is not None:
+                    recorder.record_event(event["seq"], event["ts_ms"], msg)
+    except (OSError, websockets.exceptions.WebSocketException) as e:
+        console.print(f"[red]connection error:[/] {e}")
+        raise SystemExit(1) from e
+    finally:
+        recorder.close()
+        console.print(
+            f"[dim]{recorder.records} records, {recorder.bytes_written} bytes "
+            f"written to {recorder.path}[/]"
+        )
+
+
+def run(url: str, path: str | Path, audio: bool = True) -> None:
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(record(url, path, audio=audio))
@@ -0,0 +1,183 @@
+"""`paty bus replay` — serve a recorded session back through a WebSocketBus.
+
+Records from a session log (``paty.bus.recorder``) are re-published through
+the bus's normal ``publish``/``publish_audio`` path, so subscribers see
+exactly what a live agent would send: fresh session id, seq and ts_ms, the
+same fan-out, filtering, batching and backpressure. Without models or audio
+hardware, a TUI or any other subscriber can be driven by the same input
+over and over.
+
+Pacing follows each record's original ``ts_ms``: ``speed=1`` is real time,
+``speed=4`` four times faster. ``speed=None`` replays as fast as the
+subscribers keep up. It waits whenever a subscriber's control queue reaches
+the bus's pressure threshold, so nobody is disconnected and the events
+delivered don't depend on machine speed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from rich.console import Console
+
+from paty.bus.codec import AudioCodec, unpack_audio_frame
+from paty.bus.compress import ulaw_decode
+from paty.bus.events import EventType
+from paty.bus.recorder import Record, RecordKind, SessionReader
+from paty.bus.server import CONTROL_QUEUE_PRESSURE, WebSocketBus
+
+# Fast mode yields to the subscribers' senders this often at least.
+_YIELD_EVERY = 32
+
+
+@dataclass
+class ReplayReport:
+    events: int = 0
+    audio_frames: int = 0
+    skipped: int = 0
+    session_ms: int = 0
+    wall_s: float = 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.session_ms / 1000 / self.wall_s if self.wall_s else 0.0
+
+
+async def replay_session(
+    bus: WebSocketBus,
+    reader: SessionReader,
+    *,
+    speed: float | None = 1.0,
+    start_ms: int = 0,
+    audio: bool = True,
+) -> ReplayReport:
+    """Publish ``reader``'s records through a started ``bus``."""
+    kinds = None if audio else frozenset({RecordKind.EVENT})
+    report = ReplayReport()
+    t0 = time.monotonic()
+    first_ts: int | None = None
+    for n, record in enumerate(reader.records(start_ms, kinds)):
+        if first_ts is None:
+            first_ts = record.ts_ms
+        offset_ms = record.ts_ms - first_ts
+        if speed is not None:
+            delay = t0 + offset_ms / 1000 / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            while bus.control_backlog() >= CONTROL_QUEUE_PRESSURE:
+                await asyncio.sleep(0.001)
+            if n % _YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+        if _publish(bus, record):
+            if record.kind is RecordKind.EVENT:
+                report.events += 1
+            else:
+                report.audio_frames += 1
+        else:
+            report.skipped += 1
+        report.session_ms = offset_ms
+    report.wall_s = time.monotonic() - t0
+    return report
+
+
+def _publish(bus: WebSocketBus, record: Record) -> bool:
+    if record.kind is RecordKind.EVENT:
+        try:
+            event = json.loads(record.payload)
+            event_type = EventType(event["type"])
+        except (ValueError, KeyError, TypeError):
+            return False
+        bus.publish(event_type, event.get("data") or {})
+        return True
+    try:
+        frame = unpack_audio_frame(record.payload)
+    except ValueError:
+        return False
+    if frame.levels:
+        return False
+    if frame.codec is AudioCodec.ULAW:
+        pcm = ulaw_decode(frame.pcm)
+    elif frame.codec is AudioCodec.PCM16:
+        pcm = frame.pcm
+    else:
+        return False  # Opus: `paty bus record` never asks for it
+    bus.publish_audio(frame.stream, frame.sample_rate, frame.channels, pcm)
+    return True
+
+
+async def serve(
+    path: str | Path,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    speed: float | None = 1.0,
+    start_ms: int = 0,
+    audio: bool = True,
+    wait_for: int = 1,
+    loop: bool = False,
+    console: Console | None = None,
+) -> None:
+    """Start a bus, wait for ``wait_for`` subscribers, then replay ``path``."""
+    console = console or Console()
+    reader = SessionReader(path)
+    bus = WebSocketBus(host=host, port=port)
+    await bus.start()
+    try:
+        console.print(
+            f"[bold]Replaying[/] {reader.path} "
+            f"({reader.duration_ms / 1000:.1f}s, {reader.record_count} records) "
+            f"on ws://{host}:{port}"
+        )
+        if wait_for:
+            console.print(f"[dim]waiting for {wait_for} subscriber(s)...[/]")
+            while bus.subscriber_count < wait_for:
+                await asyncio.sleep(0.05)
+        while True:
+            report = await replay_session(
+                bus, reader, speed=speed, start_ms=start_ms, audio=audio
+            )
+            console.print(
+                f"[green]replayed[/] {report.events} events, "
+                f"{report.audio_frames} audio frames "
+                f"({report.skipped} skipped) in {report.wall_s:.2f}s — "
+                f"{report.speedup:.1f}x real time"
+            )
+            if not loop:
+                break
+        # Let the senders flush what is still queued before closing.
+        while bus.control_backlog():
+            await asyncio.sleep(0.01)
+    finally:
+        await bus.stop()
+
+
+def run(
+    path: str | Path,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    speed: float | None = 1.0,
+    start_ms: int = 0,
+    audio: bool = True,
+    wait_for: int = 1,
+    loop: bool = False,
+) -> None:
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(
+            serve(
+                path,
+                host=host,
+                port=port,
+                speed=speed,
+                start_ms=start_ms,
+                audio=audio,
+                wait_for=wait_for,
+                loop=loop,
+            )
+        )
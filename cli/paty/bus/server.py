@@ -1,6 +1,27 @@
 """WebSocket server bus: fans out control events + audio frames to subscribers.
 
-Publisher-only for v1 — incoming client messages are discarded.
+Inbound text frames are parsed as ``BusCommand``s. ``subscribe`` narrows
+what the server sends to that connection (and can switch it to coalesced or
+level-only audio, see ``paty.bus.batch``); every other action is handed to
+the registered command handler.
+
+Recent control events are kept in a bounded replay buffer. A client that
+connects with ``?resume=<seq>`` (its last seen seq, or ``0`` for all
+retained history) gets every retained event after that seq before any live
+event, with no gap or duplicate between the two. The latest
+``session.started`` is pinned so a resuming client always learns the
+session, even after it has aged out of the buffer. The replayed events
+are sent from a list of their own, ahead of the live queue, so a resumed
+client gets the same live backpressure budget as any other.
+
+One bus can host many sessions (``BusSession``), e.g. one per concurrent
+agent. A client follows one with ``?session=<id>``, the default session if
+it omits it, or the control events of all of them with ``?session=*``.
+Seqs are per session, so an all-sessions client can only resume from ``0``
+(every session's retained history).
+
+With ``record_path`` set, every control event and raw audio frame is also
+written to a session log (see ``paty.bus.recorder``) by a writer thread.
 """
 
 from __future__ import annotations
@@ -10,82 +31,722 @@ import contextlib
 import inspect
 import time
 import uuid
+from collections import deque
 from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
 from typing import Any
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit, urlunsplit
 
 import websockets
 from loguru import logger
+from opentelemetry import metrics
 from pydantic import BaseModel, ValidationError
 from websockets.asyncio.server import ServerConnection
 
-from paty.bus.codec import pack_audio_frame
+from paty.bus.batch import MAX_BATCH_MS, AudioBatcher
+from paty.bus.codec import AudioCodec, encode_audio_frame
+from paty.bus.compress import negotiate_codec
+from paty.bus.encoding import Encoding, EventEncoder, negotiate, select_subprotocol
 from paty.bus.events import (
     AudioStream,
+    BusAction,
     BusCommand,
-    Event,
     EventType,
 )
+from paty.bus.recorder import SessionRecorder
+from paty.metrics.bus import BusMetrics
 
 CommandHandler = Callable[[BusCommand], Awaitable[None] | None]
+# (batch_ms, levels, codec) — subscribers with the same variant share a batcher.
+_AudioVariant = tuple[int, bool, AudioCodec]
+_RAW_AUDIO: _AudioVariant = (0, False, AudioCodec.PCM16)
 
 CONTROL_QUEUE_MAX = 256
+# Queue depth at which a subscriber counts as slow and superseding events
+# start to coalesce instead of queueing.
+CONTROL_QUEUE_PRESSURE = CONTROL_QUEUE_MAX // 4
 AUDIO_QUEUE_MAX = 512
+REPLAY_MAX_EVENTS = 1024
+REPLAY_MAX_BYTES = 1_048_576
+
+
+class _Envelope:
+    """One published control event, shared by every subscriber queue.
+
+    Encoded lazily by the subscribers' senders, at most once per encoding,
+    so publishing never pays for an encoding nobody asked for.
+    """
+
+    __slots__ = ("_json", "_msgpack", "data", "encoder", "event_type", "seq", "ts_ms")
+
+    def __init__(
+        self,
+        encoder: EventEncoder,
+        event_type: EventType,
+        seq: int,
+        ts_ms: int,
+        data: dict[str, Any],
+    ) -> None:
+        self.encoder = encoder
+        self.event_type = event_type
+        self.seq = seq
+        self.ts_ms = ts_ms
+        self.data = data
+        self._json: str | None = None
+        self._msgpack: bytes | None = None
+
+    def encode(self, encoding: Encoding) -> str | bytes:
+        if encoding is Encoding.MSGPACK:
+            if self._msgpack is None:
+                self._msgpack = self.encoder.to_msgpack(self.seq, self.ts_ms, self.data)
+            return self._msgpack
+        if self._json is None:
+            self._json = self.encoder.to_json(self.seq, self.ts_ms, self.data)
+        return self._json
+
+
+class _ReplayBuffer:
+    """Recently published envelopes, capped by count and by encoded size.
+
+    Size is measured on the JSON encoding (memoized on the envelope, so JSON
+    subscribers don't pay for it twice). Seqs in the ring are contiguous,
+    which makes a resume lookup an index rather than a scan.
+    """
+
+    def __init__(self, max_events: int, max_bytes: int) -> None:
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self._ring: deque[tuple[_Envelope, int]] = deque()
+        self._bytes = 0
+        self._pinned: _Envelope | None = None
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def clear(self) -> None:
+        self._ring.clear()
+        self._bytes = 0
+        self._pinned = None
+
+    def append(self, envelope: _Envelope) -> None:
+        if self.max_events <= 0:
+            return
+        if envelope.event_type is EventType.SESSION_STARTED:
+            self._pinned = envelope
+        size = len(envelope.encode(Encoding.JSON))
+        self._ring.append((envelope, size))
+        self._bytes += size
+        # Always keep the newest event, even if it alone exceeds max_bytes.
+        while len(self._ring) > 1 and (
+            len(self._ring) > self.max_events or self._bytes > self.max_bytes
+        ):
+            _, evicted = self._ring.popleft()
+            self._bytes -= evicted
+
+    def since(self, seq: int) -> list[_Envelope]:
+        """Retained envelopes with a seq greater than ``seq``, oldest first."""
+        if not self._ring:
+            return []
+        first = self._ring[0][0].seq
+        start = max(seq + 1 - first, 0)
+        backlog = [env for env, _ in islice(self._ring, start, None)]
+        pinned = self._pinned
+        if pinned is not None and seq < pinned.seq < first:
+            backlog.insert(0, pinned)
+        return backlog
+
+
+# Only the newest of these matters to a subscriber that is behind.
+_SUPERSEDING = frozenset({EventType.STATE_CHANGED, EventType.METRICS_TICK})
+
+
+class _ControlQueue:
+    """A subscriber's bounded control-event FIFO that coalesces under pressure.
+
+    Below ``pressure`` it is a plain FIFO. At or above it, an
+    ``agent.response.delta`` is merged into the last queued delta (as long
+    as only superseding events were queued after it), and a
+    ``state.changed`` / ``metrics.tick`` replaces the one still queued, so a
+    briefly stalled subscriber catches up with fewer, equivalent events.
+    Only an event that can't be coalesced into a full queue overflows.
+
+    A merged or superseding event leaves the queued one's place and goes to
+    the back, where its seq belongs, so seqs on the wire only increase.
+    """
+
+    def __init__(self, maxsize: int, pressure: int = CONTROL_QUEUE_PRESSURE) -> None:
+        self.maxsize = maxsize
+        self.pressure = pressure
+        self._items: deque[_Envelope] = deque()
+        # Queued superseding envelopes, by type, so they can be replaced.
+        self._latest: dict[EventType, _Envelope] = {}
+        # The last queued delta, while later deltas may still merge into it.
+        self._open_delta: _Envelope | None = None
+        self._ready = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def put_nowait(self, envelope: _Envelope) -> str | None:
+        """Queue ``envelope``; return how it was coalesced, if it was.
+
+        Raises ``asyncio.QueueFull`` if it could not be queued or coalesced.
+        """
+        items = self._items
+        event_type = envelope.event_type
+        if len(items) >= self.pressure:
+            if (
+                event_type is EventType.AGENT_RESPONSE_DELTA
+                and self._open_delta is not None
+            ):
+                merged = _merge_deltas(self._open_delta, envelope)
+                items.remove(self._open_delta)
+                items.append(merged)
+                self._open_delta = merged
+                return "merged"
+            previous = self._latest.get(event_type)
+            if previous is not None:
+                items.remove(previous)
+                items.append(envelope)
+                self._latest[event_type] = envelope
+                return "superseded"
+        if len(items) >= self.maxsize:
+            raise asyncio.QueueFull
+        items.append(envelope)
+        if event_type in _SUPERSEDING:
+            self._latest[event_type] = envelope
+        elif event_type is EventType.AGENT_RESPONSE_DELTA:
+            self._open_delta = envelope
+        else:
+            self._open_delta = None
+        self._ready.set()
+        return None
+
+    async def get(self) -> _Envelope:
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        envelope = self._items.popleft()
+        if self._latest.get(envelope.event_type) is envelope:
+            del self._latest[envelope.event_type]
+        elif envelope is self._open_delta:
+            self._open_delta = None
+        return envelope
+
+
+def _merge_deltas(first: _Envelope, second: _Envelope) -> _Envelope:
+    # A new envelope: the queued one may be shared with other subscribers.
+    data = {
+        **first.data,
+        "text": first.data.get("text", "") + second.data.get("text", ""),
+    }
+    return _Envelope(second.encoder, second.event_type, second.seq, second.ts_ms, data)
+
+
+def _resume_seq(path: str | None) -> int | None:
+    """The ``?resume=<seq>`` a client connected with, if any (and valid)."""
+    if not path:
+        return None
+    values = parse_qs(urlsplit(path).query).get("resume")
+    if not values:
+        return None
+    try:
+        seq = int(values[-1])
+    except ValueError:
+        logger.debug(f"bus: ignoring malformed resume={values[-1]!r}")
+        return None
+    return max(seq, 0)
+
+
+def _session_param(path: str | None) -> str | None:
+    """The ``?session=<id>`` (or ``*``) a client connected with, if any."""
+    if not path:
+        return None
+    values = parse_qs(urlsplit(path).query).get("session")
+    return values[-1] if values else None
+
+
+def resume_url(url: str, seq: int = 0) -> str:
+    """``url`` with ``resume=<seq>`` set, so the bus replays what we missed.
+
+    Clients usually connect after the agent has already published
+    ``session.started`` (e.g. the TUI after the launcher's boot screen), so
+    they ask for the retained history. Only ``0`` is accepted with
+    ``session=*``: each session numbers its events on its own.
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "resume"]
+    query.append(("resume", str(seq)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
 
 
 @dataclass(eq=False)
 class _Subscriber:
     ws: ServerConnection
-    control_queue: asyncio.Queue = field(
-        default_factory=lambda: asyncio.Queue(maxsize=CONTROL_QUEUE_MAX)
+    encoding: Encoding = Encoding.JSON
+    control_queue: _ControlQueue = field(
+        default_factory=lambda: _ControlQueue(CONTROL_QUEUE_MAX)
     )
     audio_queue: asyncio.Queue = field(
         default_factory=lambda: asyncio.Queue(maxsize=AUDIO_QUEUE_MAX)
     )
+    # Retained events a resuming client missed; sent before control_queue.
+    replay: deque[_Envelope] = field(default_factory=deque)
     tasks: list[asyncio.Task] = field(default_factory=list)
+    closing: bool = False
+    # Server-side filters set by a ``subscribe`` command. ``None`` prefixes
+    # means every event type; the per-type verdict is memoized.
+    event_prefixes: tuple[str, ...] | None = None
+    audio_streams: frozenset[AudioStream] = frozenset(AudioStream)
+    audio_batch_ms: int = 0
+    audio_levels: bool = False
+    audio_codec: AudioCodec = AudioCodec.PCM16
+    # The session this subscriber follows; None = every session.
+    channel: BusSession | None = None
+    _wants: dict[EventType, bool] = field(default_factory=dict)
+
+    def subscribe(
+        self,
+        events: list[str] | None,
+        audio: list[str] | None,
+        audio_batch_ms: int | None = None,
+        audio_levels: bool | None = None,
+        audio_codec: str | None = None,
+    ) -> None:
+        if events is not None:
+            self.event_prefixes = tuple(p.rstrip(".") for p in events)
+            self._wants.clear()
+        if audio is not None:
+            self.audio_streams = frozenset(AudioStream[name.upper()] for name in audio)
+        if audio_batch_ms is not None:
+            self.audio_batch_ms = max(0, min(audio_batch_ms, MAX_BATCH_MS))
+        if audio_levels is not None:
+            self.audio_levels = audio_levels
+        if audio_codec is not None:
+            self.audio_codec = negotiate_codec(AudioCodec[audio_codec.upper()])
+
+    @property
+    def audio_variant(self) -> _AudioVariant:
+        codec = AudioCodec.PCM16 if self.audio_levels else self.audio_codec
+        return (self.audio_batch_ms, self.audio_levels, codec)
+
+    def wants_event(self, event_type: EventType) -> bool:
+        if self.event_prefixes is None:
+            return True
+        wants = self._wants.get(event_type)
+        if wants is None:
+            wants = any(
+                event_type == p or event_type.startswith(p + ".")
+                for p in self.event_prefixes
+            )
+            self._wants[event_type] = wants
+        return wants
+
+
+class BusSession:
+    """One session's channel on a :class:`WebSocketBus`.
+
+    Each session has its own id, clock (``ts_ms``), event seq, audio seqs,
+    replay buffer, audio batchers, recorder and command handler. Publishing
+    only walks the session's own subscribers plus the all-sessions ones, so
+    one busy session costs nothing for subscribers of another.
+    """
+
+    def __init__(self, bus: WebSocketBus, session_id: str) -> None:
+        self._bus = bus
+        self.session_id = session_id
+        self.closed = False
+        self._started_at_mono = time.monotonic()
+        self._event_seq = 0
+        self._audio_seq: dict[AudioStream, int] = {
+            AudioStream.MIC: 0,
+            AudioStream.AGENT: 0,
+        }
+        self._encoders: dict[EventType, EventEncoder] = {}
+        self._batchers: dict[tuple[AudioStream, _AudioVariant], AudioBatcher] = {}
+        self._replay = _ReplayBuffer(bus.replay_max_events, bus.replay_max_bytes)
+        self._subs: set[_Subscriber] = set()
+        self._on_command: CommandHandler | None = None
+        self._recorder: SessionRecorder | None = None
+        path = bus._record_path(session_id)
+        if path is not None:
+            self._recorder = SessionRecorder(path)
+            self._recorder.start()
+
+    def on_command(self, handler: CommandHandler | None) -> None:
+        """Register a callback fired for every valid inbound BusCommand
+        from this session's subscribers."""
+        self._on_command = handler
+
+    def ts_ms(self) -> int:
+        return int((time.monotonic() - self._started_at_mono) * 1000)
+
+    def audio_seq(self, stream: AudioStream) -> int:
+        """Seq of the last frame published on ``stream``."""
+        return self._audio_seq[stream]
+
+    async def _close(self) -> list[_Subscriber]:
+        self.closed = True
+        subs = list(self._subs)
+        self._subs.clear()
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            # Joins the writer thread and flushes; keep a slow disk off the
+            # loop serving the other sessions.
+            await asyncio.to_thread(recorder.close)
+        return subs
+
+    def publish(
+        self,
+        event_type: EventType,
+        data: BaseModel | dict[str, Any] | None = None,
+        *,
+        ts_ms: int | None = None,
+    ) -> None:
+        """Publish a control event to this session's subscribers. Non-blocking.
+
+        No Pydantic envelope is built here: the event is queued as a shared
+        ``_Envelope`` and serialized by each subscriber's sender with the
+        precompiled encoder for its type. ``ts_ms`` (default: now) is for
+        callers that publish what happened a moment ago.
+        """
+        bus = self._bus
+        if bus._server is None or self.closed:
+            return
+        payload = {}
+        if isinstance(data, BaseModel):
+            payload = data.model_dump(mode="json", exclude_none=True)
+        elif isinstance(data, dict):
+            payload = data
+        encoder = self._encoders.get(event_type)
+        if encoder is None:
+            encoder = EventEncoder(self.session_id, event_type)
+            self._encoders[event_type] = encoder
+        self._event_seq += 1
+        envelope = _Envelope(
+            encoder,
+            event_type,
+            self._event_seq,
+            self.ts_ms() if ts_ms is None else ts_ms,
+            payload,
+        )
+        self._replay.append(envelope)
+        if self._recorder is not None:
+            # Cached on the envelope, so JSON subscribers reuse this encoding.
+            self._recorder.record_event(
+                envelope.seq, envelope.ts_ms, envelope.encode(Encoding.JSON)
+            )
+        to_drop: list[_Subscriber] = []
+        for subs in (self._subs, bus._wildcard):
+            for sub in subs:
+                if sub.closing or not sub.wants_event(event_type):
+                    continue
+                try:
+                    coalesced = sub.control_queue.put_nowait(envelope)
+                except asyncio.QueueFull:
+                    sub.closing = True
+                    to_drop.append(sub)
+                    continue
+                if coalesced is not None:
+                    bus._metrics.event_coalesced(event_type, coalesced)
+        for sub in to_drop:
+            task = asyncio.create_task(bus._drop(sub, "control queue overflow"))
+            bus._background.add(task)
+            task.add_done_callback(bus._background.discard)
+
+    def publish_audio(
+        self,
+        stream: AudioStream,
+        sample_rate: int,
+        channels: int,
+        pcm: bytes | bytearray | memoryview,
+    ) -> None:
+        """Publish a PCM16LE audio frame to this session's subscribers.
+
+        The frame is packed once into a single read-only buffer that every
+        subscriber queue shares; ``pcm`` is copied exactly once, into that
+        buffer, so callers can pass pipeline-owned audio without copying.
+        Subscribers that asked for coalesced, compressed or level-only audio
+        share one batcher per variant instead; compressed and level-only
+        variants are computed on the codec thread and delivered when ready.
+        Audio frames carry no session id, so all-sessions subscribers never
+        get audio.
+        """
+        bus = self._bus
+        if bus._server is None or self.closed:
+            return
+        if not (self._subs or self._recorder):
+            return
+        self._audio_seq[stream] += 1
+        frame = None
+        if self._recorder is not None:
+            frame = encode_audio_frame(
+                stream=stream,
+                sample_rate=sample_rate,
+                channels=channels,
+                seq=self._audio_seq[stream],
+                ts_ms=self.ts_ms(),
+                pcm=pcm,
+            )
+            self._recorder.record_audio(frame)
+        batched: dict[_AudioVariant, list[memoryview]] = {}
+        for sub in self._subs:
+            if stream not in sub.audio_streams:
+                continue
+            variant = sub.audio_variant
+            if variant == _RAW_AUDIO:
+                if frame is None:
+                    # Packed lazily: a stream nobody subscribed to costs nothing.
+                    frame = encode_audio_frame(
+                        stream=stream,
+                        sample_rate=sample_rate,
+                        channels=channels,
+                        seq=self._audio_seq[stream],
+                        ts_ms=self.ts_ms(),
+                        pcm=pcm,
+                    )
+                bus._enqueue_audio(sub, frame)
+                continue
+            if variant in batched:
+                for f in batched[variant]:
+                    bus._enqueue_audio(sub, f)
+                continue
+            batcher = self._batcher(stream, variant)
+            _, levels, codec = variant
+            if codec is AudioCodec.PCM16 and not levels:
+                batched[variant] = frames = batcher.push(
+                    sample_rate, channels, self.ts_ms(), pcm
+                )
+                for f in frames:
+                    bus._enqueue_audio(sub, f)
+            else:
+                # Encoded or FFT'd on the codec thread, then delivered to
+                # every matching subscriber.
+                batched[variant] = []
+                self._encode_off_loop(
+                    stream, variant, batcher, sample_rate, channels, bytes(pcm)
+                )
+
+    def _batcher(self, stream: AudioStream, variant: _AudioVariant) -> AudioBatcher:
+        batcher = self._batchers.get((stream, variant))
+        if batcher is None:
+            batcher = AudioBatcher(stream, *variant)
+            self._batchers[(stream, variant)] = batcher
+        return batcher
+
+    def _encode_off_loop(
+        self,
+        stream: AudioStream,
+        variant: _AudioVariant,
+        batcher: AudioBatcher,
+        sample_rate: int,
+        channels: int,
+        pcm: bytes,
+    ) -> None:
+        bus = self._bus
+        if bus._codec_executor is None:
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            bus._codec_executor,
+            batcher.push,
+            sample_rate,
+            channels,
+            self.ts_ms(),
+            pcm,
+        )
+
+        def deliver(fut: asyncio.Future) -> None:
+            # Single worker + FIFO callbacks: frames arrive in push order.
+            if fut.cancelled():
+                return
+            if fut.exception() is not None:
+                logger.opt(exception=fut.exception()).warning(
+                    "bus: audio encoding failed"
+                )
+                return
+            frames = fut.result()
+            if not frames:
+                return
+            for sub in self._subs:
+                if stream in sub.audio_streams and sub.audio_variant == variant:
+                    for f in frames:
+                        bus._enqueue_audio(sub, f)
+
+        future.add_done_callback(deliver)
 
 
 class WebSocketBus:
     """A localhost WebSocket bus that publishes PATY session events.
 
     One connection = one subscriber. Each subscriber has independent bounded
-    queues for control (JSON text) and audio (binary) frames. Control queue
-    overflow disconnects the subscriber (never drop events); audio queue
-    overflow drops the oldest frame (streaming best-effort).
+    queues for control events and audio (binary) frames. Control events are
+    JSON text frames unless the subscriber negotiated msgpack (see
+    ``paty.bus.encoding``). A control queue under pressure coalesces
+    superseding events (see ``_ControlQueue``); overflow with an event that
+    can't be coalesced disconnects the subscriber (never silently lose
+    events). Audio queue overflow drops the oldest frame (streaming
+    best-effort). Both are counted in ``paty.metrics.bus.BusMetrics``.
+
+    One bus hosts any number of sessions (see :class:`BusSession`). ``start``
+    opens a default session, which ``publish``/``publish_audio``/
+    ``on_command``/``ts_ms`` on the bus itself act on, so a single-agent
+    process never needs to know about sessions. ``open_session`` adds more.
+    A client picks its session with ``?session=<id>`` (the default session
+    if omitted) or ``?session=*`` for the control events of every session.
+
+    The last ``replay_max_events`` control events of each session (at most
+    ``replay_max_bytes`` of JSON) are retained for clients that reconnect
+    with ``?resume=<seq>``; audio is never replayed.
+
+    ``record_path`` records each session to disk, whether or not anyone is
+    subscribed. ``{session}`` in it is replaced by the session id; without
+    it, sessions other than the default get ``-<id>`` before the suffix.
     """
 
-    def __init__(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        *,
+        replay_max_events: int = REPLAY_MAX_EVENTS,
+        replay_max_bytes: int = REPLAY_MAX_BYTES,
+        record_path: str | Path | None = None,
+        meter: metrics.Meter | None = None,
+    ) -> None:
         self.host = host
         self.port = port
+        self.replay_max_events = replay_max_events
+        self.replay_max_bytes = replay_max_bytes
+        self.record_path = record_path
+        self._metrics = BusMetrics(meter)
         self._server: websockets.asyncio.server.Server | None = None
+        self._sessions: dict[str, BusSession] = {}
+        self._default: BusSession | None = None
+        # Every connected subscriber, and those subscribed to all sessions.
         self._subs: set[_Subscriber] = set()
-        self._session_id: str = ""
-        self._started_at_mono: float = 0.0
-        self._event_seq: int = 0
-        self._audio_seq: dict[AudioStream, int] = {}
+        self._wildcard: set[_Subscriber] = set()
+        # Compression runs here, off the event loop. One worker keeps each
+        # stream's frames in order and its encoder state single-threaded.
+        self._codec_executor: ThreadPoolExecutor | None = None
         self._lock = asyncio.Lock()
         self._background: set[asyncio.Task] = set()
-        self._on_command: CommandHandler | None = None
 
-    def on_command(self, handler: CommandHandler | None) -> None:
-        """Register a callback fired for every valid inbound BusCommand."""
-        self._on_command = handler
+    @property
+    def default_session(self) -> BusSession:
+        if self._default is None:
+            raise RuntimeError("bus is not running")
+        return self._default
 
     @property
     def session_id(self) -> str:
-        return self._session_id
+        return self._default.session_id if self._default is not None else ""
+
+    @property
+    def sessions(self) -> list[BusSession]:
+        return list(self._sessions.values())
+
+    def session(self, session_id: str) -> BusSession | None:
+        return self._sessions.get(session_id)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subs)
+
+    def control_backlog(self) -> int:
+        """Deepest control queue across subscribers (0 with none connected)."""
+        return max(
+            (sub.control_queue.qsize() + len(sub.replay) for sub in self._subs),
+            default=0,
+        )
+
+    def on_command(self, handler: CommandHandler | None) -> None:
+        """Register a callback fired for every valid inbound BusCommand
+        from the default session's subscribers."""
+        self.default_session.on_command(handler)
 
     def ts_ms(self) -> int:
-        return int((time.monotonic() - self._started_at_mono) * 1000)
+        return self._default.ts_ms() if self._default is not None else 0
+
+    def publish(
+        self,
+        event_type: EventType,
+        data: BaseModel | dict[str, Any] | None = None,
+        *,
+        ts_ms: int | None = None,
+    ) -> None:
+        """Publish a control event on the default session. Non-blocking."""
+        if self._default is not None:
+            self._default.publish(event_type, data, ts_ms=ts_ms)
+
+    def publish_audio(
+        self,
+        stream: AudioStream,
+        sample_rate: int,
+        channels: int,
+        pcm: bytes | bytearray | memoryview,
+    ) -> None:
+        """Publish a PCM16LE audio frame on the default session. Non-blocking."""
+        if self._default is not None:
+            self._default.publish_audio(stream, sample_rate, channels, pcm)
+
+    def open_session(self, session_id: str | None = None) -> BusSession:
+        """Add a session channel; ``session_id`` defaults to a fresh id."""
+        if self._server is None:
+            raise RuntimeError("bus is not running")
+        session_id = session_id or uuid.uuid4().hex[:16]
+        if session_id == "*" or session_id in self._sessions:
+            raise ValueError(f"session id already in use: {session_id!r}")
+        session = BusSession(self, session_id)
+        self._sessions[session_id] = session
+        logger.debug(f"bus: session {session_id} opened")
+        return session
+
+    async def close_session(self, session_id: str) -> None:
+        """Close a session and disconnect the subscribers attached to it."""
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+        if session is self._default:
+            self._default = None
+        for sub in await session._close():
+            with contextlib.suppress(Exception):
+                await sub.ws.close(code=1000, reason="session closed")
+        logger.debug(f"bus: session {session_id} closed")
+
+    def _record_path(self, session_id: str) -> Path | None:
+        if self.record_path is None:
+            return None
+        path = str(self.record_path)
+        if "{session}" in path:
+            return Path(path.replace("{session}", session_id))
+        if self._default is None:
+            return Path(path)
+        p = Path(path)
+        return p.with_name(f"{p.stem}-{session_id}{p.suffix}")
 
     async def start(self) -> None:
-        self._session_id = uuid.uuid4().hex[:16]
-        self._started_at_mono = time.monotonic()
-        self._event_seq = 0
-        self._audio_seq = {AudioStream.MIC: 0, AudioStream.AGENT: 0}
-        self._server = await websockets.serve(self._handle_conn, self.host, self.port)
+        self._sessions = {}
+        self._default = None
+        self._codec_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="paty-bus-codec"
+        )
+        self._server = await websockets.serve(
+            self._handle_conn,
+            self.host,
+            self.port,
+            select_subprotocol=lambda _conn, offered: select_subprotocol(offered),
+        )
+        self._default = self.open_session()
         logger.info(
-            f"bus: listening on ws://{self.host}:{self.port} (session={self._session_id})"
+            f"bus: listening on ws://{self.host}:{self.port} (session={self.session_id})"
         )
 
     async def stop(self) -> None:
@@ -93,10 +754,16 @@ class WebSocketBus:
             return
         self._server.close()
         await self._server.wait_closed()
+        if self._codec_executor is not None:
+            self._codec_executor.shutdown(wait=False, cancel_futures=True)
+            self._codec_executor = None
+        for session in list(self._sessions.values()):
+            await session._close()
         # Cancel per-subscriber tasks and close sockets
         async with self._lock:
             subs = list(self._subs)
             self._subs.clear()
+            self._wildcard.clear()
         for sub in subs:
             for t in sub.tasks:
                 t.cancel()
@@ -105,10 +772,49 @@ class WebSocketBus:
         logger.info("bus: stopped")
 
     async def _handle_conn(self, ws: ServerConnection) -> None:
-        sub = _Subscriber(ws=ws)
+        path = ws.request.path if ws.request is not None else None
+        resume = _resume_seq(path)
+        wanted = _session_param(path)
+        if wanted == "*" and resume:
+            # Seqs are per session: one seq can't say where to resume them all.
+            logger.debug(f"bus: rejecting all-sessions subscriber at resume={resume}")
+            await ws.close(code=1008, reason="resume needs a single session")
+            return
         async with self._lock:
-            self._subs.add(sub)
-        logger.debug(f"bus: subscriber connected ({ws.remote_address})")
+            if wanted == "*":
+                channel = None
+                sessions = list(self._sessions.values())
+            else:
+                channel = self._sessions.get(wanted) if wanted else self._default
+                sessions = [channel] if channel is not None else []
+            sub = None
+            if channel is not None or wanted == "*":
+                # Snapshot the backlog and join the live fan-out with no await
+                # in between, so nothing published meanwhile is lost or doubled.
+                sub = _Subscriber(
+                    ws=ws,
+                    encoding=negotiate(ws.subprotocol, path),
+                    replay=deque(
+                        envelope
+                        for session in sessions
+                        for envelope in (
+                            session._replay.since(resume) if resume is not None else []
+                        )
+                    ),
+                    channel=channel,
+                )
+                (channel._subs if channel is not None else self._wildcard).add(sub)
+                self._subs.add(sub)
+        if sub is None:
+            # Closed outside the lock: a slow handshake mustn't hold up others.
+            logger.debug(f"bus: rejecting subscriber for session {wanted!r}")
+            await ws.close(code=1008, reason="unknown session")
+            return
+        logger.debug(
+            f"bus: subscriber connected ({ws.remote_address}, "
+            f"{sub.encoding.value}, session={wanted or 'default'}, "
+            f"replayed {len(sub.replay)})"
+        )
         sub.tasks = [
             asyncio.create_task(self._control_sender(sub)),
             asyncio.create_task(self._audio_sender(sub)),
@@ -129,23 +835,40 @@ class WebSocketBus:
         finally:
             async with self._lock:
                 self._subs.discard(sub)
+                self._wildcard.discard(sub)
+                if sub.channel is not None:
+                    sub.channel._subs.discard(sub)
             logger.debug("bus: subscriber disconnected")
 
     async def _reader(self, sub: _Subscriber) -> None:
-        # Inbound text frames are parsed as BusCommands and dispatched to the
-        # registered handler. Binary frames + malformed JSON are dropped so
-        # the socket doesn't fill kernel buffers.
+        # Inbound text frames are parsed as BusCommands. Subscriptions are
+        # applied here; everything else is dispatched to the handler of the
+        # subscriber's session (all-sessions subscribers can't command).
+        # Binary frames + malformed JSON are dropped so the socket doesn't
+        # fill kernel buffers.
         try:
             async for msg in sub.ws:
-                if isinstance(msg, bytes) or self._on_command is None:
+                if isinstance(msg, bytes):
                     continue
                 try:
                     cmd = BusCommand.model_validate_json(msg)
                 except ValidationError:
                     logger.debug("bus: ignoring malformed command")
                     continue
+                if cmd.action == BusAction.SUBSCRIBE:
+                    sub.subscribe(
+                        cmd.events,
+                        cmd.audio,
+                        cmd.audio_batch_ms,
+                        cmd.audio_levels,
+                        cmd.audio_codec,
+                    )
+                    continue
+                handler = sub.channel._on_command if sub.channel else None
+                if handler is None:
+                    continue
                 try:
-                    result = self._on_command(cmd)
+                    result = handler(cmd)
                     if inspect.isawaitable(result):
                         await result
                 except Exception:
@@ -155,9 +878,15 @@ class WebSocketBus:
 
     async def _control_sender(self, sub: _Subscriber) -> None:
         try:
+            while sub.replay:
+                envelope = sub.replay.popleft()
+                # Filtered as it drains, like live events: the client may
+                # subscribe while the backlog is still going out.
+                if sub.wants_event(envelope.event_type):
+                    await sub.ws.send(envelope.encode(sub.encoding))
             while True:
-                msg = await sub.control_queue.get()
-                await sub.ws.send(msg)
+                envelope = await sub.control_queue.get()
+                await sub.ws.send(envelope.encode(sub.encoding))
         except (websockets.exceptions.ConnectionClosed, asyncio.CancelledError):
             pass
 
@@ -170,68 +899,19 @@ class WebSocketBus:
             pass
 
     async def _drop(self, sub: _Subscriber, reason: str) -> None:
+        self._metrics.subscriber_dropped(reason)
         logger.warning(f"bus: dropping subscriber — {reason}")
         with contextlib.suppress(Exception):
             await sub.ws.close(code=1011, reason=reason[:123])
 
-    def publish(
-        self,
-        event_type: EventType,
-        data: BaseModel | dict[str, Any] | None = None,
-    ) -> None:
-        """Publish a control event to all subscribers. Non-blocking."""
-        if self._server is None:
-            return
-        payload = {}
-        if isinstance(data, BaseModel):
-            payload = data.model_dump(exclude_none=True)
-        elif isinstance(data, dict):
-            payload = data
-        self._event_seq += 1
-        envelope = Event(
-            seq=self._event_seq,
-            ts_ms=self.ts_ms(),
-            session_id=self._session_id,
-            type=event_type,
-            data=payload,
-        )
-        msg = envelope.model_dump_json()
-        to_drop: list[_Subscriber] = []
-        for sub in self._subs:
-            try:
-                sub.control_queue.put_nowait(msg)
-            except asyncio.QueueFull:
-                to_drop.append(sub)
-        for sub in to_drop:
-            task = asyncio.create_task(self._drop(sub, "control queue overflow"))
-            self._background.add(task)
-            task.add_done_callback(self._background.discard)
-
-    def publish_audio(
-        self,
-        stream: AudioStream,
-        sample_rate: int,
-        channels: int,
-        pcm: bytes,
-    ) -> None:
-        """Publish a PCM16LE audio frame to all subscribers. Non-blocking."""
-        if self._server is None or not self._subs:
-            return
-        self._audio_seq[stream] = self._audio_seq.get(stream, 0) + 1
-        frame = pack_audio_frame(
-            stream=stream,
-            sample_rate=sample_rate,
-            channels=channels,
-            seq=self._audio_seq[stream],
-            ts_ms=self.ts_ms(),
-            pcm=pcm,
-        )
-        for sub in self._subs:
-            try:
+    def _enqueue_audio(self, sub: _Subscriber, frame: memoryview) -> None:
+        try:
+            sub.audio_queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Drop-oldest: best-effort streaming.
+            with contextlib.suppress(asyncio.QueueEmpty):
+                dropped = sub.audio_queue.get_nowait()
+                # Byte 2 of the header is the stream (see paty.bus.codec).
+                self._metrics.audio_dropped(AudioStream(dropped[2]).name.lower())
+            with contextlib.suppress(asyncio.QueueFull):
                 sub.audio_queue.put_nowait(frame)
-            except asyncio.QueueFull:
-                # Drop-oldest: best-effort streaming.
-                with contextlib.suppress(asyncio.QueueEmpty):
-                    sub.audio_queue.get_nowait()
-                with contextlib.suppress(asyncio.QueueFull):
-                    sub.audio_queue.put_nowait(frame)
@@ -9,7 +9,8 @@ import json
 import websockets
 from rich.console import Console
 
-from paty.bus.codec import unpack_audio_frame
+from paty.bus.codec import is_audio_frame, unpack_audio_frame
+from paty.bus.encoding import SUBPROTOCOLS, Encoding, decode_event
 
 _STATE_COLOR = {
     "idle": "dim",
@@ -38,14 +39,29 @@ _EVENT_COLOR = {
 }
 
 
-async def tail(url: str, *, show_audio: bool = True) -> None:
+async def tail(
+    url: str,
+    *,
+    show_audio: bool = True,
+    events: tuple[str, ...] = (),
+    encoding: Encoding = Encoding.JSON,
+    audio_batch_ms: int = 0,
+    audio_levels: bool = False,
+    audio_codec: str = "pcm16",
+) -> None:
     console = Console()
     console.print(f"[dim]connecting to {url}...[/]")
     try:
-        async with websockets.connect(url) as ws:
+        async with websockets.connect(url, subprotocols=[SUBPROTOCOLS[encoding]]) as ws:
+            # Filter server-side so unwanted frames never cross the socket.
+            subscription = _subscription(
+                show_audio, events, audio_batch_ms, audio_levels, audio_codec
+            )
+            if subscription is not None:
+                await ws.send(json.dumps(subscription))
             console.print("[green]connected[/] — [dim]Ctrl+C to quit[/]\n")
             async for msg in ws:
-                if isinstance(msg, bytes):
+                if isinstance(msg, bytes) and is_audio_frame(msg):
                     if show_audio:
                         _render_audio(console, msg)
                     continue
@@ -55,10 +71,30 @@ async def tail(url: str, *, show_audio: bool = True) -> None:
         raise SystemExit(1) from e
 
 
-def _render_event(console: Console, raw: str) -> None:
-    try:
-        event = json.loads(raw)
-    except json.JSONDecodeError:
+def _subscription(
+    show_audio: bool,
+    events: tuple[str, ...],
+    audio_batch_ms: int = 0,
+    audio_levels: bool = False,
+    audio_codec: str = "pcm16",
+) -> dict | None:
+    cmd: dict = {"action": "subscribe"}
+    if not show_audio:
+        cmd["audio"] = []
+    if events:
+        cmd["events"] = list(events)
+    if audio_batch_ms:
+        cmd["audio_batch_ms"] = audio_batch_ms
+    if audio_levels:
+        cmd["audio_levels"] = True
+    if audio_codec != "pcm16":
+        cmd["audio_codec"] = audio_codec
+    return cmd if len(cmd) > 1 else None
+
+
+def _render_event(console: Console, raw: str | bytes) -> None:
+    event = decode_event(raw)
+    if event is None:
         console.print(f"[red]malformed event:[/] {raw!r}")
         return
 
@@ -99,13 +135,34 @@ def _render_audio(console: Console, raw: bytes) -> None:
         console.print(f"[red]bad audio frame:[/] {e}")
         return
     stream_color = "cyan" if frame.stream.name == "MIC" else "green"
+    kind = "levels" if frame.levels else frame.codec.name.lower()
+    if frame.coalesced:
+        kind += " batch"
     console.print(
         f"[dim]{frame.ts_ms:>7}ms #{frame.seq:<4}[/] "
         f"[{stream_color}]audio[{frame.stream.name.lower():<5}][/] "
-        f"[dim]sr={frame.sample_rate} {len(frame.pcm)}B[/]"
+        f"[dim]sr={frame.sample_rate} {len(frame.pcm)}B {kind}[/]"
     )
 
 
-def run(url: str, show_audio: bool) -> None:
+def run(
+    url: str,
+    show_audio: bool,
+    events: tuple[str, ...] = (),
+    encoding: Encoding = Encoding.JSON,
+    audio_batch_ms: int = 0,
+    audio_levels: bool = False,
+    audio_codec: str = "pcm16",
+) -> None:
     with contextlib.suppress(KeyboardInterrupt):
-        asyncio.run(tail(url, show_audio=show_audio))
+        asyncio.run(
+            tail(
+                url,
+                show_audio=show_audio,
+                events=events,
+                encoding=encoding,
+                audio_batch_ms=audio_batch_ms,
+                audio_levels=audio_levels,
+                audio_codec=audio_codec,
+            )
+        )
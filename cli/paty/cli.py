@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import os
 from importlib import resources
 
@@ -70,7 +71,9 @@ def run(config: str | None, ready_fd: int | None):
 
 
 async def _run(config_path: str, ready_fd: int | None = None) -> None:
-    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures import Executor
+
+    from pipecat.pipeline.task import PipelineParams
 
     from paty.bus import BusAction, BusCommand, BusObserver, WebSocketBus
     from paty.bus.events import EventType, InputMuted, SessionEnded, SessionStarted
@@ -85,11 +88,14 @@ async def _run(config_path: str, ready_fd: int | None = None) -> None:
         warn_if_llm_pin_off_profile,
     )
     from paty.pipeline.builder import build_local_transport, build_pipeline
+    from paty.pipeline.chunker import SentenceChunker
     from paty.pipeline.mute import InputMuteFilter
+    from paty.pipeline.prefill import SpeculativePrefill
     from paty.pipeline.text_input import TextInputInjector
     from paty.resolve.resolver import resolve_services
     from paty.runtime.gpu_executor import create_gpu_executor
     from paty.runtime.manager import ManagedProcess, create_managed_llm
+    from paty.runtime.tts_cache import prewarm as prewarm_tts
     from paty.tracing.setup import setup_tracing
 
     # 1. Load config + resolve persona (inline `pak.persona`, named PAK,
@@ -105,8 +111,9 @@ async def _run(config_path: str, ready_fd: int | None = None) -> None:
     metrics_handle = setup_metrics(raw_config.metrics)
 
     managed: list[ManagedProcess] = []
-    compute_executor: ThreadPoolExecutor | None = None
+    compute_executor: Executor | None = None
     bus: WebSocketBus | None = None
+    prewarm_task: asyncio.Task[int] | None = None
 
     try:
         with tracer.start_as_current_span("paty.startup") as startup_span:
@@ -169,9 +176,10 @@ async def _run(config_path: str, ready_fd: int | None = None) -> None:
             # 6. Resolve services (STT + TTS in-process, LLM via managed server)
             # On MLX, a shared single-worker executor serializes every Metal
             # op across STT and TTS. Without this, two OS threads race on the
-            # command queue and Metal asserts out.
+            # command queue and Metal asserts out. It runs a finished turn's
+            # transcription ahead of queued TTS segments.
             if hardware.platform == Platform.MLX:
-                compute_executor = create_gpu_executor()
+                compute_executor = create_gpu_executor(meter=metrics_handle.meter)
             with tracer.start_as_current_span("paty.resolve.services") as svc_span:
                 services = resolve_services(
                     raw_config.pipeline,
@@ -183,6 +191,17 @@ async def _run(config_path: str, ready_fd: int | None = None) -> None:
                 svc_span.set_attribute("paty.llm_class", type(services.llm).__name__)
                 svc_span.set_attribute("paty.tts_class", type(services.tts).__name__)
 
+            # 6a. Pre-render the PAK's canned phrases into the TTS cache
+            #     while the rest of startup proceeds; awaited before ready.
+            phrases = resolved_persona.pak.manifest.voice.phrases
+            prewarm_task = asyncio.create_task(
+                prewarm_tts(
+                    services.tts,
+                    phrases,
+                    sample_rate=PipelineParams().audio_out_sample_rate,
+                )
+            )
+
             console.print(
                 f"[bold]STT:[/] {type(services.stt).__name__}  "
                 f"[bold]TTS:[/] {type(services.tts).__name__}"
@@ -202,12 +221,23 @@ async def _run(config_path: str, ready_fd: int | None = None) -> None:
             if raw_config.bus.enabled:
                 with tracer.start_as_current_span("paty.bus.start") as bus_span:
                     bus = WebSocketBus(
-                        host=raw_config.bus.host, port=raw_config.bus.port
+                        host=raw_config.bus.host,
+                        port=raw_config.bus.port,
+                        replay_max_events=raw_config.bus.replay_max_events,
+                        replay_max_bytes=raw_config.bus.replay_max_bytes,
+                        record_path=raw_config.bus.record_path,
+                        meter=metrics_handle.meter,
                     )
                     await bus.start()
                     bus_span.set_attribute("paty.bus.host", raw_config.bus.host)
                     bus_span.set_attribute("paty.bus.port", raw_config.bus.port)
-                observers.append(BusObserver(bus))
+                observers.append(
+                    BusObserver(
+                        bus,
+                        ring_size=raw_config.bus.observer_ring,
+                        meter=metrics_handle.meter,
+                    )
+                )
 
                 async def _handle_command(
                     cmd: BusCommand, _bus: WebSocketBus = bus
@@ -231,6 +261,8 @@ async def _run(config_path: str, ready_fd: int | None = None) -> None:
             # 8. Build pipeline with local audio transport
             with tracer.start_as_current_span("paty.pipeline.build"):
                 transport = build_local_transport()
+                chunker_cfg = raw_config.pipeline.chunker
+                llm_cfg = raw_config.pipeline.llm
                 _pipeline, task, runner = build_pipeline(
                     stt=services.stt,
                     llm=services.llm,
@@ -240,6 +272,16 @@ async def _run(config_path: str, ready_fd: int | None = None) -> None:
                     observers=observers,
                     input_mute_filter=input_mute,
                     text_injector=text_injector,
+                    llm_prefill=(
+                        SpeculativePrefill(
+                            llm_cfg.base_url, llm_cfg.model, policy=llm_cfg.prefill
+                        )
+                        if llm_cfg.prefill.enabled
+                        else None
+                    ),
+                    text_chunker=(
+                        SentenceChunker(chunker_cfg) if chunker_cfg.enabled else None
+                    ),
                 )
 
         if bus is not None:
@@ -257,6 +299,17 @@ async def _run(config_path: str, ready_fd: int | None = None) -> None:
                 ),
             )
 
+        with tracer.start_as_current_span("paty.tts.prewarm") as prewarm_span:
+            try:
+                warmed = await prewarm_task
+            except Exception as e:
+                # A cold cache only costs latency; don't refuse to start.
+                console.print(f"[yellow]TTS pre-warm failed: {e}[/]")
+                warmed = 0
+            prewarm_span.set_attribute("paty.tts.prewarmed", warmed)
+        if warmed:
+            console.print(f"[bold]TTS:[/] pre-rendered {warmed} phrases")
+
         console.print(
             f"\n[green]Agent '{resolved_persona.pak.name}' running. "
             f"Speak into your mic.[/]"
@@ -274,6 +327,11 @@ async def _run(config_path: str, ready_fd: int | None = None) -> None:
         await runner.run(task)
 
     finally:
+        if prewarm_task is not None and not prewarm_task.done():
+            # Startup failed before the pre-warm was awaited.
+            prewarm_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await prewarm_task
         if bus is not None:
             bus.publish(EventType.SESSION_ENDED, SessionEnded(reason="shutdown"))
             await bus.stop()
@@ -320,11 +378,227 @@ def bus():
     is_flag=True,
     help="Suppress audio frame lines (control events only).",
 )
-def bus_tail(url: str, no_audio: bool):
+@click.option(
+    "--events",
+    "events",
+    multiple=True,
+    metavar="PREFIX",
+    help="Only receive event types with this prefix (repeatable), "
+    "e.g. --events metrics.tick --events state.changed.",
+)
+@click.option(
+    "--encoding",
+    type=click.Choice(["json", "msgpack"]),
+    default="json",
+    show_default=True,
+    help="Control-event wire encoding to negotiate (msgpack needs paty[msgpack]).",
+)
+@click.option(
+    "--audio-batch-ms",
+    type=click.IntRange(0, 1000),
+    default=0,
+    show_default=True,
+    help="Ask the bus to coalesce this many ms of audio into each frame.",
+)
+@click.option(
+    "--audio-levels",
+    is_flag=True,
+    help="Receive per-band audio levels instead of PCM.",
+)
+@click.option(
+    "--audio-codec",
+    type=click.Choice(["pcm16", "ulaw", "opus"]),
+    default="pcm16",
+    show_default=True,
+    help="Audio payload codec to request (opus needs paty[opus] on the agent).",
+)
+def bus_tail(
+    url: str,
+    no_audio: bool,
+    events: tuple[str, ...],
+    encoding: str,
+    audio_batch_ms: int,
+    audio_levels: bool,
+    audio_codec: str,
+):
     """Subscribe to a running bus and print events as they arrive."""
+    from paty.bus.encoding import Encoding
     from paty.bus.tail import run as run_tail
 
-    run_tail(url, show_audio=not no_audio)
+    run_tail(
+        url,
+        show_audio=not no_audio,
+        events=events,
+        encoding=Encoding(encoding),
+        audio_batch_ms=audio_batch_ms,
+        audio_levels=audio_levels,
+        audio_codec=audio_codec,
+    )
+
+
+@bus.command("record")
+@click.option(
+    "--url",
+    default="ws://127.0.0.1:8765",
+    show_default=True,
+    help="WebSocket URL of a running PATY bus.",
+)
+@click.option(
+    "-o",
+    "--out",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Session log to write (default: paty-<timestamp>.paty).",
+)
+@click.option("--no-audio", is_flag=True, help="Record control events only.")
+def bus_record(url: str, out: str | None, no_audio: bool):
+    """Record a running bus's events and audio to an indexed session log."""
+    import time
+
+    from paty.bus.recorder import run as run_record
+
+    run_record(url, out or time.strftime("paty-%Y%m%d-%H%M%S.paty"), not no_audio)
+
+
+@bus.command("replay")
+@click.argument("log", type=click.Path(exists=True, dir_okay=False))
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=int, default=8765, show_default=True)
+@click.option(
+    "--speed",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="Playback speed multiplier (2 = twice real time).",
+)
+@click.option(
+    "--fast",
+    is_flag=True,
+    help="Replay as fast as subscribers keep up, ignoring original timing.",
+)
+@click.option(
+    "--start",
+    "start_s",
+    type=click.FloatRange(0),
+    default=0.0,
+    show_default=True,
+    help="Seconds into the session to start from.",
+)
+@click.option(
+    "--wait-for",
+    type=click.IntRange(0),
+    default=1,
+    show_default=True,
+    help="Subscribers to wait for before starting.",
+)
+@click.option("--no-audio", is_flag=True, help="Replay control events only.")
+@click.option("--loop", is_flag=True, help="Replay the session until Ctrl+C.")
+def bus_replay(
+    log: str,
+    host: str,
+    port: int,
+    speed: float,
+    fast: bool,
+    start_s: float,
+    wait_for: int,
+    no_audio: bool,
+    loop: bool,
+):
+    """Serve a recorded session log through a bus, as if an agent were live."""
+    from paty.bus.replay import run as run_replay
+
+    try:
+        run_replay(
+            log,
+            host=host,
+            port=port,
+            speed=None if fast else speed,
+            start_ms=int(start_s * 1000),
+            audio=not no_audio,
+            wait_for=wait_for,
+            loop=loop,
+        )
+    except ValueError as e:
+        click.echo(str(e))
+        raise SystemExit(1) from e
+
+
+@bus.command("bench")
+@click.option(
+    "--subscribers",
+    type=click.IntRange(0),
+    default=4,
+    show_default=True,
+    help="Subscribers that read as fast as they can.",
+)
+@click.option(
+    "--slow",
+    "slow_subscribers",
+    type=click.IntRange(0),
+    default=0,
+    show_default=True,
+    help="Additional subscribers that pause after every message.",
+)
+@click.option(
+    "--slow-delay-ms",
+    type=click.FloatRange(0),
+    default=20.0,
+    show_default=True,
+    help="Pause per message for --slow subscribers.",
+)
+@click.option(
+    "--duration",
+    type=click.FloatRange(0.1),
+    default=10.0,
+    show_default=True,
+    help="Seconds of synthetic session to publish.",
+)
+@click.option(
+    "--encoding",
+    type=click.Choice(["json", "msgpack"]),
+    default="json",
+    show_default=True,
+    help="Control-event wire encoding for every subscriber.",
+)
+@click.option(
+    "--observer",
+    is_flag=True,
+    help="Instead, time BusObserver per frame over a scripted pipeline.",
+)
+@click.option(
+    "--observer-ring",
+    type=click.IntRange(0),
+    default=0,
+    help="With --observer, also time the push path with a ring this size.",
+)
+def bus_bench(
+    subscribers: int,
+    slow_subscribers: int,
+    slow_delay_ms: float,
+    duration: float,
+    encoding: str,
+    observer: bool,
+    observer_ring: int,
+):
+    """Load-test a local bus with a synthetic session and N subscribers."""
+    from paty.bus.bench import BenchConfig
+    from paty.bus.bench import run as run_bench
+    from paty.bus.encoding import Encoding
+
+    if observer:
+        from paty.bus.bench import run_observer
+
+        run_observer(ring_size=observer_ring)
+        return
+    run_bench(
+        BenchConfig(
+            subscribers=subscribers,
+            slow_subscribers=slow_subscribers,
+            slow_delay_ms=slow_delay_ms,
+            duration_s=duration,
+            encoding=Encoding(encoding),
+        )
+    )
 
 
 @bus.command("tui")
@@ -334,11 +608,88 @@ def bus_tail(url: str, no_audio: bool):
     show_default=True,
     help="WebSocket URL of a running PATY bus.",
 )
-def bus_tui(url: str):
+@click.option(
+    "--encoding",
+    type=click.Choice(["json", "msgpack"]),
+    default="json",
+    show_default=True,
+    help="Control-event wire encoding to negotiate (msgpack needs paty[msgpack]).",
+)
+def bus_tui(url: str, encoding: str):
     """Live conversation view subscribed to a running bus."""
+    from paty.bus.encoding import Encoding
     from paty.tui import run as run_tui
 
-    run_tui(url)
+    run_tui(url, encoding=Encoding(encoding))
+
+
+@cli.group()
+def dev():
+    """Developer micro-benchmarks."""
+
+
+@dev.command("tts-bench")
+@click.argument("config", type=click.Path(exists=True), required=False)
+@click.option(
+    "--tokens-per-s",
+    type=click.FloatRange(1),
+    default=40.0,
+    show_default=True,
+    help="LLM streaming rate.",
+)
+@click.option(
+    "--tts-overhead-ms",
+    type=click.FloatRange(0),
+    default=60.0,
+    show_default=True,
+    help="Fixed TTS cost per chunk.",
+)
+@click.option(
+    "--tts-ms-per-char",
+    type=click.FloatRange(0),
+    default=4.0,
+    show_default=True,
+    help="TTS cost per character of a chunk.",
+)
+def tts_bench(
+    config: str | None,
+    tokens_per_s: float,
+    tts_overhead_ms: float,
+    tts_ms_per_char: float,
+):
+    """Compare time-to-first-audio of sentence vs. clause chunking for TTS.
+
+    Uses the pipeline.chunker policy from CONFIG, or the defaults.
+    """
+    from paty.config.loader import load_config
+    from paty.config.schema import ChunkerConfig
+    from paty.pipeline.bench import TTSBenchConfig
+    from paty.pipeline.bench import run as run_bench
+
+    policy = load_config(config).pipeline.chunker if config else ChunkerConfig()
+    run_bench(
+        TTSBenchConfig(
+            tokens_per_s=tokens_per_s,
+            tts_overhead_ms=tts_overhead_ms,
+            tts_ms_per_char=tts_ms_per_char,
+            policy=policy,
+        )
+    )
+
+
+@dev.command("audio-bench")
+@click.option(
+    "--iterations",
+    type=click.IntRange(1),
+    default=200,
+    show_default=True,
+    help="Timed conversions per case.",
+)
+def audio_bench(iterations: int):
+    """Time float/PCM16 conversion in the TTS and STT services."""
+    from paty.runtime.bench import run as run_bench
+
+    run_bench(iterations)
 
 
 @cli.command()
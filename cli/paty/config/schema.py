@@ -24,21 +24,93 @@ class Platform(StrEnum):
 # --- Pipeline services ---
 
 
+class STTStreamingConfig(BaseModel):
+    """Incremental transcription during speech (``paty.runtime.stt_service``).
+
+    Only the in-process mlx-audio STT streams; other providers ignore this.
+    Off by default: interim passes share the GPU thread with TTS.
+    """
+
+    enabled: bool = False
+    interim_interval_ms: int = 500  # speech between interim transcripts
+    window_s: float = 6.0  # open windows longer than this get committed
+
+
+class STTSpeculationConfig(BaseModel):
+    """Transcribe from the first pause, before VAD ends the turn.
+
+    See ``paty.runtime.speculative_stt``; applies to segmented STT services.
+    Off by default: it takes over the service's speaking hooks.
+    """
+
+    enabled: bool = False
+    pause_ms: int = 200  # quiet after speech that starts a speculation
+
+
 class STTConfig(BaseModel):
     provider: str = "whisper"
     model: str | None = None
+    streaming: STTStreamingConfig = STTStreamingConfig()
+    speculation: STTSpeculationConfig = STTSpeculationConfig()
+    isolated: bool = False  # mlx-audio: run the model in a worker process
+
+
+class LLMPrefillConfig(BaseModel):
+    """Speculative prefill on interim transcripts (``paty.pipeline.prefill``).
+
+    Once ``min_words`` words of the user's turn are stable, the LLM server
+    is sent the conversation plus that partial turn, and again each time
+    ``min_new_words`` more are stable, so its prompt cache is warm when the
+    final transcript arrives. Off by default: the real request waits
+    behind any prefill still in flight on a single-slot server.
+    """
+
+    enabled: bool = False
+    min_words: int = 3
+    min_new_words: int = 2
 
 
 class LLMConfig(BaseModel):
     provider: str = "ollama"
     model: str | None = None
     base_url: str | None = None
+    prefill: LLMPrefillConfig = LLMPrefillConfig()
+
+
+class TTSCacheConfig(BaseModel):
+    """Phrase cache in front of the TTS service (see ``paty.runtime.tts_cache``)."""
+
+    enabled: bool = False  # opt-in: wraps the service's run_tts
+    max_mb: int = 32  # in-memory LRU budget
+    max_chars: int = 120  # longer texts are always synthesized
+    dir: str | None = None  # also keep entries here, across runs
 
 
 class TTSConfig(BaseModel):
     provider: str = "kokoro"
     voice: str | None = None
     base_url: str | None = None
+    cache: TTSCacheConfig = TTSCacheConfig()
+    isolated: bool = False  # mlx-audio: run the model in a worker process
+
+
+class ChunkerConfig(BaseModel):
+    """How ``paty.pipeline.chunker`` splits LLM text for TTS.
+
+    The first chunk of a response ends at the first sentence end, at the
+    first clause boundary with ``first_min_words`` words, or at a word
+    boundary after ``first_max_words`` words or ``first_max_wait_ms``. Later
+    chunks are sentences of at least ``min_words`` words, cut early past
+    ``max_words``. Disabled (the default), the TTS service aggregates whole
+    sentences.
+    """
+
+    enabled: bool = False
+    first_min_words: int = 2
+    first_max_words: int = 10
+    first_max_wait_ms: int = 400
+    min_words: int = 4
+    max_words: int = 40
 
 
 class PipelineConfig(BaseModel):
@@ -52,6 +124,7 @@ class PipelineConfig(BaseModel):
     llm: LLMConfig = LLMConfig()
     tts: TTSConfig = TTSConfig()
     vad: str = "silero"
+    chunker: ChunkerConfig = ChunkerConfig()
 
     @model_validator(mode="before")
     @classmethod
@@ -107,6 +180,16 @@ class BusConfig(BaseModel):
     enabled: bool = False
     host: str = "127.0.0.1"
     port: int = 8765
+    # Recent control events kept for ``?resume=<seq>`` reconnects; whichever
+    # cap is hit first evicts the oldest (0 events disables replay).
+    replay_max_events: int = 1024
+    replay_max_bytes: int = 1_048_576
+    # Record every event and audio frame to this session log (``{session}``
+    # expands to the session id); serve it back with ``paty bus replay``.
+    record_path: str | None = None
+    # > 0: the bus observer queues frame references in a ring this size and
+    # translates/publishes them from its own task, off the pipeline's path.
+    observer_ring: int = 0
 
 
 # --- PAK ---
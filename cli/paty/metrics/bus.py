@@ -0,0 +1,64 @@
+"""OTEL instruments for the event bus's delivery policy."""
+
+from __future__ import annotations
+
+from opentelemetry import metrics
+
+
+class BusMetrics:
+    """Counts what the bus did to keep slow subscribers connected.
+
+    Instruments created:
+        - paty_bus_events_coalesced_total (Counter, attrs: type, mode)
+        - paty_bus_audio_frames_dropped_total (Counter, attrs: stream)
+        - paty_bus_subscribers_dropped_total (Counter, attrs: reason)
+        - paty_bus_observer_lag_seconds (Histogram)
+        - paty_bus_observer_frames_dropped_total (Counter, attrs: kind)
+        - paty_bus_observer_ring_overflow_total (Counter)
+    """
+
+    def __init__(self, meter: metrics.Meter | None = None) -> None:
+        m = meter or metrics.get_meter("paty")
+        self._coalesced = m.create_counter(
+            "paty_bus_events_coalesced_total",
+            description="Control events merged or superseded under backpressure",
+        )
+        self._audio_dropped = m.create_counter(
+            "paty_bus_audio_frames_dropped_total",
+            description="Audio frames dropped (oldest first) for slow subscribers",
+        )
+        self._subscribers_dropped = m.create_counter(
+            "paty_bus_subscribers_dropped_total",
+            description="Subscribers disconnected by the bus",
+        )
+        self._observer_lag = m.create_histogram(
+            "paty_bus_observer_lag_seconds",
+            description="Pipeline push to bus translation, via the observer ring",
+            unit="s",
+        )
+        self._observer_dropped = m.create_counter(
+            "paty_bus_observer_frames_dropped_total",
+            description="Frames the observer ring had no room for",
+        )
+        self._observer_overflow = m.create_counter(
+            "paty_bus_observer_ring_overflow_total",
+            description="Control frames queued past the observer ring's size",
+        )
+
+    def event_coalesced(self, event_type: str, mode: str) -> None:
+        self._coalesced.add(1, {"type": event_type, "mode": mode})
+
+    def audio_dropped(self, stream: str) -> None:
+        self._audio_dropped.add(1, {"stream": stream})
+
+    def subscriber_dropped(self, reason: str) -> None:
+        self._subscribers_dropped.add(1, {"reason": reason})
+
+    def observer_lag(self, seconds: float) -> None:
+        self._observer_lag.record(seconds)
+
+    def observer_dropped(self, kind: str) -> None:
+        self._observer_dropped.add(1, {"kind": kind})
+
+    def observer_overflow(self) -> None:
+        self._observer_overflow.add(1)
@@ -0,0 +1,32 @@
+"""OTEL instruments for the GPU work scheduler."""
+
+from __future__ import annotations
+
+from opentelemetry import metrics
+
+
+class GPUSchedulerMetrics:
+    """Records how long MLX jobs wait for the GPU thread, per service.
+
+    Instruments created:
+        - paty_gpu_queue_wait_seconds (Histogram, attrs: service, priority)
+        - paty_gpu_jobs_cancelled_total (Counter, attrs: service)
+    """
+
+    def __init__(self, meter: metrics.Meter | None = None) -> None:
+        m = meter or metrics.get_meter("paty")
+        self._wait = m.create_histogram(
+            "paty_gpu_queue_wait_seconds",
+            description="Time MLX jobs spent queued for the GPU thread",
+            unit="s",
+        )
+        self._cancelled = m.create_counter(
+            "paty_gpu_jobs_cancelled_total",
+            description="MLX jobs cancelled before they reached the GPU thread",
+        )
+
+    def waited(self, seconds: float, service: str, priority: str) -> None:
+        self._wait.record(seconds, {"service": service, "priority": priority})
+
+    def cancelled(self, service: str) -> None:
+        self._cancelled.add(1, {"service": service})
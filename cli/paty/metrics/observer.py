@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import itertools
+
 from opentelemetry import metrics
-from pipecat.frames.frames import MetricsFrame
+from pipecat.frames.frames import Frame, MetricsFrame
 from pipecat.metrics.metrics import (
     LLMUsageMetricsData,
     ProcessingMetricsData,
@@ -12,6 +14,8 @@ from pipecat.metrics.metrics import (
 )
 from pipecat.observers.base_observer import BaseObserver, FramePushed
 
+from paty.pipeline.prefill import LLMPrefillMetricsData
+
 _SERVICE_KEYWORDS = {
     "stt": ("stt", "whisper", "assemblyai", "deepgram"),
     "llm": ("llm", "openai", "ollama", "llama"),
@@ -19,6 +23,37 @@ _SERVICE_KEYWORDS = {
 }
 
 
+# Each FirstPushObserver tags the frames it has seen with an attribute of
+# its own, named from this.
+_observer_ids = itertools.count()
+
+
+class FirstPushObserver(BaseObserver):
+    """Base for observers that want each frame once, not once per edge.
+
+    Pipecat calls ``on_push_frame`` for every edge a frame crosses, and the
+    first call is the push from the processor that created it. Instead of
+    each observer remembering frame ids, every instance owns an attribute
+    name and tags the frame itself with it: ``_first_push`` sets it the
+    first time and reports False on every later edge. That is O(1) with no
+    per-observer state, and the tag goes away with the frame.
+
+    Names are never handed out twice: frames can outlive the observer that
+    tagged them, and a new observer reusing its name would skip them. A
+    frame only carries the tags of observers that saw it.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._seen_attr = f"_paty_seen_{next(_observer_ids)}"
+
+    def _first_push(self, frame: Frame) -> bool:
+        if getattr(frame, self._seen_attr, False):
+            return False
+        setattr(frame, self._seen_attr, True)
+        return True
+
+
 def _classify_processor(processor: str) -> str:
     """Classify a processor name as stt/llm/tts based on keywords."""
     lower = processor.lower()
@@ -28,7 +63,7 @@ def _classify_processor(processor: str) -> str:
     return "unknown"
 
 
-class PipelineMetricsObserver(BaseObserver):
+class PipelineMetricsObserver(FirstPushObserver):
     """Captures Pipecat MetricsFrames and records them as OTEL metrics.
 
     Instruments created:
@@ -38,6 +73,8 @@ class PipelineMetricsObserver(BaseObserver):
         - paty_llm_processing_seconds (Histogram)
         - paty_llm_tokens_total (Counter)
         - paty_tts_characters_total (Counter)
+        - paty_llm_prefills_total (Counter, attrs: result = hit | miss)
+        - paty_llm_prefill_saved_seconds (Histogram)
     """
 
     def __init__(self, meter: metrics.Meter | None = None, **kwargs):
@@ -78,15 +115,27 @@ class PipelineMetricsObserver(BaseObserver):
             description="TTS characters synthesized",
         )
 
+        self._prefills = m.create_counter(
+            "paty_llm_prefills_total",
+            description="Turns with a speculative LLM prefill, by whether it matched",
+        )
+
+        self._prefill_saved = m.create_histogram(
+            "paty_llm_prefill_saved_seconds",
+            description="LLM TTFB saved by speculative prefill",
+            unit="s",
+        )
+
     async def on_push_frame(self, data: FramePushed):
         frame = data.frame
-        if not isinstance(frame, MetricsFrame):
+        # A MetricsFrame is observed on every edge it crosses downstream —
+        # recording each observation would multi-count by the number of hops
+        # from the emitting processor to the pipeline tail.
+        if not isinstance(frame, MetricsFrame) or not self._first_push(frame):
             return
 
-        # A MetricsFrame is observed on every edge it crosses downstream — if we
-        # recorded on each observation we'd multi-count by the number of hops
-        # from the emitting processor to the pipeline tail. Record only on the
-        # first edge (where source is the processor that emitted the frame).
+        # A frame another processor re-emits would also be first pushed by
+        # it; only record the entries from the processor that measured them.
         source_name = getattr(data.source, "name", None)
 
         for entry in frame.data:
@@ -123,3 +172,9 @@ class PipelineMetricsObserver(BaseObserver):
 
             elif isinstance(entry, TTSUsageMetricsData):
                 self._tts_chars.add(entry.value, attrs)
+
+            elif isinstance(entry, LLMPrefillMetricsData):
+                result = "hit" if entry.hit else "miss"
+                self._prefills.add(1, {**attrs, "result": result})
+                if entry.hit:
+                    self._prefill_saved.record(entry.value, attrs)
@@ -29,13 +29,32 @@ _HISTOGRAM_DISPLAY = {
     "paty_llm_ttfb_seconds": "LLM TTFB",
     "paty_tts_ttfb_seconds": "TTS TTFB",
     "paty_llm_processing_seconds": "LLM Processing",
+    "paty_llm_prefill_saved_seconds": "LLM Prefill Saved",
+    "paty_gpu_queue_wait_seconds": "GPU Queue Wait",
+    "paty_bus_observer_lag_seconds": "Bus Observer Lag",
 }
 
 _COUNTER_DISPLAY = {
     "paty_llm_tokens_total": "LLM Tokens",
     "paty_tts_characters_total": "TTS Characters",
+    "paty_bus_events_coalesced_total": "Bus Coalesced",
+    "paty_bus_audio_frames_dropped_total": "Bus Audio Drops",
+    "paty_bus_subscribers_dropped_total": "Bus Disconnects",
+    "paty_bus_observer_frames_dropped_total": "Bus Observer Drops",
+    "paty_bus_observer_ring_overflow_total": "Bus Observer Overflow",
+    "paty_tts_cache_lookups_total": "TTS Cache",
+    "paty_stt_speculations_total": "STT Speculation",
+    "paty_llm_prefills_total": "LLM Prefill",
+    "paty_gpu_jobs_cancelled_total": "GPU Cancelled",
 }
 
+# Counters broken down by their ``result`` attribute.
+_BY_RESULT = (
+    "paty_tts_cache_lookups_total",
+    "paty_stt_speculations_total",
+    "paty_llm_prefills_total",
+)
+
 _console = Console()
 
 
@@ -88,8 +107,11 @@ class RichMetricsExporter(MetricExporter):
                             label = name
                             # Include type attribute for token counters
                             token_type = dict(dp.attributes).get("type")
-                            if token_type:
+                            if token_type and name == "paty_llm_tokens_total":
                                 label = f"{name}:{token_type}"
+                            result = dict(dp.attributes).get("result")
+                            if result and name in _BY_RESULT:
+                                label = f"{name}:{result}"
                             counters[label] = counters.get(label, 0) + dp.value
 
         # Skip if no data yet
@@ -131,6 +153,48 @@ class RichMetricsExporter(MetricExporter):
             tts = counters.get("paty_tts_characters_total", 0)
             if tts:
                 table.add_row("TTS Characters", f"{tts:,}", "", "", "")
+            hits = counters.get("paty_tts_cache_lookups_total:memory", 0)
+            hits += counters.get("paty_tts_cache_lookups_total:disk", 0)
+            lookups = hits + counters.get("paty_tts_cache_lookups_total:miss", 0)
+            if lookups:
+                table.add_row(
+                    _COUNTER_DISPLAY["paty_tts_cache_lookups_total"],
+                    f"hit {100 * hits / lookups:.0f}%",
+                    "",
+                    "",
+                    f"{lookups:,}",
+                )
+            used = counters.get("paty_stt_speculations_total:used", 0)
+            started = used + counters.get("paty_stt_speculations_total:discarded", 0)
+            if started:
+                table.add_row(
+                    _COUNTER_DISPLAY["paty_stt_speculations_total"],
+                    f"used {100 * used / started:.0f}%",
+                    "",
+                    "",
+                    f"{started:,}",
+                )
+            hit = counters.get("paty_llm_prefills_total:hit", 0)
+            turns = hit + counters.get("paty_llm_prefills_total:miss", 0)
+            if turns:
+                table.add_row(
+                    _COUNTER_DISPLAY["paty_llm_prefills_total"],
+                    f"hit {100 * hit / turns:.0f}%",
+                    "",
+                    "",
+                    f"{turns:,}",
+                )
+            for name in (
+                "paty_bus_events_coalesced_total",
+                "paty_bus_audio_frames_dropped_total",
+                "paty_bus_subscribers_dropped_total",
+                "paty_bus_observer_frames_dropped_total",
+                "paty_bus_observer_ring_overflow_total",
+                "paty_gpu_jobs_cancelled_total",
+            ):
+                value = counters.get(name, 0)
+                if value:
+                    table.add_row(_COUNTER_DISPLAY[name], f"{value:,}", "", "", "")
 
         self._console.print(table)
         return MetricExportResult.SUCCESS
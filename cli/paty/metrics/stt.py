@@ -0,0 +1,24 @@
+"""OTEL instruments for speculative STT."""
+
+from __future__ import annotations
+
+from opentelemetry import metrics
+
+
+class STTSpeculationMetrics:
+    """Counts what became of transcriptions started at a pause.
+
+    Instruments created:
+        - paty_stt_speculations_total (Counter, attrs: result =
+          used | discarded)
+    """
+
+    def __init__(self, meter: metrics.Meter | None = None) -> None:
+        m = meter or metrics.get_meter("paty")
+        self._speculations = m.create_counter(
+            "paty_stt_speculations_total",
+            description="Speculative transcriptions, by whether the turn had ended",
+        )
+
+    def speculation(self, result: str) -> None:
+        self._speculations.add(1, {"result": result})
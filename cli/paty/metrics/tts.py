@@ -0,0 +1,24 @@
+"""OTEL instruments for the TTS phrase cache."""
+
+from __future__ import annotations
+
+from opentelemetry import metrics
+
+
+class TTSCacheMetrics:
+    """Counts how often synthesized phrases are served from the cache.
+
+    Instruments created:
+        - paty_tts_cache_lookups_total (Counter, attrs: result =
+          memory | disk | miss)
+    """
+
+    def __init__(self, meter: metrics.Meter | None = None) -> None:
+        m = meter or metrics.get_meter("paty")
+        self._lookups = m.create_counter(
+            "paty_tts_cache_lookups_total",
+            description="TTS cache lookups, by the tier that answered",
+        )
+
+    def lookup(self, result: str) -> None:
+        self._lookups.add(1, {"result": result})
@@ -30,8 +30,14 @@ class PakLLMConfig(BaseModel):
 
 
 class PakVoiceConfig(BaseModel):
+    """``phrases`` are lines this persona says often — a greeting, fillers,
+    acknowledgments.  They are synthesized into the TTS cache at startup,
+    before the agent reports ready, so saying them never waits on TTS.
+    """
+
     tts: PakTTSConfig = PakTTSConfig()
     llm: PakLLMConfig = PakLLMConfig()
+    phrases: list[str] = []
 
 
 class PakConversationConfig(BaseModel):
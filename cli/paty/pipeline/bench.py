@@ -0,0 +1,165 @@
+"""`paty dev tts-bench` — time-to-first-audio of the LLM → TTS chunking policies.
+
+Replays scripted agent responses as an LLM token stream at a fixed rate on
+a simulated clock, and feeds it through each text aggregator: Pipecat's
+default sentence aggregator (what the TTS service does without a chunker)
+and ``paty.pipeline.chunker.ClauseAggregator`` with the configured policy.
+Chunks are synthesized one at a time, as ``MLXAudioTTSService`` does, each
+costing a fixed overhead plus a per-character time; a chunk's audio is
+available once its whole chunk is synthesized. Playback is modelled at a
+speaking rate, so the report also shows stalls: time the speaker sat idle
+waiting for the next chunk after the first one started playing.
+
+Time-to-first-audio is measured from the response's first token, so LLM
+time-to-first-token is excluded. No models run; the timings are a model to
+compare policies, tuned with the ``--tts-*`` options to match a device.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+from pipecat.utils.text.base_text_aggregator import BaseTextAggregator
+from rich.console import Console
+from rich.table import Table
+
+from paty.config.schema import ChunkerConfig
+from paty.pipeline.chunker import ClauseAggregator
+
+# Typical spoken-agent replies: short, a clause or two before the point.
+RESPONSES = (
+    "Sure, I can help with that. The meeting is at three thirty tomorrow "
+    "afternoon, in the small conference room on the second floor.",
+    "Hmm, that's a good question. Honestly, I think the second option is "
+    "better, because it costs less and you can change your mind later "
+    "without losing anything.",
+    "Okay. I've set a timer for twenty minutes. Want me to remind you about "
+    "the laundry when it goes off?",
+    "The forecast says light rain until about noon, then clearing up with a "
+    "high of nineteen degrees. You might want a jacket this morning, but "
+    "you won't need it on the way home.",
+    "Got it! Adding eggs, milk and a loaf of sourdough to your shopping list.",
+)
+
+_TOKEN = re.compile(r"\s*[\w']+|\s*[^\w\s]")
+
+
+@dataclass
+class TTSBenchConfig:
+    tokens_per_s: float = 40.0
+    tts_overhead_ms: float = 60.0
+    tts_ms_per_char: float = 4.0
+    speech_ms_per_char: float = 65.0
+    policy: ChunkerConfig = field(default_factory=ChunkerConfig)
+
+
+@dataclass
+class PolicyResult:
+    name: str
+    first_audio_ms: list[float] = field(default_factory=list)
+    last_audio_ms: list[float] = field(default_factory=list)
+    stall_ms: list[float] = field(default_factory=list)
+    chunks: list[int] = field(default_factory=list)
+
+
+def tokens(text: str) -> list[str]:
+    """Split ``text`` into LLM-like tokens: words with their leading space,
+    punctuation on its own."""
+    return _TOKEN.findall(text)
+
+
+async def _chunk(
+    aggregator: BaseTextAggregator, stream: list[str], tokens_per_s: float, now: list
+) -> list[tuple[float, str]]:
+    """(ready time in s, text) for each chunk the aggregator emits."""
+    chunks = []
+    for i, token in enumerate(stream):
+        now[0] = i / tokens_per_s
+        async for aggregation in aggregator.aggregate(token):
+            chunks.append((now[0], aggregation.text))
+    now[0] = len(stream) / tokens_per_s
+    remaining = await aggregator.flush()
+    if remaining and remaining.text:
+        chunks.append((now[0], remaining.text))
+    return chunks
+
+
+def _synthesize(
+    chunks: list[tuple[float, str]], config: TTSBenchConfig
+) -> tuple[float, float, float]:
+    """First audio, last audio and total stall, all in ms."""
+    tts_free = 0.0
+    playing_until = None
+    first = 0.0
+    stall = 0.0
+    for ready, text in chunks:
+        start = max(ready * 1000, tts_free)
+        tts_free = start + config.tts_overhead_ms + len(text) * config.tts_ms_per_char
+        if playing_until is None:
+            first = playing_until = tts_free
+        elif tts_free > playing_until:
+            stall += tts_free - playing_until
+            playing_until = tts_free
+        playing_until += len(text) * config.speech_ms_per_char
+    return first, tts_free, stall
+
+
+async def run_tts_bench(
+    config: TTSBenchConfig, responses: tuple[str, ...] = RESPONSES
+) -> list[PolicyResult]:
+    from pipecat.utils.text.simple_text_aggregator import SimpleTextAggregator
+
+    now = [0.0]
+    policies: list[tuple[str, BaseTextAggregator]] = [
+        ("sentence (default)", SimpleTextAggregator()),
+        ("chunker", ClauseAggregator(config.policy, clock=lambda: now[0])),
+    ]
+    results = []
+    for name, aggregator in policies:
+        result = PolicyResult(name)
+        for response in responses:
+            chunks = await _chunk(
+                aggregator, tokens(response), config.tokens_per_s, now
+            )
+            first, last, stall = _synthesize(chunks, config)
+            result.first_audio_ms.append(first)
+            result.last_audio_ms.append(last)
+            result.stall_ms.append(stall)
+            result.chunks.append(len(chunks))
+        results.append(result)
+    return results
+
+
+def render_tts_report(
+    results: list[PolicyResult], config: TTSBenchConfig, console: Console
+) -> None:
+    table = Table(
+        title=(
+            f"TTS chunking — {config.tokens_per_s:g} tok/s, TTS "
+            f"{config.tts_overhead_ms:g} ms + {config.tts_ms_per_char:g} ms/char"
+        ),
+        expand=False,
+    )
+    table.add_column("policy", style="bold")
+    table.add_column("first audio mean", justify="right")
+    table.add_column("first audio max", justify="right")
+    table.add_column("last chunk p50", justify="right")
+    table.add_column("stalls", justify="right")
+    table.add_column("chunks", justify="right")
+    for r in results:
+        table.add_row(
+            r.name,
+            f"{np.mean(r.first_audio_ms):.0f} ms",
+            f"{max(r.first_audio_ms):.0f} ms",
+            f"{np.median(r.last_audio_ms):.0f} ms",
+            f"{sum(r.stall_ms):.0f} ms",
+            f"{sum(r.chunks)}",
+        )
+    console.print(table)
+
+
+def run(config: TTSBenchConfig) -> None:
+    render_tts_report(asyncio.run(run_tts_bench(config)), config, Console())
@@ -57,12 +57,15 @@ def build_pipeline(
     observers: list[BaseObserver] | None = None,
     input_mute_filter: Any = None,
     text_injector: Any = None,
+    llm_prefill: Any = None,
+    text_chunker: Any = None,
 ) -> tuple[Pipeline, PipelineTask, PipelineRunner]:
     """Build a standard voice agent pipeline.
 
     Pipeline ordering:
         transport.input → [input_mute] → stt_mute → stt → [text_injector] →
-        user_agg → llm → tts → transport.output → assistant_agg
+        [llm_prefill] → user_agg → llm → [text_chunker] → tts →
+        transport.output → assistant_agg
 
     ``stt_mute`` is an ``STTMuteFilter`` set to ``ALWAYS`` — it drops mic
     audio and VAD frames for the full duration the bot is speaking, which
@@ -75,6 +78,14 @@ def build_pipeline(
     ``text_injector`` (optional) lets the bus deliver typed messages straight
     into the user-aggregator stream, bypassing STT but reusing the same
     turn-boundary semantics.
+
+    ``llm_prefill`` (optional) warms the LLM server's prompt cache from
+    interim transcripts — see ``paty.pipeline.prefill``. It is handed the
+    pipeline's context here.
+
+    ``text_chunker`` (optional) decides where LLM text is cut for TTS —
+    see ``paty.pipeline.chunker``. Without it the TTS service aggregates
+    whole sentences.
     """
     messages = [{"role": "system", "content": persona}]
     context = LLMContext(messages)
@@ -93,15 +104,14 @@ def build_pipeline(
     processors.extend([stt_mute, stt])
     if text_injector is not None:
         processors.append(text_injector)
-    processors.extend(
-        [
-            user_aggregator,
-            llm,
-            tts,
-            transport.output(),
-            assistant_aggregator,
-        ]
-    )
+    if llm_prefill is not None:
+        if llm_prefill.context is None:
+            llm_prefill.context = context
+        processors.append(llm_prefill)
+    processors.extend([user_aggregator, llm])
+    if text_chunker is not None:
+        processors.append(text_chunker)
+    processors.extend([tts, transport.output(), assistant_aggregator])
     pipeline = Pipeline(processors)
 
     task = PipelineTask(
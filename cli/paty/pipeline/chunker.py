@@ -0,0 +1,199 @@
+"""Split streamed LLM text into TTS chunks, first clause as early as possible.
+
+Sits between ``llm`` and ``tts``. Without it the TTS service aggregates whole
+sentences itself, so the agent stays silent until the LLM has produced the
+first full sentence *and* the TTS has synthesized all of it. Here the first
+chunk of each response ends at the first sentence end, or at the first
+clause boundary (``,`` ``;`` ``:``) once it holds ``first_min_words`` words.
+Failing that, it is cut at a word boundary once it holds ``first_max_words``
+words, or ``first_max_wait_ms`` after the response's first token; if the
+LLM stalls before then, a timer sends whatever has arrived by then. Later
+chunks are whole sentences of at least ``min_words`` words (short ones are
+merged with the next), so prosody isn't chopped up once audio is playing. A
+run past ``max_words`` is cut at its last clause (or word) boundary.
+
+Punctuation only counts as a boundary once whitespace follows it, so
+``$29.99`` and ``3:30`` are never split. Chunks are pushed as
+``AggregatedTextFrame``\\ s, which the TTS service synthesizes as-is; this is
+Pipecat's ``LLMTextProcessor`` extension point, with our own aggregator.
+
+The policy comes from ``pipeline.chunker`` in the config (see
+``paty.config.schema.ChunkerConfig``); ``paty dev tts-bench`` compares it
+with plain sentence aggregation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import AsyncIterator, Callable
+
+from pipecat.frames.frames import AggregatedTextFrame, LLMTextFrame
+from pipecat.processors.aggregators.llm_text_processor import LLMTextProcessor
+from pipecat.utils.text.base_text_aggregator import (
+    Aggregation,
+    AggregationType,
+    BaseTextAggregator,
+)
+
+from paty.config.schema import ChunkerConfig
+
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*(?=\s)|\n")
+_CLAUSE_END = re.compile(r"(?:[.!?…]+[\"')\]]*|[,;:\u2013\u2014])(?=\s)|\n")
+_WORD = re.compile(r"\S+")
+
+
+def _words(text: str) -> int:
+    return len(_WORD.findall(text))
+
+
+class ClauseAggregator(BaseTextAggregator):
+    """Text aggregator implementing the chunking policy in the module docstring."""
+
+    def __init__(
+        self,
+        policy: ChunkerConfig | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(aggregation_type=AggregationType.SENTENCE)
+        self._policy = policy or ChunkerConfig()
+        self._clock = clock
+        self._text = ""
+        self._first = True
+        self._started = 0.0
+
+    @property
+    def text(self) -> Aggregation:
+        return Aggregation(text=self._text.strip(), type=AggregationType.SENTENCE)
+
+    async def aggregate(self, text: str) -> AsyncIterator[Aggregation]:
+        if self._first and not self._text.strip():
+            self._started = self._clock()
+        self._text += text
+        while cut := self._cut():
+            chunk, self._text = self._text[:cut].strip(), self._text[cut:]
+            if chunk:
+                self._first = False
+                yield Aggregation(text=chunk, type=AggregationType.SENTENCE)
+
+    def _cut(self) -> int:
+        """Where to end the next chunk in the buffer, or 0 to keep waiting."""
+        p, text = self._policy, self._text
+        if self._first:
+            if m := _SENTENCE_END.search(text):
+                return m.end()
+            for m in _CLAUSE_END.finditer(text):
+                if _words(text[: m.end()]) >= p.first_min_words:
+                    return m.end()
+            # Only whole words: the last one may still be streaming in.
+            cut = max(text.rfind(" "), text.rfind("\n"))
+            if cut <= 0:
+                return 0
+            words = _words(text[:cut])
+            waited_ms = (self._clock() - self._started) * 1000
+            if words >= p.first_max_words or (
+                words and waited_ms >= p.first_max_wait_ms
+            ):
+                return cut
+            return 0
+        for m in _SENTENCE_END.finditer(text):
+            if _words(text[: m.end()]) >= p.min_words:
+                return m.end()
+        if _words(text) <= p.max_words:
+            return 0
+        clauses = [m.end() for m in _CLAUSE_END.finditer(text)]
+        return clauses[-1] if clauses else max(text.rfind(" "), 0)
+
+    def first_due_in(self) -> float | None:
+        """Seconds until the first chunk's wait is over, or None if none is pending."""
+        if not self._first or not self._text.strip():
+            return None
+        return self._started + self._policy.first_max_wait_ms / 1000 - self._clock()
+
+    async def flush_first(self) -> Aggregation | None:
+        """Everything buffered, as the first chunk; later chunks follow as usual.
+
+        For when the wait is over but no more text has come: the last word
+        has had all that time to be continued, so it is taken as whole.
+        """
+        text = self._text.strip()
+        if not self._first or not text:
+            return None
+        self._text = ""
+        self._first = False
+        return Aggregation(text=text, type=AggregationType.SENTENCE)
+
+    async def flush(self) -> Aggregation | None:
+        text = self._text.strip()
+        await self.reset()
+        if not text:
+            return None
+        return Aggregation(text=text, type=AggregationType.SENTENCE)
+
+    async def handle_interruption(self) -> None:
+        await self.reset()
+
+    async def reset(self) -> None:
+        self._text = ""
+        self._first = True
+        self._started = 0.0
+
+
+class SentenceChunker(LLMTextProcessor):
+    """Pipeline stage that turns LLM tokens into TTS-sized text chunks.
+
+    Each response (``LLMFullResponseEndFrame`` flushes) and each
+    interruption starts over with the eager first-chunk policy. While the
+    first chunk is pending, a task waits out ``first_max_wait_ms`` so it
+    is sent on time even if no more tokens arrive. The ``_handle_*`` hooks
+    are ``LLMTextProcessor``'s private ones; a test checks they still exist.
+    """
+
+    def __init__(
+        self,
+        policy: ChunkerConfig | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        **kwargs,
+    ) -> None:
+        self._aggregator = ClauseAggregator(policy, clock=clock)
+        super().__init__(text_aggregator=self._aggregator, **kwargs)
+        self._first_timer: asyncio.Task | None = None
+
+    async def _handle_llm_text(self, in_frame: LLMTextFrame) -> None:
+        await super()._handle_llm_text(in_frame)
+        if self._first_timer is None and self._aggregator.first_due_in() is not None:
+            self._first_timer = self.create_task(
+                self._send_first_when_due(in_frame.skip_tts), name="chunker_first"
+            )
+
+    async def _send_first_when_due(self, skip_tts: bool | None) -> None:
+        while (delay := self._aggregator.first_due_in()) is not None and delay > 0:
+            await asyncio.sleep(delay)
+        self._first_timer = None
+        aggregation = await self._aggregator.flush_first()
+        if aggregation is not None:
+            frame = AggregatedTextFrame(
+                text=aggregation.text, aggregated_by=aggregation.type
+            )
+            frame.skip_tts = skip_tts
+            await self.push_frame(frame)
+
+    async def _stop_first_timer(self) -> None:
+        if self._first_timer is not None:
+            timer, self._first_timer = self._first_timer, None
+            await self.cancel_task(timer)
+
+    async def _handle_interruption(self, frame) -> None:
+        await self._stop_first_timer()
+        await super()._handle_interruption(frame)
+
+    async def _handle_llm_end(self, skip_tts: bool | None = None) -> None:
+        await self._stop_first_timer()
+        await super()._handle_llm_end(skip_tts)
+
+    async def cleanup(self) -> None:
+        await self._stop_first_timer()
+        await super().cleanup()
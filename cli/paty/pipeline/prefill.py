@@ -0,0 +1,206 @@
+"""Prefill the LLM's prompt cache from interim transcripts.
+
+The LLM can't start on a turn until STT delivers the final transcript, and
+then the first thing it does is process the whole prompt — time-to-first-
+token grows with the conversation. But the prompt is mostly known before
+the turn ends: the context so far plus whatever the user has said, which
+streaming STT reports in ``InterimTranscriptionFrame``\\ s.
+
+``SpeculativePrefill`` sits between ``stt`` and the user aggregator. Once
+an interim's words are *stable* (the same in the last two interims), it
+sends the managed LLM server the context plus those words as a user
+message, asking for a single token. The server keeps that prompt's KV
+cache (``mlx_lm.server``'s prompt cache, llama.cpp's slot cache), so when
+the real request arrives with the final transcript only the part after
+the shared prefix has to be processed.
+
+After a turn with prefills, its final transcript is followed by one
+``LLMPrefillMetricsData``. The turn is a *hit* when the transcript starts
+with a prefilled prefix (compared word by word, ignoring case and
+punctuation, as interims are), and the server time spent on matching prefills
+is counted as TTFB saved. ``PipelineMetricsObserver`` records it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import string
+import time
+from collections.abc import Callable
+
+import httpx
+from loguru import logger
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InterimTranscriptionFrame,
+    MetricsFrame,
+    TranscriptionFrame,
+)
+from pipecat.metrics.metrics import MetricsData
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from paty.config.schema import LLMPrefillConfig
+
+
+class LLMPrefillMetricsData(MetricsData):
+    """Outcome of a turn's speculative prefills.
+
+    Parameters:
+        value: LLM TTFB saved, in seconds (0 on a miss).
+        hit: Whether the final transcript started with a prefilled prefix.
+    """
+
+    value: float
+    hit: bool
+
+
+def _words(text: str) -> list[str]:
+    """``text``'s words, lowercased and stripped of punctuation, for comparing."""
+    return [w.lower().strip(string.punctuation) for w in text.split()]
+
+
+def stable_prefix(previous: str, current: str) -> str:
+    """The words two consecutive interims agree on, from the start.
+
+    Words are compared ignoring case and punctuation; they are returned
+    as ``current`` has them.
+    """
+    agreed = 0
+    for a, b in zip(_words(previous), _words(current), strict=False):
+        if a != b:
+            break
+        agreed += 1
+    return " ".join(current.split()[:agreed])
+
+
+class _Prefill:
+    """One prefill request: the words it covered and how long it took."""
+
+    def __init__(self, text: str, started: float) -> None:
+        self.text = text
+        self.started = started
+        self.elapsed: float | None = None  # None while in flight
+        self.task: asyncio.Task | None = None
+
+
+class SpeculativePrefill(FrameProcessor):
+    """Pass-through processor that warms the LLM server on interim transcripts.
+
+    ``base_url`` and ``model`` are the OpenAI-compatible endpoint the LLM
+    service talks to. ``context`` is the pipeline's ``LLMContext``;
+    ``build_pipeline`` sets it when left None.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        *,
+        policy: LLMPrefillConfig | None = None,
+        context: LLMContext | None = None,
+        client: httpx.AsyncClient | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._url = base_url.rstrip("/") + "/chat/completions"
+        self._model = model
+        self._policy = policy or LLMPrefillConfig()
+        self.context = context
+        self._client = client or httpx.AsyncClient(timeout=30.0)
+        self._clock = clock
+        # Per-turn state.
+        self._last_interim = ""
+        self._prefills: list[_Prefill] = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
+        await super().process_frame(frame, direction)
+        if isinstance(frame, InterimTranscriptionFrame):
+            self._on_interim(frame.text)
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, TranscriptionFrame):
+            await self.push_frame(frame, direction)
+            outcome = self._outcome(frame.text)
+            if outcome is not None:
+                await self.push_frame(MetricsFrame(data=[outcome]))
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            await self._stop()
+            await self.push_frame(frame, direction)
+        else:
+            await self.push_frame(frame, direction)
+
+    def _on_interim(self, text: str) -> None:
+        stable = stable_prefix(self._last_interim, text)
+        self._last_interim = text
+        if self.context is None or not self._should_prefill(stable):
+            return
+        prefill = _Prefill(stable, self._clock())
+        prefill.task = self.create_task(self._prefill(prefill), name="llm_prefill")
+        self._prefills.append(prefill)
+
+    def _should_prefill(self, stable: str) -> bool:
+        words = len(stable.split())
+        if words < self._policy.min_words:
+            return False
+        if not self._prefills:
+            return True
+        last = self._prefills[-1]
+        # One at a time: the server would queue a second behind the first.
+        if last.elapsed is None:
+            return False
+        return words - len(last.text.split()) >= self._policy.min_new_words
+
+    async def _prefill(self, prefill: _Prefill) -> None:
+        # Provider-specific messages aren't for this endpoint; the LLM
+        # service leaves them out too.
+        messages = [m for m in self.context.get_messages() if isinstance(m, dict)]
+        messages.append({"role": "user", "content": prefill.text})
+        try:
+            response = await self._client.post(
+                self._url,
+                json={
+                    "model": self._model,
+                    "messages": messages,
+                    "max_tokens": 1,
+                    "temperature": 0,
+                },
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.debug(f"{self}: prefill failed: {e}")
+            if prefill in self._prefills:
+                self._prefills.remove(prefill)
+            return
+        prefill.elapsed = self._clock() - prefill.started
+
+    def _outcome(self, text: str) -> LLMPrefillMetricsData | None:
+        """Score the turn's prefills against its final transcript and reset."""
+        prefills, self._prefills = self._prefills, []
+        self._last_interim = ""
+        if not prefills:
+            return None
+        # Each prefill only paid for the words past the one before it, so
+        # the cache the real request finds is worth all the matching ones.
+        # One still running is waited out by the real request: only the
+        # time it has already spent is saved.
+        now = self._clock()
+        words = _words(text)
+        matched = [
+            p for p in prefills if words[: len(p.text.split())] == _words(p.text)
+        ]
+        saved = sum(
+            now - p.started if p.elapsed is None else p.elapsed for p in matched
+        )
+        return LLMPrefillMetricsData(
+            processor=self.name, value=saved, hit=bool(matched)
+        )
+
+    async def _stop(self) -> None:
+        for prefill in self._prefills:
+            if prefill.task is not None and not prefill.task.done():
+                await self.cancel_task(prefill.task)
+        self._prefills = []
+        await self._client.aclose()
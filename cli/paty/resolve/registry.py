@@ -2,14 +2,16 @@
 
 Each factory receives a resolved config object (STTConfig, LLMConfig, TTSConfig)
 with model/voice already filled in (from explicit override or profile default),
-plus a ``compute_executor`` that may be None.  MLX factories require it;
-CUDA/CPU factories ignore it.
+plus a ``compute_executor`` that may be None.  MLX factories require it,
+unless the config asks for the model to run ``isolated`` in a worker
+process of its own (whose scheduler then records with the executor's
+meter); CUDA/CPU factories ignore it.
 """
 
 from __future__ import annotations
 
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor
 from typing import Any
 
 from loguru import logger
@@ -32,15 +34,35 @@ STT_REGISTRY: dict[tuple[str, Platform], Factory] = {
 }
 
 
-def _make_mlx_audio_stt(cfg: STTConfig, executor: ThreadPoolExecutor | None) -> Any:
-    if executor is None:
+def _make_mlx_audio_stt(cfg: STTConfig, executor: Executor | None) -> Any:
+    if executor is None and not cfg.isolated:
         msg = "mlx-audio STT requires a shared compute_executor"
         raise ValueError(msg)
     from paty.runtime.stt_service import MLXAudioSTTService
-
+    from paty.runtime.workers import MLXSTTEngine, ModelWorker
+
+    model_repo = cfg.model or "UsefulSensors/moonshine-base"
+    worker = (
+        ModelWorker(
+            MLXSTTEngine,
+            model_repo,
+            name="paty-stt",
+            meter=getattr(executor, "meter", None),
+        )
+        if cfg.isolated
+        else None
+    )
+    streaming, speculation = cfg.streaming, cfg.speculation
     return MLXAudioSTTService(
         compute_executor=executor,
-        model_repo=cfg.model or "UsefulSensors/moonshine-base",
+        worker=worker,
+        model_repo=model_repo,
+        interim_interval_s=(
+            streaming.interim_interval_ms / 1000 if streaming.enabled else None
+        ),
+        window_s=streaming.window_s,
+        pause_s=speculation.pause_ms / 1000 if speculation.enabled else None,
+        meter=getattr(executor, "meter", None),
     )
 
 
@@ -151,15 +173,27 @@ def _ensure_spacy_model_for_misaki() -> None:
     logger.info("misaki: en_core_web_sm installed and importable")
 
 
-def _make_mlx_audio_tts(cfg: TTSConfig, executor: ThreadPoolExecutor | None) -> Any:
-    if executor is None:
+def _make_mlx_audio_tts(cfg: TTSConfig, executor: Executor | None) -> Any:
+    if executor is None and not cfg.isolated:
         msg = "mlx-audio TTS requires a shared compute_executor"
         raise ValueError(msg)
     _ensure_spacy_model_for_misaki()
-    from paty.runtime.tts_service import MLXAudioTTSService
-
+    from paty.runtime.tts_service import DEFAULT_MODEL_REPO, MLXAudioTTSService
+    from paty.runtime.workers import MLXTTSEngine, ModelWorker
+
+    worker = (
+        ModelWorker(
+            MLXTTSEngine,
+            DEFAULT_MODEL_REPO,
+            name="paty-tts",
+            meter=getattr(executor, "meter", None),
+        )
+        if cfg.isolated
+        else None
+    )
     return MLXAudioTTSService(
         compute_executor=executor,
+        worker=worker,
         voice=cfg.voice or "af_bella",
     )
 
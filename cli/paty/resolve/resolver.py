@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from typing import Any
 
@@ -22,7 +22,7 @@ def resolve_stt(
     cfg: STTConfig,
     platform: Platform,
     profile: ResolvedProfile,
-    compute_executor: ThreadPoolExecutor | None,
+    compute_executor: Executor | None,
 ) -> Any:
     """Resolve STT config to a Pipecat service instance."""
     # Use profile's STT provider/model when user hasn't overridden
@@ -38,7 +38,17 @@ def resolve_stt(
     if factory is None:
         msg = f"No STT service registered for ({effective_provider!r}, {platform.value!r})"
         raise ValueError(msg)
-    return factory(cfg, profile, compute_executor)
+    service = factory(cfg, profile, compute_executor)
+    # The streaming mlx-audio service speculates on its own.
+    if cfg.speculation.enabled and not getattr(service, "speculates", False):
+        from paty.runtime.speculative_stt import speculate_stt
+
+        speculate_stt(
+            service,
+            pause_s=cfg.speculation.pause_ms / 1000,
+            meter=getattr(compute_executor, "meter", None),
+        )
+    return service
 
 
 def resolve_llm(cfg: LLMConfig, platform: Platform, profile: ResolvedProfile) -> Any:
@@ -58,7 +68,7 @@ def resolve_tts(
     cfg: TTSConfig,
     platform: Platform,
     profile: ResolvedProfile,
-    compute_executor: ThreadPoolExecutor | None,
+    compute_executor: Executor | None,
 ) -> Any:
     """Resolve TTS config to a Pipecat service instance."""
     # Use profile's TTS provider if user didn't override and profile says piper
@@ -74,14 +84,22 @@ def resolve_tts(
     if factory is None:
         msg = f"No TTS service registered for ({effective_provider!r}, {platform.value!r})"
         raise ValueError(msg)
-    return factory(cfg, compute_executor)
+    service = factory(cfg, compute_executor)
+    if cfg.cache.enabled:
+        from paty.runtime.tts_cache import TTSCache, cache_tts
+
+        cache = TTSCache.from_config(
+            cfg.cache, meter=getattr(compute_executor, "meter", None)
+        )
+        cache_tts(service, cache, provider=effective_provider)
+    return service
 
 
 def resolve_services(
     pipeline_config: PipelineConfig,
     platform: Platform,
     profile: ResolvedProfile,
-    compute_executor: ThreadPoolExecutor | None = None,
+    compute_executor: Executor | None = None,
 ) -> ResolvedServices:
     """Resolve all pipeline services.
 
@@ -0,0 +1,112 @@
+"""Float ↔ 16-bit PCM conversion for the in-process audio services.
+
+Models work in float32 samples in [-1, 1]; Pipecat frames carry 16-bit
+PCM. ``PCM16Converter`` converts between the two into buffers it keeps
+and reuses, so a steady stream of similar-sized chunks allocates nothing
+after the first one: every step (clip, scale, cast) is one NumPy pass
+written with ``out=`` into those buffers. Casts go through ``np.copyto``
+rather than a ufunc's ``out=``, which would allocate a cast buffer.
+Float input is clipped before scaling, so a model overshooting 1.0
+saturates instead of wrapping around to the opposite sign.
+
+Converted results are *views* of the converter's buffers, valid until its
+next call. Callers copy them or hand them to something that does —
+``resample_pcm16`` passes the view straight to a Pipecat resampler (which
+copies into its own output) and only copies itself when no resampling is
+needed. ``paty dev audio-bench`` times the conversions against the naive
+NumPy expressions over typical utterance sizes.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+if TYPE_CHECKING:
+    # Worker processes (``paty.runtime.workers``) import this module and
+    # shouldn't have to import Pipecat.
+    from pipecat.audio.resamplers.base_audio_resampler import BaseAudioResampler
+
+PCM16_MAX = np.float32(32767)
+_FROM_PCM16 = np.float32(1 / 32768)
+_LOW, _HIGH = np.float32(-1), np.float32(1)
+
+_RIFF = struct.Struct("<4sI4s")
+_CHUNK = struct.Struct("<4sI")
+
+
+class PCM16Converter:
+    """Converts audio chunks to and from 16-bit PCM, reusing its buffers.
+
+    One converter per stream: results share the converter's buffers, so
+    it is not safe to use from two threads at once.
+    """
+
+    def __init__(self, capacity: int = 0) -> None:
+        self._float = np.empty(capacity, dtype=np.float32)
+        self._pcm = np.empty(capacity, dtype=np.int16)
+
+    @property
+    def capacity(self) -> int:
+        return self._float.size
+
+    def _reserve(self, n: int) -> None:
+        if n > self._float.size:
+            size = max(n, 2 * self._float.size)
+            self._float = np.empty(size, dtype=np.float32)
+            self._pcm = np.empty(size, dtype=np.int16)
+
+    def to_pcm16(self, audio: ArrayLike) -> memoryview:
+        """Clip float ``audio`` (any shape) to [-1, 1] and scale it to PCM16."""
+        samples = np.asarray(audio).reshape(-1)
+        n = samples.size
+        self._reserve(n)
+        scratch, pcm = self._float[:n], self._pcm[:n]
+        np.clip(samples, _LOW, _HIGH, out=scratch)
+        np.multiply(scratch, PCM16_MAX, out=scratch)
+        np.copyto(pcm, scratch, casting="unsafe")
+        return memoryview(pcm).cast("B")
+
+    def from_pcm16(self, pcm: bytes | memoryview) -> np.ndarray:
+        """Float32 samples in [-1, 1) for little-endian PCM16 ``pcm``."""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        n = samples.size
+        self._reserve(n)
+        out = self._float[:n]
+        np.copyto(out, samples)
+        np.multiply(out, _FROM_PCM16, out=out)
+        return out
+
+
+def wav_payload(data: bytes) -> memoryview:
+    """The sample data of a RIFF/WAVE file, without copying.
+
+    Pipecat's ``SegmentedSTTService`` hands ``run_stt`` a whole WAV file;
+    anything that isn't one is returned as-is, assumed to be raw PCM.
+    """
+    view = memoryview(data)
+    if len(data) < _RIFF.size:
+        return view
+    riff, _, wave = _RIFF.unpack_from(data)
+    if riff != b"RIFF" or wave != b"WAVE":
+        return view
+    pos = _RIFF.size
+    while pos + _CHUNK.size <= len(data):
+        chunk_id, size = _CHUNK.unpack_from(data, pos)
+        pos += _CHUNK.size
+        if chunk_id == b"data":
+            return view[pos : pos + size]
+        pos += size + (size & 1)  # chunks are word-aligned
+    return view[len(data) :]
+
+
+async def resample_pcm16(
+    resampler: BaseAudioResampler, pcm: memoryview, in_rate: int, out_rate: int
+) -> bytes:
+    """Resample a converter's PCM16 view into bytes that outlive the view."""
+    if in_rate == out_rate:
+        return pcm.tobytes()
+    return await resampler.resample(pcm, in_rate, out_rate)
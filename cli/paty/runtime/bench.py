@@ -0,0 +1,132 @@
+"""`paty dev audio-bench` — float ↔ PCM16 conversion cost over utterance sizes.
+
+Times ``paty.runtime.audio.PCM16Converter`` against the plain NumPy
+expressions the services used before it, for Kokoro output segments
+(float → PCM16 at 24 kHz) and STT utterances (PCM16 → float at 16 kHz).
+Besides time per call it reports the peak memory each call allocates, as
+seen by ``tracemalloc`` — the converter's should be zero once warm.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from paty.runtime.audio import PCM16Converter
+
+TTS_RATE = 24000
+STT_RATE = 16000
+# Kokoro segments are a sentence or two; STT segments are single turns.
+TTS_SECONDS = (0.5, 2.0, 6.0)
+STT_SECONDS = (1.0, 3.0, 10.0)
+
+
+@dataclass
+class ConversionResult:
+    case: str
+    samples: int
+    naive_us: float
+    naive_alloc: int
+    converter_us: float
+    converter_alloc: int
+
+
+def _naive_to_pcm16(audio: np.ndarray) -> bytes:
+    return (np.array(audio).flatten() * 32767).astype(np.int16).tobytes()
+
+
+def _naive_from_pcm16(pcm: bytes) -> np.ndarray:
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def _time_us(fn: Callable[[], object], iterations: int) -> float:
+    fn()  # warm up (and let the converter size its buffers)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def _peak_alloc(fn: Callable[[], object]) -> int:
+    fn()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_audio_bench(iterations: int = 200) -> list[ConversionResult]:
+    rng = np.random.default_rng(0)
+    converter = PCM16Converter()
+    results = []
+    for seconds in TTS_SECONDS:
+        audio = rng.uniform(-1.1, 1.1, int(seconds * TTS_RATE)).astype(np.float32)
+        naive = lambda audio=audio: _naive_to_pcm16(audio)  # noqa: E731
+        ours = lambda audio=audio: converter.to_pcm16(audio)  # noqa: E731
+        results.append(
+            ConversionResult(
+                f"TTS {seconds:g} s",
+                audio.size,
+                _time_us(naive, iterations),
+                _peak_alloc(naive),
+                _time_us(ours, iterations),
+                _peak_alloc(ours),
+            )
+        )
+    for seconds in STT_SECONDS:
+        n = int(seconds * STT_RATE)
+        pcm = rng.integers(-32768, 32767, n, dtype=np.int16).tobytes()
+        naive = lambda pcm=pcm: _naive_from_pcm16(pcm)  # noqa: E731
+        ours = lambda pcm=pcm: converter.from_pcm16(pcm)  # noqa: E731
+        results.append(
+            ConversionResult(
+                f"STT {seconds:g} s",
+                n,
+                _time_us(naive, iterations),
+                _peak_alloc(naive),
+                _time_us(ours, iterations),
+                _peak_alloc(ours),
+            )
+        )
+    return results
+
+
+def _kib(n: int) -> str:
+    return f"{n / 1024:.0f} KiB" if n >= 1024 else f"{n} B"
+
+
+def render_audio_report(results: list[ConversionResult], console: Console) -> None:
+    table = Table(
+        title="PCM16 conversion per call — TTS float→PCM16, STT PCM16→float",
+        expand=False,
+    )
+    table.add_column("case", style="bold", no_wrap=True)
+    table.add_column("samples", justify="right")
+    table.add_column("naive", justify="right")
+    table.add_column("naive alloc", justify="right")
+    table.add_column("converter", justify="right")
+    table.add_column("converter alloc", justify="right")
+    table.add_column("speedup", justify="right")
+    for r in results:
+        table.add_row(
+            r.case,
+            f"{r.samples}",
+            f"{r.naive_us:.1f} µs",
+            _kib(r.naive_alloc),
+            f"{r.converter_us:.1f} µs",
+            _kib(r.converter_alloc),
+            f"{r.naive_us / r.converter_us:.2f}x",
+        )
+    console.print(table)
+
+
+def run(iterations: int = 200) -> None:
+    render_audio_report(run_audio_bench(iterations), Console())
@@ -1,4 +1,4 @@
-"""Dedicated single-thread executor for MLX/Metal work.
+"""Dedicated single-thread scheduler for MLX/Metal work.
 
 Metal's command queues expect all operations on a given queue to be
 issued from the same OS thread.  Using asyncio's default thread pool
@@ -8,22 +8,178 @@ Metal assertions such as:
     'A command encoder is already encoding to this command buffer'
     'Completed handler provided after commit call'
 
-This module provides a ``ThreadPoolExecutor`` with ``max_workers=1``
-shared by STT and TTS services.  Because there is only one worker,
-MLX calls are inherently serialized and always run on the same OS
-thread — no additional lock required.
+This module provides ``GPUScheduler``, an executor with exactly one
+worker thread shared by STT and TTS services.  Because there is only one
+worker, MLX calls are inherently serialized and always run on the same
+OS thread — no additional lock required.
 
-Future direction: replace with separate MLX contexts / Metal command
-queues per service, or isolate services into separate processes.  The
-consumer interface (pass executor to ``loop.run_in_executor``) stays
-the same either way.
+A plain single-worker pool runs jobs first-come first-served, so a user's
+finished turn waits behind whatever TTS segments happen to be queued.
+The scheduler instead runs the most urgent queued job next (see
+``Priority``).  A running job is never interrupted, but services submit
+work in small pieces — Kokoro one segment per job — so urgent work gets
+in between them.  Services submit through a *lane*
+(``gpu_lane(executor, "tts", Priority.SPEECH)``), an ``Executor`` that
+tags its jobs with a service name and priority, so consumers keep
+passing an executor to ``loop.run_in_executor``.
+
+A queued job whose future is cancelled never runs: cancelling the asyncio
+task awaiting ``run_in_executor`` (as Pipecat does on interruption)
+cancels it.  A running job can't be stopped, so services that may be
+cut short check between their small jobs whether to carry on.  Time
+spent queued and cancellations are recorded per service in
+``paty.metrics.gpu.GPUSchedulerMetrics``.
+
+To run STT and TTS truly concurrently, give each its own process instead
+(``paty.runtime.workers``); each worker's client then gets a scheduler of
+its own, and the consumer interface (pass an executor or lane to
+``loop.run_in_executor``) stays the same.
 """
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from enum import IntEnum
+from typing import Any
+
+from opentelemetry import metrics
+
+from paty.metrics.gpu import GPUSchedulerMetrics
+
+
+class Priority(IntEnum):
+    """Lower runs first; equal priorities run in submission order."""
+
+    TURN = 0  # transcribing a finished user turn — the reply waits on it
+    SPEECH = 1  # TTS segments the user is about to hear
+    BACKGROUND = 2  # interims, model loading, anything else
+
+
+class _Job:
+    __slots__ = ("args", "fn", "future", "kwargs", "lane", "queued_at")
+
+    def __init__(self, lane: GPULane, fn: Callable, args: tuple, kwargs: dict):
+        self.lane = lane
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+        self.queued_at = time.monotonic()
+
+
+class GPULane(Executor):
+    """Submits to a ``GPUScheduler`` under one service name and priority."""
+
+    def __init__(self, scheduler: GPUScheduler, service: str, priority: Priority):
+        self.scheduler = scheduler
+        self.service = service
+        self.priority = priority
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        return self.scheduler._enqueue(_Job(self, fn, args, kwargs))
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """A no-op: the scheduler belongs to whoever created it."""
+
+
+class GPUScheduler(Executor):
+    """One worker thread running queued jobs by priority, then FIFO.
+
+    ``submit`` on the scheduler itself queues at ``Priority.BACKGROUND``;
+    use ``lane`` for anything else.
+    """
+
+    def __init__(self, meter: metrics.Meter | None = None) -> None:
+        self.meter = meter
+        self._queue: list[tuple[int, int, _Job]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._shutdown = False
+        self._metrics = GPUSchedulerMetrics(meter)
+        self._default = GPULane(self, "other", Priority.BACKGROUND)
+        # Daemon, so a scheduler nobody shut down can't hold up exit.
+        self._thread = threading.Thread(target=self._work, name="paty-mlx", daemon=True)
+        self._thread.start()
+
+    def lane(self, service: str, priority: Priority) -> GPULane:
+        return GPULane(self, service, priority)
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        return self._default.submit(fn, *args, **kwargs)
+
+    def _enqueue(self, job: _Job) -> Future:
+        with self._cond:
+            if self._shutdown:
+                msg = "cannot schedule new futures after shutdown"
+                raise RuntimeError(msg)
+            heapq.heappush(self._queue, (job.lane.priority, next(self._seq), job))
+            self._cond.notify()
+        return job.future
+
+    def _next_job(self) -> _Job | None:
+        with self._cond:
+            while not self._queue and not self._shutdown:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            return heapq.heappop(self._queue)[2]
+
+    def _work(self) -> None:
+        while (job := self._next_job()) is not None:
+            try:
+                self._run(job)
+            finally:
+                # Don't keep the last job (its arguments, and through its
+                # future its result) alive while idle.
+                del job
+
+    def _run(self, job: _Job) -> None:
+        lane = job.lane
+        if not job.future.set_running_or_notify_cancel():
+            self._metrics.cancelled(lane.service)
+            return
+        self._metrics.waited(
+            time.monotonic() - job.queued_at,
+            lane.service,
+            lane.priority.name.lower(),
+        )
+        try:
+            result = job.fn(*job.args, **job.kwargs)
+        except BaseException as e:
+            job.future.set_exception(e)
+        else:
+            job.future.set_result(result)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop accepting jobs; queued ones still run unless ``cancel_futures``."""
+        with self._cond:
+            self._shutdown = True
+            if cancel_futures:
+                for _, _, job in self._queue:
+                    if job.future.cancel():
+                        self._metrics.cancelled(job.lane.service)
+                self._queue.clear()
+            self._cond.notify_all()
+        if wait and threading.current_thread() is not self._thread:
+            self._thread.join()
+
+
+def create_gpu_executor(meter: metrics.Meter | None = None) -> GPUScheduler:
+    """Create the single-worker scheduler that serializes MLX/Metal access."""
+    return GPUScheduler(meter)
+
 
+def gpu_lane(executor: Executor, service: str, priority: Priority) -> Executor:
+    """``executor``'s lane for ``service`` at ``priority``.
 
-def create_gpu_executor() -> ThreadPoolExecutor:
-    """Create a single-worker executor for serializing MLX/Metal access."""
-    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="paty-mlx")
+    Any other executor (a plain single-worker pool, say) has no priorities
+    and is returned unchanged.
+    """
+    if isinstance(executor, GPUScheduler):
+        return executor.lane(service, priority)
+    return executor
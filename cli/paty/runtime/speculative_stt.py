@@ -0,0 +1,188 @@
+"""Start transcribing at the first pause instead of at VAD end-of-turn.
+
+A ``SegmentedSTTService`` transcribes once VAD reports the user stopped,
+and VAD only does that after its whole stop window (~0.8 s) of silence.
+Nearly all of that wait is idle: the audio that ends the turn was already
+there when the silence began. ``speculate_stt`` transcribes the utterance
+as soon as ``PauseDetector`` sees ``pause_s`` of quiet, in the background:
+
+- If VAD then ends the turn with nothing but quiet after the speculation,
+  its transcript is pushed straight away — the turn's transcription was
+  done during the VAD stop window.
+- If the user speaks again first, the speculation is discarded and the
+  next pause starts another. At VAD stop without a valid speculation the
+  service transcribes as usual.
+
+Works with any segmented service (faster-whisper, mlx-audio); the streaming
+``MLXAudioSTTService`` speculates natively on its open window instead.
+Outcomes are counted in ``paty.metrics.stt.STTSpeculationMetrics``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import wave
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from opentelemetry import metrics
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    Frame,
+    VADUserStartedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.services.stt_service import SegmentedSTTService
+
+from paty.metrics.stt import STTSpeculationMetrics
+
+# A frame is quiet below this fraction of the utterance's loudest frame...
+QUIET_RATIO = 0.1
+# ...and nothing counts as said until a frame reaches this RMS.
+MIN_SPEECH_RMS = 300.0
+
+
+class PauseDetector:
+    """Tracks, in byte offsets into an utterance's PCM16, where speech last was.
+
+    Fed one audio frame at a time; ``paused`` once ``pause_s`` of quiet has
+    followed speech. Quiet is relative to the loudest frame so far, so it
+    adapts to mic gain without a calibrated threshold.
+    """
+
+    def __init__(self, pause_s: float) -> None:
+        self.pause_s = pause_s
+        self.reset()
+
+    def reset(self) -> None:
+        self.voiced_end = 0
+        self._end = 0
+        self._peak = 0.0
+        self._pause_bytes = 0
+
+    @property
+    def paused(self) -> bool:
+        return self.voiced_end > 0 and self._end - self.voiced_end >= self._pause_bytes
+
+    def feed(self, pcm: bytes, end: int, sample_rate: int) -> None:
+        """``pcm`` is the frame just appended; ``end`` the offset after it."""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        level = (
+            float(np.sqrt(np.square(samples, dtype=np.float32).mean()))
+            if samples.size
+            else 0.0
+        )
+        self._peak = max(self._peak, level)
+        if self._peak >= MIN_SPEECH_RMS and level >= QUIET_RATIO * self._peak:
+            self.voiced_end = end
+        self._end = end
+        self._pause_bytes = int(self.pause_s * sample_rate) * 2
+
+
+def _wav(pcm: bytes, sample_rate: int) -> bytes:
+    """The WAV file ``SegmentedSTTService`` would hand ``run_stt``."""
+    content = io.BytesIO()
+    with wave.open(content, "wb") as wav:
+        wav.setsampwidth(2)
+        wav.setnchannels(1)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return content.getvalue()
+
+
+class _Speculation:
+    """Stands in for a segmented service's VAD/audio hooks; see :func:`speculate_stt`."""
+
+    def __init__(
+        self,
+        service: SegmentedSTTService,
+        pause_s: float,
+        meter: metrics.Meter | None = None,
+    ) -> None:
+        self.service = service
+        self.pauses = PauseDetector(pause_s)
+        self._metrics = STTSpeculationMetrics(meter)
+        self._task: asyncio.Task | None = None
+        self._end = 0  # buffer offset the running speculation covers
+        self._valid = False
+        self._process_audio_frame = service.process_audio_frame
+        self._started_speaking = service._handle_user_started_speaking
+        self._stopped_speaking = service._handle_user_stopped_speaking
+
+    async def process_audio_frame(
+        self, frame: AudioRawFrame, direction: FrameDirection
+    ):
+        await self._process_audio_frame(frame, direction)
+        service = self.service
+        if not service._user_speaking:
+            return
+        end = len(service._audio_buffer)
+        self.pauses.feed(frame.audio, end, service.sample_rate)
+        if self._valid and self.pauses.voiced_end > self._end:
+            self._valid = False  # speech resumed; that wasn't the turn's end
+            self._metrics.speculation("discarded")
+        # One at a time: a discarded speculation still finishes first.
+        idle = self._task is None or self._task.done()
+        if self.pauses.paused and not self._valid and idle:
+            self._end, self._valid = end, True
+            audio = _wav(bytes(service._audio_buffer), service.sample_rate)
+            self._task = service.create_task(
+                self._transcribe(audio), name="stt_speculation"
+            )
+
+    async def _transcribe(self, audio: bytes) -> list[Frame | None]:
+        return [frame async for frame in self.service.run_stt(audio)]
+
+    async def handle_user_started_speaking(self, frame: VADUserStartedSpeakingFrame):
+        await self._started_speaking(frame)
+        self.pauses.reset()
+        self._valid = False
+
+    async def handle_user_stopped_speaking(self, frame: VADUserStoppedSpeakingFrame):
+        task, valid = self._task, self._valid
+        self._task, self._valid = None, False
+        if task is not None and not valid:
+            # Speech resumed after it: the real pass mustn't wait on it.
+            if not task.cancel() and not task.cancelled():
+                task.exception()  # done already; don't leave a failure unread
+            task = None
+        frames: list[Frame | None] = []
+        if task is not None:
+            try:
+                frames = await task
+            except Exception as e:
+                logger.warning(f"{self.service}: speculative transcription failed: {e}")
+                valid = False
+        if not valid:
+            await self._stopped_speaking(frame)
+            return
+        self._metrics.speculation("used")
+        self.service._user_speaking = False
+        self.service._audio_buffer.clear()
+        await self.service.process_generator(_replay(frames))
+
+
+async def _replay(frames: list[Frame | None]) -> AsyncGenerator[Frame | None, None]:
+    for frame in frames:
+        yield frame
+
+
+def speculate_stt(
+    service: Any, *, pause_s: float, meter: metrics.Meter | None = None
+) -> Any:
+    """Transcribe ``service``'s turns from their first pause; returns ``service``.
+
+    Services that aren't segmented (they transcribe as audio streams in)
+    have nothing to speculate on and are returned unchanged.
+    """
+    if not isinstance(service, SegmentedSTTService):
+        return service
+    speculation = _Speculation(service, pause_s, meter)
+    service.process_audio_frame = speculation.process_audio_frame
+    service._handle_user_started_speaking = speculation.handle_user_started_speaking
+    service._handle_user_stopped_speaking = speculation.handle_user_stopped_speaking
+    return service
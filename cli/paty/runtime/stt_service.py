@@ -2,22 +2,73 @@
 
 Wraps any mlx-audio STT model (Moonshine, Whisper, SenseVoice, etc.)
 as a Pipecat SegmentedSTTService. Runs inference on the Metal GPU.
+
+Segmented STT transcribes nothing until VAD closes the utterance, so the
+whole utterance's transcription sits between the user going quiet and the
+LLM starting. With ``interim_interval_s`` set the service streams instead:
+
+- Every ``interim_interval_s`` of speech it transcribes the *open window*
+  (the audio since the last commit) in the background and pushes an
+  ``InterimTranscriptionFrame`` of everything heard so far.
+- Once the open window is longer than ``window_s``, its head is
+  *committed*: cut at the quietest 30 ms in its second half (a pause
+  between words, with luck), transcribed once, and never looked at again.
+- When VAD closes the utterance only the open window is left to
+  transcribe; the final ``TranscriptionFrame`` is the committed text plus
+  that. Latency after speech end is bounded by ``window_s`` of audio, not
+  the utterance length.
+
+Background work goes through the same single-worker compute executor as
+everything else, behind TTS, and at most one job is in flight, so a slow
+model just makes interims rarer. The final pass runs ahead of everything,
+and an interim still queued when the user stops is dropped rather than
+waited for.
+
+With ``pause_s`` set as well, the service also speculates (see
+``paty.runtime.speculative_stt``): ``pause_s`` of quiet after speech
+triggers an interim right away instead of at the next interval. If VAD
+then ends the turn with only quiet after that interim, its transcript *is*
+the open window's, and the final pass is skipped altogether.
+
+Given a ``worker`` (``paty.runtime.workers.ModelWorker``) the model runs in
+a process of its own instead, next to TTS rather than taking turns with it
+on the shared thread, and a crashed worker costs a transcript, not the
+pipeline.
 """
 
 from __future__ import annotations
 
 import asyncio
 from collections.abc import AsyncGenerator
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, Future
 from functools import partial
 
 import numpy as np
 from loguru import logger
-from pipecat.frames.frames import ErrorFrame, Frame, TranscriptionFrame
+from opentelemetry import metrics
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    ErrorFrame,
+    Frame,
+    InterimTranscriptionFrame,
+    TranscriptionFrame,
+    VADUserStartedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.stt_service import SegmentedSTTService
 from pipecat.utils.time import time_now_iso8601
 
+from paty.metrics.stt import STTSpeculationMetrics
+from paty.runtime.audio import PCM16Converter, wav_payload
+from paty.runtime.gpu_executor import Priority, gpu_lane
+from paty.runtime.speculative_stt import PauseDetector
+from paty.runtime.workers import ModelWorker
+
 DEFAULT_MODEL_REPO = "UsefulSensors/moonshine-base"
+SAMPLE_RATE = 16000
+
+_CUT_FRAME_S = 0.03
 
 
 class MLXAudioSTTService(SegmentedSTTService):
@@ -26,30 +77,77 @@ class MLXAudioSTTService(SegmentedSTTService):
     Works with any model supported by ``mlx_audio.stt.load()``:
     Moonshine, Whisper-MLX, SenseVoice, etc.
 
-    The caller must pass a ``compute_executor`` — a single-worker
-    ``ThreadPoolExecutor`` shared by every MLX service in the pipeline.
+    The caller must pass a ``compute_executor`` — the single-worker
+    ``GPUScheduler`` shared by every MLX service in the pipeline.
     Metal's command queue is not safe for concurrent encoding across OS
     threads; serializing all MLX work onto one thread is the only way to
     avoid ``A command encoder is already encoding to this command buffer``
     assertions.  Lifecycle of the executor belongs to the caller.
+
+    Alternatively pass a ``worker`` serving an ``MLXSTTEngine``: inference
+    then runs in the worker's process, submitted through its own
+    scheduler, and the service stops the worker on cleanup.
+
+    ``interim_interval_s`` turns on streaming and ``pause_s`` speculation
+    on top of it (see the module docstring); None keeps plain segmented
+    transcription. Speculation outcomes are counted with ``meter``.
     """
 
     def __init__(
         self,
         *,
-        compute_executor: ThreadPoolExecutor,
+        compute_executor: Executor | None = None,
+        worker: ModelWorker | None = None,
         model_repo: str = DEFAULT_MODEL_REPO,
+        interim_interval_s: float | None = None,
+        window_s: float = 6.0,
+        pause_s: float | None = None,
+        meter: metrics.Meter | None = None,
         **kwargs,
     ):
-        super().__init__(sample_rate=16000, **kwargs)
+        if worker is not None:
+            compute_executor = worker.executor
+            model_repo = worker.model_repo
+        elif compute_executor is None:
+            msg = "MLXAudioSTTService needs a compute_executor or a worker"
+            raise ValueError(msg)
+        super().__init__(sample_rate=SAMPLE_RATE, **kwargs)
+        self._worker = worker
         self._executor = compute_executor
+        self._turn_lane = gpu_lane(compute_executor, "stt", Priority.TURN)
+        self._background_lane = gpu_lane(compute_executor, "stt", Priority.BACKGROUND)
         self._model_repo = model_repo
+        self._pcm16 = PCM16Converter()
+
+        bytes_per_s = SAMPLE_RATE * 2
+        self._interim_bytes = (
+            int(interim_interval_s * bytes_per_s) & ~1 if interim_interval_s else 0
+        )
+        self._window_bytes = int(window_s * bytes_per_s) & ~1
+        # Per-utterance streaming state; offsets index ``_audio_buffer``,
+        # which only grows while the user is speaking.
+        self._committed: list[str] = []
+        self._window_start = 0
+        self._next_interim = 0
+        self._utterance = 0
+        self._job: asyncio.Task | None = None
+        self._interim: Future | None = None  # the job's inference, if an interim
+        # Speculation: the last interim as (window start, end, text), and
+        # the end of the audio a pause-triggered interim covered.
+        self._pauses = PauseDetector(pause_s) if pause_s and self.streaming else None
+        self._heard: tuple[int, int, str] | None = None
+        self._speculated: int | None = None
+        self._speculation_metrics = STTSpeculationMetrics(meter)
 
         logger.info(f"Loading STT model: {model_repo}")
         self._model = self._executor.submit(self._load_model).result()
         logger.info("STT model loaded")
 
     def _load_model(self):
+        if self._worker is not None:
+            self._worker.start()
+            return self._worker
+
         from mlx_audio.stt import load
 
         return load(self._model_repo)
@@ -57,14 +155,45 @@ class MLXAudioSTTService(SegmentedSTTService):
     def can_generate_metrics(self) -> bool:
         return True
 
+    @property
+    def streaming(self) -> bool:
+        return self._interim_bytes > 0
+
+    @property
+    def speculates(self) -> bool:
+        return self._pauses is not None
+
     def _transcribe_sync(self, audio_float: np.ndarray) -> str:
         """Run synchronous MLX inference, return transcribed text."""
+        if self._worker is not None:
+            return self._worker.transcribe(audio_float)
+
         import mlx.core as mx
 
         audio_mx = mx.array(audio_float)
         result = self._model.generate(audio_mx)
         return result.text.strip()
 
+    async def _infer(self, audio_float: np.ndarray, lane: Executor) -> str:
+        # ``audio_float`` is the converter's buffer, reused by the next
+        # conversion; callers never overlap, so none starts before this
+        # inference returns.
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            lane, partial(self._transcribe_sync, audio_float)
+        )
+
+    def _submit_buffer(self, start: int, end: int, lane: Executor) -> Future:
+        """Queue inference on ``_audio_buffer[start:end]``; see ``_infer``."""
+        # The view must be released before awaiting: while it exists the
+        # buffer can't grow.
+        with memoryview(self._audio_buffer) as view:
+            audio_float = self._pcm16.from_pcm16(view[start:end])
+        return lane.submit(self._transcribe_sync, audio_float)
+
+    async def _transcribe_buffer(self, start: int, end: int, lane: Executor) -> str:
+        return await asyncio.wrap_future(self._submit_buffer(start, end, lane))
+
     async def run_stt(self, audio: bytes) -> AsyncGenerator[Frame, None]:
         if self._model is None:
             yield ErrorFrame(error="MLX Audio STT model not available")
@@ -72,15 +201,113 @@ class MLXAudioSTTService(SegmentedSTTService):
 
         await self.start_processing_metrics()
 
-        audio_float = np.frombuffer(audio, dtype=np.int16).astype(np.float32) / 32768.0
+        try:
+            # ``audio`` is a WAV file; its header isn't samples.
+            text = await self._infer(
+                self._pcm16.from_pcm16(wav_payload(audio)), self._turn_lane
+            )
+        except Exception as e:
+            logger.error(f"{self} exception: {e}")
+            yield ErrorFrame(error=f"MLX Audio STT error: {e}")
+            return
+        finally:
+            await self.stop_processing_metrics()
+
+        if text:
+            logger.debug(f"Transcription: [{text}]")
+            yield TranscriptionFrame(
+                text=text,
+                user_id=self._user_id,
+                timestamp=time_now_iso8601(),
+                language=None,
+            )
 
-        loop = asyncio.get_event_loop()
-        text = await loop.run_in_executor(
-            self._executor, partial(self._transcribe_sync, audio_float)
-        )
+    # -- streaming ----------------------------------------------------------
 
-        await self.stop_processing_metrics()
+    async def process_audio_frame(
+        self, frame: AudioRawFrame, direction: FrameDirection
+    ):
+        await super().process_audio_frame(frame, direction)
+        if not (self.streaming and self._user_speaking and self._model is not None):
+            return
+        end = len(self._audio_buffer)
+        speculate = False
+        if self._pauses is not None:
+            self._pauses.feed(frame.audio, end, SAMPLE_RATE)
+            if (
+                self._speculated is not None
+                and self._pauses.voiced_end > self._speculated
+            ):
+                self._speculated = None  # speech resumed
+                self._speculation_metrics.speculation("discarded")
+            speculate = self._pauses.paused and self._speculated is None
+        if self._job is None and (speculate or end >= self._next_interim):
+            if speculate:
+                self._speculated = end
+            self._next_interim = end + self._interim_bytes
+            self._job = self.create_task(
+                self._advance(self._utterance), name="stt_interim"
+            )
+
+    async def _handle_user_started_speaking(self, frame: VADUserStartedSpeakingFrame):
+        await super()._handle_user_started_speaking(frame)
+        self._utterance += 1
+        self._committed = []
+        self._window_start = 0
+        self._next_interim = len(self._audio_buffer) + self._interim_bytes
+        self._heard = None
+        self._speculated = None
+        if self._pauses is not None:
+            self._pauses.reset()
+
+    async def _handle_user_stopped_speaking(self, frame: VADUserStoppedSpeakingFrame):
+        if not self.streaming or self._model is None:
+            await super()._handle_user_stopped_speaking(frame)
+            return
+        self._user_speaking = False
+        if self._job is not None:
+            # A commit in flight is part of this utterance's transcript. An
+            # interim still queued behind other GPU work is dropped — the
+            # final pass covers its audio; one already running is waited
+            # out, as it reads the buffer the final pass converts into.
+            if self._interim is not None:
+                self._interim.cancel()
+            await asyncio.wait({self._job})
+        await self.process_generator(self._finish())
 
+    def _heard_to_the_end(self) -> str | None:
+        """The last interim's text if only quiet has been heard since."""
+        if self._pauses is None or self._heard is None:
+            return None
+        start, end, text = self._heard
+        if start != self._window_start or not 0 < self._pauses.voiced_end <= end:
+            return None
+        return text
+
+    async def _finish(self) -> AsyncGenerator[Frame, None]:
+        tail = self._heard_to_the_end()
+        if tail is not None:
+            self._speculation_metrics.speculation("used")
+        else:
+            await self.start_processing_metrics()
+            try:
+                tail = await self._transcribe_buffer(
+                    self._window_start, len(self._audio_buffer), self._turn_lane
+                )
+            except Exception as e:
+                # The turn is lost, but the next one starts from a clean slate.
+                logger.error(f"{self} exception: {e}")
+                yield ErrorFrame(error=f"MLX Audio STT error: {e}")
+                tail = ""
+                self._committed = []
+            await self.stop_processing_metrics()
+
+        text = " ".join(t for t in (*self._committed, tail) if t)
+        self._audio_buffer.clear()
+        self._committed = []
+        self._window_start = 0
+        self._heard = None
+        self._speculated = None
         if text:
             logger.debug(f"Transcription: [{text}]")
             yield TranscriptionFrame(
@@ -89,3 +316,57 @@ class MLXAudioSTTService(SegmentedSTTService):
                 timestamp=time_now_iso8601(),
                 language=None,
             )
+
+    async def _advance(self, utterance: int) -> None:
+        """Commit the head of the open window if it's full, else push an interim."""
+        try:
+            start, end = self._window_start, len(self._audio_buffer)
+            if end - start >= self._window_bytes:
+                cut = self._quietest_cut(start, end)
+                text = await self._transcribe_buffer(start, cut, self._background_lane)
+                if utterance == self._utterance:
+                    self._committed.append(text)
+                    self._window_start = cut
+                return
+            self._interim = self._submit_buffer(start, end, self._background_lane)
+            text = await asyncio.wrap_future(self._interim)
+            if utterance != self._utterance:
+                return
+            self._heard = (start, end, text)
+            if self._user_speaking:
+                heard = " ".join(t for t in (*self._committed, text) if t)
+                if heard:
+                    await self.push_frame(
+                        InterimTranscriptionFrame(
+                            text=heard,
+                            user_id=self._user_id,
+                            timestamp=time_now_iso8601(),
+                            language=None,
+                        )
+                    )
+        except Exception as e:
+            logger.warning(f"{self}: interim transcription failed: {e}")
+        finally:
+            self._job = None
+            self._interim = None
+
+    def _quietest_cut(self, start: int, end: int) -> int:
+        """Byte offset mid-way through the quietest 30 ms of the window's second half."""
+        frame = int(_CUT_FRAME_S * SAMPLE_RATE)
+        mid = (start + end) // 2 & ~1
+        with memoryview(self._audio_buffer) as view:
+            search = np.frombuffer(view[mid:end], dtype=np.int16)
+            frames = search[: search.size // frame * frame].reshape(-1, frame)
+            energy = np.square(frames, dtype=np.float32).sum(axis=1)
+            del search, frames
+        if energy.size == 0:
+            return end
+        return mid + (int(np.argmin(energy)) * frame + frame // 2) * 2
+
+    async def cleanup(self):
+        await super().cleanup()
+        if self._job is not None:
+            await self.cancel_task(self._job)
+            self._job = None
+        if self._worker is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self._worker.stop)
@@ -0,0 +1,334 @@
+"""Content-addressed cache of synthesized speech for repeated phrases.
+
+Agents say the same short things over and over ("Sure.", "Could you repeat
+that?", a PAK's greeting). ``cache_tts`` wraps any Pipecat ``TTSService``'s
+``run_tts`` so that a phrase it has synthesized before is served from the
+cache instead: the first audio frame is out as soon as the lookup returns.
+
+The key is a SHA-256 of everything that changes the audio: provider, the
+service's settings (model, voice, language, speed, ...), its output sample
+rate and the text with whitespace collapsed. The cache is off unless
+``pipeline.tts.cache.enabled`` is set. Entries are the
+``TTSAudioRawFrame`` payloads exactly as the service produced them, so a
+hit replays the same segments.
+
+Two tiers: an in-memory LRU bounded by ``max_bytes``, and an optional
+directory that survives restarts (files are read and written off the event
+loop). Only texts up to ``max_chars`` are cached — long, one-off LLM
+sentences would just churn the LRU — and only syntheses that finished
+without an error and weren't interrupted. Lookups are counted in
+``paty.metrics.tts.TTSCacheMetrics``.
+
+``prewarm`` fills the cache ahead of time, e.g. with the phrases a PAK
+declares in ``voice.phrases``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import hashlib
+import os
+import struct
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from opentelemetry import metrics
+from pipecat.frames.frames import ErrorFrame, Frame, TTSAudioRawFrame
+
+from paty.config.schema import TTSCacheConfig
+from paty.metrics.tts import TTSCacheMetrics
+
+MAX_BYTES = 32 * 1024 * 1024
+MAX_CHARS = 120
+
+# Disk entry: magic, sample rate, channels, segment count, then one u32
+# length per segment, then the segments' PCM back to back.
+_MAGIC = b"PTTS"
+_HEADER = struct.Struct("<4sIHI")
+_LENGTH = struct.Struct("<I")
+
+
+@dataclass(frozen=True)
+class CachedAudio:
+    sample_rate: int
+    num_channels: int
+    segments: tuple[bytes, ...]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(s) for s in self.segments)
+
+    def pack(self) -> bytes:
+        header = _HEADER.pack(
+            _MAGIC, self.sample_rate, self.num_channels, len(self.segments)
+        )
+        lengths = b"".join(_LENGTH.pack(len(s)) for s in self.segments)
+        return header + lengths + b"".join(self.segments)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> CachedAudio | None:
+        if len(data) < _HEADER.size:
+            return None
+        magic, sample_rate, channels, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            return None
+        pos = _HEADER.size
+        lengths = [
+            _LENGTH.unpack_from(data, pos + i * _LENGTH.size)[0] for i in range(count)
+        ]
+        pos += count * _LENGTH.size
+        if pos + sum(lengths) != len(data):
+            return None  # truncated or foreign file
+        segments = []
+        for n in lengths:
+            segments.append(data[pos : pos + n])
+            pos += n
+        return cls(sample_rate, channels, tuple(segments))
+
+
+class TTSCache:
+    """Memory LRU of synthesized phrases, optionally backed by a directory."""
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = MAX_BYTES,
+        max_chars: int = MAX_CHARS,
+        directory: str | Path | None = None,
+        meter: metrics.Meter | None = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.directory = Path(directory).expanduser() if directory else None
+        self._entries: OrderedDict[str, CachedAudio] = OrderedDict()
+        self._nbytes = 0
+        self._metrics = TTSCacheMetrics(meter)
+
+    @classmethod
+    def from_config(
+        cls, config: TTSCacheConfig, meter: metrics.Meter | None = None
+    ) -> TTSCache:
+        return cls(
+            max_bytes=config.max_mb * 1024 * 1024,
+            max_chars=config.max_chars,
+            directory=config.dir,
+            meter=meter,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(
+        self, provider: str, service: Any, text: str, sample_rate: int | None = None
+    ) -> str | None:
+        """The cache key for ``text`` on ``service``, or None if uncacheable.
+
+        ``sample_rate`` defaults to the service's output rate.
+        """
+        text = " ".join(text.split())
+        if not text or len(text) > self.max_chars:
+            return None
+        settings = getattr(service, "_settings", None)
+        if dataclasses.is_dataclass(settings):
+            settings = dataclasses.asdict(settings)
+        parts = (
+            provider,
+            repr(settings),
+            repr(getattr(service, "_speed", None)),
+            repr(getattr(service, "_lang_code", None)),
+            str(sample_rate or service.sample_rate),
+            text,
+        )
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    async def get(self, key: str) -> CachedAudio | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._metrics.lookup("memory")
+            return entry
+        if self.directory is not None:
+            entry = await asyncio.to_thread(self._read, key)
+            if entry is not None:
+                self._remember(key, entry)
+                self._metrics.lookup("disk")
+                return entry
+        self._metrics.lookup("miss")
+        return None
+
+    async def put(self, key: str, entry: CachedAudio) -> None:
+        self._remember(key, entry)
+        if self.directory is not None:
+            try:
+                await asyncio.to_thread(self._write, key, entry)
+            except OSError as e:
+                logger.warning(f"tts cache: could not write {key[:12]}: {e}")
+
+    def _remember(self, key: str, entry: CachedAudio) -> None:
+        if entry.nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._nbytes -= old.nbytes
+        self._entries[key] = entry
+        self._nbytes += entry.nbytes
+        while self._nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+
+    def contains(self, key: str) -> bool:
+        """Whether ``key`` is cached in either tier (not counted as a lookup)."""
+        if key in self._entries:
+            return True
+        return self.directory is not None and self._path(key).is_file()
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / f"{key}.pcm"
+
+    def _read(self, key: str) -> CachedAudio | None:
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            return None
+        return CachedAudio.unpack(data)
+
+    def _write(self, key: str, entry: CachedAudio) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(entry.pack())
+        os.replace(tmp, path)  # readers never see a partial entry
+
+
+class _CachedRun:
+    """Stands in for a service's ``run_tts``; see :func:`cache_tts`."""
+
+    def __init__(self, service: Any, cache: TTSCache, provider: str) -> None:
+        self.service = service
+        self.cache = cache
+        self.provider = provider
+        self.synthesize = service.run_tts
+        self.interruptions = 0
+        self._handle_interruption = service._handle_interruption
+
+    async def handle_interruption(self, frame: Any, direction: Any) -> None:
+        # Pipecat can't always cancel the consumer of ``run_tts`` (e.g. while
+        # an uninterruptible frame is processed), so a service may end an
+        # interrupted synthesis as if it had finished; count interruptions
+        # so ``_fill`` can tell.
+        self.interruptions += 1
+        await self._handle_interruption(frame, direction)
+
+    async def __call__(
+        self, text: str, context_id: str
+    ) -> AsyncGenerator[Frame | None, None]:
+        key = self.cache.key(self.provider, self.service, text)
+        if key is None:
+            async with contextlib.aclosing(self.synthesize(text, context_id)) as frames:
+                async for frame in frames:
+                    yield frame
+            return
+
+        hit = await self.cache.get(key)
+        if hit is not None:
+            await self.service.stop_ttfb_metrics()
+            for segment in hit.segments:
+                yield TTSAudioRawFrame(
+                    audio=segment,
+                    sample_rate=hit.sample_rate,
+                    num_channels=hit.num_channels,
+                    context_id=context_id,
+                )
+            return
+
+        async with contextlib.aclosing(self._fill(key, text, context_id)) as frames:
+            async for frame in frames:
+                yield frame
+
+    async def _fill(
+        self, key: str, text: str, context_id: str, sample_rate: int | None = None
+    ) -> AsyncGenerator[Frame | None, None]:
+        """Synthesize ``text``, passing frames through, and cache the result.
+
+        With ``sample_rate``, audio at any other rate is not cached.
+        """
+        segments: list[bytes] = []
+        fmt: tuple[int, int] | None = None
+        cacheable = True
+        interruptions = self.interruptions
+        async with contextlib.aclosing(self.synthesize(text, context_id)) as frames:
+            async for frame in frames:
+                if isinstance(frame, TTSAudioRawFrame):
+                    if fmt is None:
+                        fmt = (frame.sample_rate, frame.num_channels)
+                    cacheable = cacheable and fmt == (
+                        frame.sample_rate,
+                        frame.num_channels,
+                    )
+                    segments.append(frame.audio)
+                elif frame is None or isinstance(frame, ErrorFrame):
+                    cacheable = False
+                yield frame
+        # Only reached if the consumer took every frame, but the service may
+        # still have stopped early for an interruption.
+        if interruptions != self.interruptions:
+            cacheable = False
+        if sample_rate and fmt is not None and fmt[0] != sample_rate:
+            cacheable = False
+        if cacheable and fmt is not None:
+            await self.cache.put(key, CachedAudio(*fmt, tuple(segments)))
+
+    async def prewarm(self, phrases: Iterable[str], sample_rate: int) -> int:
+        # Before the pipeline starts the service has no output rate yet, so
+        # key by the one it will run at; audio it makes at another rate
+        # isn't kept.
+        synthesized = 0
+        for n, text in enumerate(phrases):
+            key = self.cache.key(self.provider, self.service, text, sample_rate)
+            if key is None or self.cache.contains(key):
+                continue
+            async for _ in self._fill(key, text, f"prewarm-{n}", sample_rate):
+                pass
+            if self.cache.contains(key):
+                synthesized += 1
+        return synthesized
+
+
+def cache_tts(service: Any, cache: TTSCache, *, provider: str) -> Any:
+    """Serve ``service``'s repeated phrases from ``cache``; returns ``service``.
+
+    Works for services whose ``run_tts`` yields ``TTSAudioRawFrame``\\ s (the
+    HTTP and in-process ones). Services that deliver audio out of band
+    (WebSocket services yield ``None``) are passed through uncached. Also
+    wraps ``_handle_interruption``, so a synthesis interrupted while its
+    frames were still being consumed is not cached.
+    """
+    run = _CachedRun(service, cache, provider)
+    service.run_tts = run
+    service._handle_interruption = run.handle_interruption
+    return service
+
+
+async def prewarm(service: Any, phrases: Iterable[str], *, sample_rate: int) -> int:
+    """Synthesize ``phrases`` into ``service``'s cache ahead of the first turn.
+
+    ``sample_rate`` is the pipeline's output rate. Phrases already cached
+    (e.g. on disk from an earlier run) are skipped, and prewarming is not
+    counted as cache lookups. Returns how many phrases were synthesized; 0
+    if ``service`` has no cache.
+    """
+    run = getattr(service, "run_tts", None)
+    if not isinstance(run, _CachedRun):
+        return 0
+    return await run.prewarm(phrases, sample_rate)
@@ -1,21 +1,31 @@
-"""In-process Kokoro TTS via mlx-audio for Apple Silicon."""
+"""Kokoro TTS via mlx-audio for Apple Silicon, in-process or in a worker."""
 
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncGenerator
-from concurrent.futures import ThreadPoolExecutor
+import contextlib
+from collections.abc import AsyncGenerator, Iterator
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from functools import partial
 
-import numpy as np
 from loguru import logger
 from pipecat.audio.utils import create_stream_resampler
-from pipecat.frames.frames import ErrorFrame, Frame, TTSAudioRawFrame
+from pipecat.frames.frames import (
+    ErrorFrame,
+    Frame,
+    InterruptionFrame,
+    TTSAudioRawFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.settings import TTSSettings
 from pipecat.services.tts_service import TTSService
 from pipecat.utils.tracing.service_decorators import traced_tts
 
+from paty.runtime.audio import PCM16Converter, resample_pcm16
+from paty.runtime.gpu_executor import Priority, gpu_lane
+from paty.runtime.workers import ModelWorker
+
 # Default HuggingFace model repo for Kokoro
 DEFAULT_MODEL_REPO = "mlx-community/Kokoro-82M-bf16"
 DEFAULT_VOICE = "af_bella"
@@ -33,11 +43,31 @@ class MLXAudioTTSService(TTSService):
     Models are auto-downloaded from HuggingFace on first use and cached
     in ~/.cache/huggingface/.
 
-    The caller must pass a ``compute_executor`` — a single-worker
-    ``ThreadPoolExecutor`` shared with every other MLX service in the
+    The caller must pass a ``compute_executor`` — the single-worker
+    ``GPUScheduler`` shared with every other MLX service in the
     pipeline.  Both model load and inference (including the lazy Kokoro
     pipeline / misaki / espeak-ng setup triggered on first call) run on
     that thread.  See ``paty.runtime.gpu_executor`` for the rationale.
+
+    Kokoro generates an utterance segment by segment.  ``run_tts`` steps
+    that generator one segment per executor call and yields each segment's
+    audio as soon as it exists, so TTFB is the first segment's synthesis
+    time, other MLX work can run between segments (a finished user turn's
+    transcription goes first), and an interrupted utterance stops
+    synthesizing.
+
+    Interruption normally cancels the task consuming ``run_tts``, and with
+    it the queued next step.  Pipecat leaves the processing of an
+    ``UninterruptibleFrame`` running, though (``EndFrame`` flushes the
+    remaining text), so ``run_tts`` also checks between segments whether
+    an ``InterruptionFrame`` has arrived since it started.  Either way the
+    GPU is given up once the segment being synthesized is done.
+
+    Alternatively pass a ``worker`` serving an ``MLXTTSEngine``: Kokoro
+    then runs in the worker's process, concurrently with STT, and each
+    segment's PCM comes back through shared memory. Stepping and
+    interruption work as above, through the worker's own scheduler, and
+    the service stops the worker on cleanup.
     """
 
     Settings = MLXAudioTTSSettings
@@ -46,7 +76,8 @@ class MLXAudioTTSService(TTSService):
     def __init__(
         self,
         *,
-        compute_executor: ThreadPoolExecutor,
+        compute_executor: Executor | None = None,
+        worker: ModelWorker | None = None,
         model_repo: str = DEFAULT_MODEL_REPO,
         voice: str = DEFAULT_VOICE,
         speed: float = 1.0,
@@ -54,6 +85,12 @@ class MLXAudioTTSService(TTSService):
         settings: MLXAudioTTSSettings | None = None,
         **kwargs,
     ):
+        if worker is not None:
+            compute_executor = worker.executor
+            model_repo = worker.model_repo
+        elif compute_executor is None:
+            msg = "MLXAudioTTSService needs a compute_executor or a worker"
+            raise ValueError(msg)
         default_settings = self.Settings(
             model=model_repo,
             voice=voice,
@@ -69,17 +106,24 @@ class MLXAudioTTSService(TTSService):
             **kwargs,
         )
 
+        self._worker = worker
         self._model_repo = model_repo
         self._speed = speed
         self._lang_code = lang_code
         self._resampler = create_stream_resampler()
-        self._executor = compute_executor
+        self._pcm16 = PCM16Converter()
+        self._executor = gpu_lane(compute_executor, "tts", Priority.SPEECH)
+        self._interruptions = 0
 
         logger.info(f"Loading TTS model: {self._model_repo}")
         self._model = self._executor.submit(self._load_model).result()
         logger.info("TTS model loaded")
 
     def _load_model(self):
+        if self._worker is not None:
+            self._worker.start()
+            return self._worker
+
         from mlx_audio.tts.utils import load_model
 
         return load_model(self._model_repo)
@@ -87,43 +131,56 @@ class MLXAudioTTSService(TTSService):
     def can_generate_metrics(self) -> bool:
         return True
 
-    def _generate_sync(self, text: str) -> list[tuple[bytes, int]]:
-        """Run synchronous MLX inference, return list of (pcm_bytes, sample_rate)."""
-        chunks = []
-        for result in self._model.generate(
-            text=text,
-            voice=self._settings.voice or DEFAULT_VOICE,
-            speed=self._speed,
-            lang_code=self._lang_code,
-        ):
-            audio_np = np.array(result.audio).flatten()
-            audio_int16 = (audio_np * 32767).astype(np.int16).tobytes()
+    def _generate_sync(self, text: str) -> Iterator[tuple[memoryview, int]]:
+        """Lazily run MLX inference, yielding (pcm, sample_rate) per segment.
+
+        The body runs on whichever thread calls ``next`` — only ever the
+        compute executor's. ``pcm`` is a view of ``self._pcm16``'s buffer
+        (or the worker's shared memory), so it must be consumed before the
+        next segment is requested.
+        """
+        kwargs = {
+            "text": text,
+            "voice": self._settings.voice or DEFAULT_VOICE,
+            "speed": self._speed,
+            "lang_code": self._lang_code,
+        }
+        if self._worker is not None:
+            yield from self._worker.synthesize(**kwargs)
+            return
+        for result in self._model.generate(**kwargs):
             sample_rate = getattr(result, "sample_rate", DEFAULT_SAMPLE_RATE)
-            chunks.append((audio_int16, sample_rate))
-        return chunks
+            yield self._pcm16.to_pcm16(result.audio), sample_rate
 
     @traced_tts
     async def run_tts(self, text: str, context_id: str) -> AsyncGenerator[Frame, None]:
         """Synthesize speech from text using mlx-audio."""
         logger.debug(f"{self}: Generating TTS [{text}]")
 
+        segments = self._generate_sync(text)
+        interruptions = self._interruptions
         try:
             await self.start_tts_usage_metrics(text)
 
             loop = asyncio.get_event_loop()
-            chunks = await loop.run_in_executor(
-                self._executor, partial(self._generate_sync, text)
-            )
-
-            for audio_bytes, in_sample_rate in chunks:
+            while interruptions == self._interruptions:
+                chunk = await loop.run_in_executor(
+                    self._executor, partial(next, segments, None)
+                )
+                if chunk is None or interruptions != self._interruptions:
+                    break
+                pcm, in_sample_rate = chunk
                 await self.stop_ttfb_metrics()
 
-                audio_data = await self._resampler.resample(
-                    audio_bytes, in_sample_rate, self.sample_rate
+                # No output rate before StartFrame (e.g. cache pre-warming):
+                # keep the model's.
+                out_sample_rate = self.sample_rate or in_sample_rate
+                audio_data = await resample_pcm16(
+                    self._resampler, pcm, in_sample_rate, out_sample_rate
                 )
                 yield TTSAudioRawFrame(
                     audio=audio_data,
-                    sample_rate=self.sample_rate,
+                    sample_rate=out_sample_rate,
                     num_channels=1,
                     context_id=context_id,
                 )
@@ -131,4 +188,19 @@ class MLXAudioTTSService(TTSService):
             logger.error(f"{self} exception: {e}")
             yield ErrorFrame(error=f"MLX Audio TTS error: {e}")
         finally:
+            # Unwinds the model's generator if we stopped early (e.g. an
+            # interruption closed this one), on the thread that ran it.
+            with contextlib.suppress(RuntimeError):  # executor shut down
+                self._executor.submit(segments.close)
             await self.stop_ttfb_metrics()
+
+    async def _handle_interruption(
+        self, frame: InterruptionFrame, direction: FrameDirection
+    ):
+        self._interruptions += 1
+        await super()._handle_interruption(frame, direction)
+
+    async def cleanup(self):
+        await super().cleanup()
+        if self._worker is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self._worker.stop)
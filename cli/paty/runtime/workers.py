@@ -0,0 +1,410 @@
+"""Run an MLX model in its own process, with audio in shared memory.
+
+In-process, STT and TTS share one GPU thread (``paty.runtime.gpu_executor``)
+because Metal can't take work from two threads of one process: they never
+run at the same time, and a model that crashes takes the pipeline with it.
+A ``ModelWorker`` instead serves one model from a dedicated child process,
+which has a Metal queue of its own:
+
+- STT and TTS workers run concurrently; each service talks to its worker
+  from its own single-thread scheduler (``ModelWorker.executor``), so its
+  lanes, priorities and cancellation work as before.
+- Audio doesn't go through the control pipe: STT input (float32) and TTS
+  output (PCM16) are written into ``ShmRing``\\ s, shared-memory byte rings,
+  and only ``(offset, length)`` is sent. A payload the ring has no room
+  for goes inline instead.
+- If the worker dies, the call in flight raises ``WorkerCrashedError`` — the
+  services turn that into an error frame — and the next call starts a new
+  worker, reloading the model.
+
+Workers are started with ``spawn`` (Metal doesn't survive ``fork``) and
+only import NumPy and the model's own packages. What a worker runs is an
+*engine*: a class built from the model repo, with ``transcribe(audio)`` for
+STT or ``generate(**kwargs)`` yielding ``(float audio, sample_rate)`` for
+TTS — ``MLXSTTEngine`` and ``MLXTTSEngine`` here.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import multiprocessing
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from paty.runtime.audio import PCM16Converter
+
+if TYPE_CHECKING:
+    from opentelemetry import metrics
+
+# Room for ~16 s of float32 STT input at 16 kHz, or ~90 s of 24 kHz PCM16.
+DEFAULT_RING_BYTES = 1 << 21
+_STOP_TIMEOUT_S = 5.0
+
+
+class WorkerCrashedError(RuntimeError):
+    """The worker process exited mid-call; the next call starts a new one."""
+
+
+class ShmRing:
+    """A byte ring in shared memory, written by one process, read by another.
+
+    Only the writer allocates. ``write`` returns ``(offset, end)``, ``end``
+    being the ring's cumulative write position after the data; the writer
+    is told how far the reader is done (its *released* position, sent back
+    over the control pipe) and never allocates over anything before that. A
+    region never wraps: one that doesn't fit before the end of the buffer
+    starts at 0, and the skipped tail counts as used.
+    """
+
+    def __init__(self, size: int, name: str | None = None) -> None:
+        if name is None:
+            self._shm = SharedMemory(create=True, size=size)
+        else:
+            # Spawned workers share the creator's resource tracker, so the
+            # registration that attaching makes (before 3.13) is the
+            # creator's own, already there: leave it, or the creator's
+            # unlink fails and a crashed creator leaks the segment.
+            if sys.version_info >= (3, 13):
+                self._shm = SharedMemory(name=name, track=False)
+            else:
+                self._shm = SharedMemory(name=name)
+        self._owner = name is None
+        # Not ``_shm.size``: attaching may see it rounded up to a page.
+        self.size = size
+        self.name = self._shm.name
+        self._head = 0
+
+    def write(self, data: memoryview, released: int) -> tuple[int, int] | None:
+        """Copy ``data`` in; ``(offset, end)``, or None if it doesn't fit."""
+        data = data.cast("B")
+        nbytes = data.nbytes
+        pos = self._head % self.size
+        start = (
+            self._head if pos + nbytes <= self.size else self._head - pos + self.size
+        )
+        end = start + nbytes
+        if end - released > self.size:
+            return None
+        offset = start % self.size
+        self._shm.buf[offset : offset + nbytes] = data
+        self._head = end
+        return offset, end
+
+    @property
+    def head(self) -> int:
+        """The cumulative write position: the end of the last region."""
+        return self._head
+
+    def view(self, offset: int, nbytes: int) -> memoryview:
+        return self._shm.buf[offset : offset + nbytes]
+
+    def close(self) -> None:
+        # A consumer may still hold a view; the mapping then goes with the
+        # process.
+        with contextlib.suppress(BufferError):
+            self._shm.close()
+        if self._owner:
+            with contextlib.suppress(FileNotFoundError):
+                self._shm.unlink()
+
+
+class _Releases:
+    """Turns regions finished with in any order into a released position."""
+
+    def __init__(self) -> None:
+        self.position = 0
+        self._held: deque[int] = deque()
+        self._done: set[int] = set()
+
+    def hold(self, end: int) -> None:
+        self._held.append(end)
+
+    def done(self, end: int) -> None:
+        self._done.add(end)
+        while self._held and self._held[0] in self._done:
+            self.position = self._held.popleft()
+            self._done.discard(self.position)
+
+
+class MLXSTTEngine:
+    """mlx-audio STT, as run inside a worker."""
+
+    def __init__(self, model_repo: str) -> None:
+        from mlx_audio.stt import load
+
+        self._model = load(model_repo)
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        import mlx.core as mx
+
+        return self._model.generate(mx.array(audio)).text.strip()
+
+
+class MLXTTSEngine:
+    """mlx-audio TTS (Kokoro), as run inside a worker."""
+
+    def __init__(self, model_repo: str) -> None:
+        from mlx_audio.tts.utils import load_model
+
+        self._model = load_model(model_repo)
+
+    def generate(self, **kwargs: Any) -> Iterator[tuple[np.ndarray, int]]:
+        for result in self._model.generate(**kwargs):
+            yield result.audio, getattr(result, "sample_rate", 24000)
+
+
+def _serve(
+    conn: Connection,
+    engine_factory: Callable[[str], Any],
+    model_repo: str,
+    rings: tuple[str, str, int],
+) -> None:
+    """Worker main loop: one request in, one ``(status, value)`` reply out."""
+    inbox_name, outbox_name, ring_bytes = rings
+    inbox = ShmRing(ring_bytes, name=inbox_name)
+    outbox = ShmRing(ring_bytes, name=outbox_name)
+    try:
+        engine = engine_factory(model_repo)
+    except Exception as e:
+        conn.send(("error", f"loading {model_repo}: {e!r}"))
+        return
+    conn.send(("ok", None))
+
+    pcm16 = PCM16Converter()
+    streams: dict[int, Iterator[tuple[np.ndarray, int]]] = {}
+
+    def transcribe(payload: tuple[int, int] | bytes) -> str:
+        data = inbox.view(*payload) if isinstance(payload, tuple) else payload
+        return engine.transcribe(np.frombuffer(data, dtype=np.float32))
+
+    def step(stream: int, released: int) -> tuple[int, Any] | None:
+        item = next(streams[stream], None)
+        if item is None:
+            del streams[stream]
+            return None
+        audio, sample_rate = item
+        pcm = pcm16.to_pcm16(audio)
+        region = outbox.write(pcm, released)
+        if region is None:
+            return sample_rate, bytes(pcm)
+        offset, end = region
+        return sample_rate, (offset, pcm.nbytes, end)
+
+    def close(stream: int) -> None:
+        segments = streams.pop(stream, None)
+        if segments is not None and hasattr(segments, "close"):
+            segments.close()
+
+    try:
+        while True:
+            try:
+                op, *args = conn.recv()
+            except EOFError:
+                break
+            if op == "stop":
+                break
+            try:
+                if op == "transcribe":
+                    value = transcribe(*args)
+                elif op == "open":
+                    stream, kwargs = args
+                    streams[stream] = iter(engine.generate(**kwargs))
+                    value = None
+                elif op == "next":
+                    value = step(*args)
+                elif op == "close":
+                    value = close(*args)
+                else:
+                    msg = f"unknown op {op!r}"
+                    raise ValueError(msg)
+            except Exception as e:
+                conn.send(("error", repr(e)))
+            else:
+                conn.send(("ok", value))
+    finally:
+        streams.clear()
+        inbox.close()
+        outbox.close()
+
+
+class ModelWorker:
+    """A model served from its own process.
+
+    ``engine`` is a picklable callable (a module-level class, say) that the
+    worker calls with ``model_repo`` to load the model. Calls block until
+    the worker replies, one at a time; make them on ``executor``, the
+    client's own single-thread scheduler, which records its queue waits
+    with ``meter``.
+    """
+
+    def __init__(
+        self,
+        engine: Callable[[str], Any],
+        model_repo: str,
+        *,
+        name: str = "paty-worker",
+        ring_bytes: int = DEFAULT_RING_BYTES,
+        meter: metrics.Meter | None = None,
+    ) -> None:
+        # Here, not at module level: spawned workers import this module and
+        # shouldn't pull in OpenTelemetry.
+        from paty.runtime.gpu_executor import GPUScheduler
+
+        self.engine = engine
+        self.model_repo = model_repo
+        self.name = name
+        self.ring_bytes = ring_bytes
+        self.executor = GPUScheduler(meter)
+        self._lock = threading.Lock()
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._conn: Connection | None = None
+        self._inbox: ShmRing | None = None
+        self._outbox: ShmRing | None = None
+        self._inbox_released = 0
+        self._outbox_releases = _Releases()
+        self._streams = itertools.count()
+        self.starts = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self) -> None:
+        """Start the worker and wait for its model to load."""
+        with self._lock:
+            self._start()
+
+    def _start(self) -> None:
+        if self._process is not None:
+            return
+        ctx = multiprocessing.get_context("spawn")
+        self._inbox = ShmRing(self.ring_bytes)
+        self._outbox = ShmRing(self.ring_bytes)
+        self._inbox_released = 0
+        self._outbox_releases = _Releases()
+        conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=_serve,
+            args=(
+                child_conn,
+                self.engine,
+                self.model_repo,
+                (self._inbox.name, self._outbox.name, self.ring_bytes),
+            ),
+            name=self.name,
+            daemon=True,
+        )
+        process.start()
+        # Only the child may hold its end, or a crash never reads as EOF.
+        child_conn.close()
+        self._process, self._conn = process, conn
+        self.starts += 1
+        try:
+            status, value = conn.recv()
+        except (EOFError, OSError) as e:
+            self._reap()
+            msg = f"{self.name} exited while loading {self.model_repo}"
+            raise WorkerCrashedError(msg) from e
+        if status != "ok":
+            self._reap()
+            msg = f"{self.name}: {value}"
+            raise RuntimeError(msg)
+
+    def _call(self, *request: Any) -> Any:
+        with self._lock:
+            self._start()
+            return self._request(request)
+
+    def _request(self, request: tuple) -> Any:
+        try:
+            self._conn.send(request)
+            status, value = self._conn.recv()
+        except (EOFError, OSError) as e:
+            code = self._process.exitcode if self._process else None
+            self._reap()
+            msg = f"{self.name} exited (code {code}) during {request[0]!r}"
+            raise WorkerCrashedError(msg) from e
+        if status != "ok":
+            msg = f"{self.name}: {value}"
+            raise RuntimeError(msg)
+        return value
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        """Run the engine's ``transcribe`` on float32 ``audio``."""
+        data = memoryview(np.ascontiguousarray(audio, dtype=np.float32)).cast("B")
+        with self._lock:
+            self._start()
+            region = self._inbox.write(data, self._inbox_released)
+            if region is None:
+                # Nothing of ours is in the ring once a reply is back.
+                self._inbox_released = self._inbox.head
+                return self._request(("transcribe", bytes(data)))
+            offset, end = region
+            try:
+                return self._request(("transcribe", (offset, data.nbytes)))
+            finally:
+                # One call at a time: replied to or failed, the worker is
+                # done with everything before.
+                self._inbox_released = end
+
+    def synthesize(self, **kwargs: Any) -> Iterator[tuple[memoryview, int]]:
+        """Step the engine's ``generate``: ``(pcm16, sample_rate)`` per segment.
+
+        Each ``pcm16`` is valid until the next segment is requested or the
+        stream closes.
+        """
+        stream = next(self._streams)
+        self._call("open", stream, kwargs)
+        starts = self.starts
+        held: int | None = None
+        try:
+            while True:
+                if held is not None:
+                    self._outbox_releases.done(held)
+                    held = None
+                segment = self._call("next", stream, self._outbox_releases.position)
+                if segment is None:
+                    return
+                sample_rate, audio = segment
+                if isinstance(audio, tuple):
+                    offset, nbytes, held = audio
+                    self._outbox_releases.hold(held)
+                    audio = self._outbox.view(offset, nbytes)
+                yield memoryview(audio), sample_rate
+        finally:
+            if held is not None:
+                self._outbox_releases.done(held)
+            if self.starts == starts and self.alive:
+                # A restarted worker never heard of this stream.
+                with contextlib.suppress(RuntimeError):
+                    self._call("close", stream)
+
+    def _reap(self) -> None:
+        if self._process is not None:
+            self._process.join(timeout=_STOP_TIMEOUT_S)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        for ring in (self._inbox, self._outbox):
+            if ring is not None:
+                ring.close()
+        self._process = self._conn = self._inbox = self._outbox = None
+
+    def stop(self) -> None:
+        """Stop the worker process and the client's scheduler."""
+        with self._lock:
+            if self._conn is not None:
+                with contextlib.suppress(OSError):
+                    self._conn.send(("stop",))
+            self._reap()
+        self.executor.shutdown(wait=False, cancel_futures=True)
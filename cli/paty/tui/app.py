@@ -16,12 +16,20 @@ from rich.console import Console
 from rich.layout import Layout
 from rich.live import Live
 
-from paty.bus.codec import unpack_audio_frame
+from paty.bus.codec import is_audio_frame, unpack_audio_frame
+from paty.bus.encoding import SUBPROTOCOLS, Encoding, decode_event
+from paty.bus.levels import unpack_levels
+from paty.bus.server import resume_url
 from paty.tui.conversation import Conversation
 from paty.tui.layout import build_layout
 from paty.tui.theme import DAY, Theme, next_theme
 from paty.tui.widgets.avatar import render_avatar
-from paty.tui.widgets.equalizer import EQ_CHANNELS, compute_levels, render_equalizer
+from paty.tui.widgets.equalizer import (
+    EQ_CHANNELS,
+    compute_levels,
+    merge_levels,
+    render_equalizer,
+)
 from paty.tui.widgets.input import input_height, render_input
 from paty.tui.widgets.transcript import render_transcript
 
@@ -34,6 +42,26 @@ _CLEARING_REPEAT_S = 0.15
 # Long enough to bridge between words; short enough to drop back to idle
 # when the user stops to think.
 _TYPING_HOLD_S = 0.6
+# Event types `_dispatch` renders; everything else is filtered server-side.
+_SUBSCRIBED_EVENTS = [
+    "session.started",
+    "user.transcript",
+    "agent.response",
+    "state.changed",
+    "input.muted",
+]
+# The equalizer only needs band levels, and redraws comfortably at 25 Hz;
+# asking the bus for 40 ms level frames instead of raw 10-20 ms PCM cuts
+# audio traffic to a few bytes per frame at a fraction of the frame rate.
+_AUDIO_BATCH_MS = 40
+
+
+def _apply_level_frame(payload: bytes, prev: list[float]) -> list[float]:
+    levels = unpack_levels(payload)
+    if len(levels) != len(prev):
+        # Too little audio in the batch for a spectrum: just decay.
+        return compute_levels(b"", 0, prev)
+    return merge_levels(levels, prev)
 
 
 @dataclass
@@ -86,7 +114,7 @@ def _recompute_input_state(
 
 
 ## This function is spaghetti and needs refactored
-async def _run(url: str) -> None:
+async def _run(url: str, encoding: Encoding = Encoding.JSON) -> None:
     console = Console()
     state = UIState(connection=f"connecting to {url}…")
     layout = build_layout()
@@ -202,20 +230,37 @@ async def _run(url: str) -> None:
             loop.add_reader(fd, on_key)
 
         try:
-            async with websockets.connect(url) as ws:
+            async with websockets.connect(
+                resume_url(url), subprotocols=[SUBPROTOCOLS[encoding]]
+            ) as ws:
+                await ws.send(
+                    json.dumps(
+                        {
+                            "action": "subscribe",
+                            "events": _SUBSCRIBED_EVENTS,
+                            "audio_batch_ms": _AUDIO_BATCH_MS,
+                            "audio_levels": True,
+                        }
+                    )
+                )
                 state.connection = f"connected · {url}"
                 paint()
                 sender = asyncio.create_task(_drain_outbox(ws, outbox))
                 try:
                     async for msg in ws:
-                        if isinstance(msg, bytes):
+                        if isinstance(msg, bytes) and is_audio_frame(msg):
                             try:
                                 frame = unpack_audio_frame(msg)
                             except ValueError:
                                 continue
-                            state.eq_levels = compute_levels(
-                                frame.pcm, frame.sample_rate, state.eq_levels
-                            )
+                            if frame.levels:
+                                state.eq_levels = _apply_level_frame(
+                                    frame.pcm, state.eq_levels
+                                )
+                            else:
+                                state.eq_levels = compute_levels(
+                                    frame.pcm, frame.sample_rate, state.eq_levels
+                                )
                             layout["equalizer"].update(
                                 render_equalizer(state.theme, state.eq_levels)
                             )
@@ -274,10 +319,9 @@ def _paint(layout: Layout, state: UIState, console_width: int) -> None:
     layout["input"].size = input_height(state.input_buffer, console_width)
 
 
-def _dispatch(state: UIState, raw: str) -> bool:
-    try:
-        event = json.loads(raw)
-    except json.JSONDecodeError:
+def _dispatch(state: UIState, raw: str | bytes) -> bool:
+    event = decode_event(raw)
+    if event is None:
         return False
     etype = event.get("type")
     data = event.get("data") or {}
@@ -303,6 +347,6 @@ def _dispatch(state: UIState, raw: str) -> bool:
     return True
 
 
-def run(url: str) -> None:
+def run(url: str, encoding: Encoding = Encoding.JSON) -> None:
     with contextlib.suppress(KeyboardInterrupt):
-        asyncio.run(_run(url))
+        asyncio.run(_run(url, encoding))
@@ -4,26 +4,19 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 
-import numpy as np
 from rich.console import Console, ConsoleOptions, RenderResult
 from rich.panel import Panel
 from rich.text import Text
 
+from paty.bus.levels import LEVEL_BANDS, band_levels
 from paty.tui.theme import Theme
 
 # 8ths of a cell, bottom→top: " " is empty, "█" is full.
 _BLOCKS = " ▁▂▃▄▅▆▇█"
-EQ_CHANNELS = 16
+EQ_CHANNELS = LEVEL_BANDS
 # Per-frame multiplicative decay applied to old bar values; new value is
 # `max(new, old * decay)` so bars hang on between syllables.
 _DECAY = 0.85
-# Magnitude scaling. FFT magnitudes from PCM16 normalized to [-1, 1] sit
-# well below 1.0; this gain plus the sqrt curve below gives full bars on
-# loud speech without clipping on peaks.
-_GAIN = 7.0
-# Floor for the log-spaced frequency edges; below this is mostly mic
-# rumble / DC drift and would just make the lowest band sit lit.
-_F_MIN_HZ = 60.0
 # Visual headroom: a level=1.0 bar fills (1 - _HEADROOM) of the panel
 # height so peaks don't read as clipping/peaking against the top border.
 _HEADROOM = 0.25
@@ -34,23 +27,15 @@ def compute_levels(pcm: bytes, sample_rate: int, prev: list[float]) -> list[floa
 
     Returns a fresh list so callers can swap it in atomically.
     """
-    if len(pcm) < EQ_CHANNELS * 4 or sample_rate <= 0:
+    levels = band_levels(pcm, sample_rate, EQ_CHANNELS)
+    if levels is None:
         return [v * _DECAY for v in prev]
-    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
-    n = samples.size
-    if n < EQ_CHANNELS * 2:
-        return [v * _DECAY for v in prev]
-    mag = np.abs(np.fft.rfft(samples))
-    freqs = np.fft.rfftfreq(n, 1.0 / sample_rate)
-    edges = np.logspace(
-        np.log10(_F_MIN_HZ), np.log10(sample_rate / 2.0), EQ_CHANNELS + 1
-    )
-    sums, _ = np.histogram(freqs, bins=edges, weights=mag)
-    counts, _ = np.histogram(freqs, bins=edges)
-    buckets = sums / np.maximum(counts, 1)
-    buckets = np.sqrt(buckets / np.sqrt(n) * _GAIN)
-    buckets = np.minimum(1.0, buckets)
-    return [max(float(b), p * _DECAY) for b, p in zip(buckets, prev, strict=True)]
+    return merge_levels(levels.tolist(), prev)
+
+
+def merge_levels(levels: Iterable[float], prev: list[float]) -> list[float]:
+    """Peak-decay-smooth precomputed band levels (e.g. a bus level frame)."""
+    return [max(float(b), p * _DECAY) for b, p in zip(levels, prev, strict=True)]
 
 
 def _row_style(row_from_bottom: int, height: int, theme: Theme) -> str:
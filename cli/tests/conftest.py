@@ -0,0 +1,29 @@
+"""Fixtures and helpers shared across the test modules."""
+
+from __future__ import annotations
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+
+@pytest.fixture
+def metered():
+    """A meter and the reader that collects from it."""
+    reader = InMemoryMetricReader()
+    provider = MeterProvider(metric_readers=[reader])
+    yield provider.get_meter("paty-test"), reader
+    provider.shutdown()
+
+
+def metric_points(reader: InMemoryMetricReader, name: str) -> list:
+    """Every data point ``reader`` has collected for the instrument ``name``."""
+    data = reader.get_metrics_data()
+    return [
+        dp
+        for rm in (data.resource_metrics if data else [])
+        for sm in rm.scope_metrics
+        for m in sm.metrics
+        if m.name == name
+        for dp in m.data.data_points
+    ]
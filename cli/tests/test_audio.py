@@ -0,0 +1,87 @@
+"""Tests for the PCM16 conversions shared by the in-process audio services."""
+
+from __future__ import annotations
+
+import io
+import wave
+
+import numpy as np
+from pipecat.audio.utils import create_stream_resampler
+
+from paty.runtime.audio import PCM16Converter, resample_pcm16, wav_payload
+
+
+def _wav(pcm: bytes, sample_rate: int = 16000) -> bytes:
+    """A WAV file the way Pipecat's SegmentedSTTService writes one."""
+    content = io.BytesIO()
+    with wave.open(content, "wb") as wav:
+        wav.setsampwidth(2)
+        wav.setnchannels(1)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return content.getvalue()
+
+
+class TestPCM16Converter:
+    def test_to_pcm16_clips_instead_of_wrapping(self):
+        pcm = PCM16Converter().to_pcm16(np.array([[0.0, 0.5], [1.5, -3.0]]))
+        assert np.frombuffer(pcm, dtype=np.int16).tolist() == [0, 16383, 32767, -32767]
+
+    def test_from_pcm16_matches_the_plain_expression(self):
+        samples = np.array([0, 1, -1, 32767, -32768], dtype=np.int16)
+        expected = samples.astype(np.float32) / 32768.0
+        out = PCM16Converter().from_pcm16(samples.tobytes())
+        assert out.dtype == np.float32
+        np.testing.assert_array_equal(out, expected)
+
+    def test_round_trip(self):
+        audio = np.linspace(-1, 1, 101, dtype=np.float32)
+        converter = PCM16Converter()
+        back = converter.from_pcm16(bytes(converter.to_pcm16(audio)))
+        np.testing.assert_allclose(back, audio, atol=1 / 16384)
+
+    def test_buffers_are_reused_and_grow_geometrically(self):
+        converter = PCM16Converter(capacity=100)
+        first = converter.from_pcm16(bytes(400))
+        second = converter.from_pcm16(bytes(200))
+        assert converter.capacity == 200
+        assert np.shares_memory(first, second)
+        converter.from_pcm16(bytes(402))
+        assert converter.capacity == 400
+
+    def test_empty_input(self):
+        converter = PCM16Converter()
+        assert bytes(converter.to_pcm16(np.array([]))) == b""
+        assert converter.from_pcm16(b"").size == 0
+
+
+class TestWavPayload:
+    def test_strips_the_header(self):
+        pcm = np.arange(-5, 5, dtype=np.int16).tobytes()
+        assert bytes(wav_payload(_wav(pcm))) == pcm
+
+    def test_skips_other_chunks(self):
+        pcm = b"\x01\x00\x02\x00"
+        data = _wav(pcm)
+        # Insert an odd-sized LIST chunk (padded to even) before "data".
+        at = data.index(b"data")
+        extra = b"LIST\x03\x00\x00\x00abc\x00"
+        assert bytes(wav_payload(data[:at] + extra + data[at:])) == pcm
+
+    def test_raw_pcm_passes_through(self):
+        assert bytes(wav_payload(b"\x01\x00\x02\x00")) == b"\x01\x00\x02\x00"
+
+
+class TestResamplePCM16:
+    async def test_same_rate_copies_out_of_the_buffer(self):
+        converter = PCM16Converter()
+        pcm = converter.to_pcm16(np.full(4, 0.5))
+        audio = await resample_pcm16(create_stream_resampler(), pcm, 24000, 24000)
+        converter.to_pcm16(np.zeros(4))
+        assert np.frombuffer(audio, dtype=np.int16).tolist() == [16383] * 4
+
+    async def test_resamples_from_the_view(self):
+        pcm = PCM16Converter().to_pcm16(np.zeros(2400))
+        audio = await resample_pcm16(create_stream_resampler(), pcm, 24000, 16000)
+        assert isinstance(audio, bytes)
+        assert 0 < len(audio) <= 1600 * 2
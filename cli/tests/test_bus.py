@@ -5,13 +5,48 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import threading
+import tracemalloc
+from collections import deque
 
+import numpy as np
 import pytest
 import websockets
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
 
 from paty.bus import BusAction, BusCommand, EventType, WebSocketBus
-from paty.bus.codec import HEADER_SIZE, pack_audio_frame, unpack_audio_frame
-from paty.bus.events import AudioStream, SessionStarted
+from paty.bus.batch import AudioBatcher
+from paty.bus.codec import (
+    FLAG_COALESCED,
+    FLAG_LEVELS,
+    HEADER_SIZE,
+    AudioCodec,
+    encode_audio_frame,
+    pack_audio_frame,
+    unpack_audio_frame,
+)
+from paty.bus.compress import negotiate_codec, ulaw_decode, ulaw_encode
+from paty.bus.encoding import (
+    SUBPROTOCOLS,
+    Encoding,
+    EventEncoder,
+    decode_event,
+    negotiate,
+)
+from paty.bus.events import AudioStream, Event, SessionStarted
+from paty.bus.levels import LEVEL_BANDS, unpack_levels
+from paty.bus.recorder import RecordKind, SessionReader, SessionRecorder
+from paty.bus.server import (
+    CONTROL_QUEUE_MAX,
+    _ControlQueue,
+    _Envelope,
+    _ReplayBuffer,
+    _resume_seq,
+    _session_param,
+    _Subscriber,
+)
+from paty.metrics.bus import BusMetrics
 
 
 class TestAudioCodec:
@@ -40,6 +75,147 @@ class TestAudioCodec:
         with pytest.raises(ValueError, match="too short"):
             unpack_audio_frame(b"\x00" * 4)
 
+    def test_encode_matches_pack(self):
+        pcm = os.urandom(640)
+        encoded = encode_audio_frame(AudioStream.MIC, 16000, 1, 7, 99, pcm)
+        assert encoded.readonly
+        assert bytes(encoded) == pack_audio_frame(AudioStream.MIC, 16000, 1, 7, 99, pcm)
+        assert unpack_audio_frame(encoded).pcm == pcm
+
+    def test_flags_roundtrip(self):
+        frame = unpack_audio_frame(
+            pack_audio_frame(AudioStream.MIC, 16000, 1, 1, 0, b"", flags=FLAG_LEVELS)
+        )
+        assert frame.levels
+        assert not frame.coalesced
+        assert not unpack_audio_frame(
+            pack_audio_frame(AudioStream.MIC, 16000, 1, 1, 0, b"")
+        ).flags
+
+
+class TestAudioBatcher:
+    # 10 ms of 16 kHz mono PCM16.
+    CHUNK = b"\x01\x00" * 160
+
+    def test_emits_once_per_batch(self):
+        batcher = AudioBatcher(AudioStream.MIC, batch_ms=40, levels=False)
+        out = []
+        for i in range(8):
+            out += batcher.push(16000, 1, i * 10, self.CHUNK)
+        frames = [unpack_audio_frame(f) for f in out]
+        assert [f.seq for f in frames] == [1, 2]
+        assert [f.ts_ms for f in frames] == [0, 40]
+        assert all(f.flags == FLAG_COALESCED for f in frames)
+        assert all(f.pcm == self.CHUNK * 4 for f in frames)
+
+    def test_format_change_flushes_pending(self):
+        batcher = AudioBatcher(AudioStream.AGENT, batch_ms=40, levels=False)
+        assert batcher.push(16000, 1, 0, self.CHUNK) == []
+        out = batcher.push(24000, 1, 10, b"\x00\x00" * 240)
+        assert len(out) == 1
+        frame = unpack_audio_frame(out[0])
+        assert (frame.sample_rate, frame.pcm) == (16000, self.CHUNK)
+
+    def test_levels_payload(self):
+        batcher = AudioBatcher(AudioStream.MIC, batch_ms=0, levels=True)
+        (raw,) = batcher.push(16000, 1, 0, os.urandom(640))
+        frame = unpack_audio_frame(raw)
+        assert frame.flags == FLAG_LEVELS
+        levels = unpack_levels(frame.pcm)
+        assert len(levels) == LEVEL_BANDS
+        assert all(0.0 <= v <= 1.0 for v in levels)
+
+    def test_too_short_for_levels_sends_nothing(self):
+        batcher = AudioBatcher(AudioStream.MIC, batch_ms=0, levels=True)
+        assert batcher.push(16000, 1, 0, b"\x00\x00" * 4) == []
+        (raw,) = batcher.push(16000, 1, 10, os.urandom(640))
+        assert unpack_audio_frame(raw).seq == 1
+
+
+class TestAudioCompression:
+    def test_ulaw_known_values(self):
+        pcm = np.array([0, 1000, -1000, 32767, -32768], dtype="<i2").tobytes()
+        assert ulaw_encode(pcm) == bytes([0xFF, 0xCE, 0x4E, 0x80, 0x00])
+
+    def test_ulaw_roundtrip_error_is_bounded(self):
+        x = np.arange(-32768, 32768, 7, dtype=np.int32)
+        y = np.frombuffer(
+            ulaw_decode(ulaw_encode(x.astype("<i2").tobytes())), dtype="<i2"
+        )
+        # mu-law step size grows with magnitude: ~1/16 relative error.
+        assert np.all(np.abs(y - x) <= np.maximum(8, np.abs(x) // 16 + 4))
+
+    def test_batcher_ulaw_halves_payload(self):
+        batcher = AudioBatcher(
+            AudioStream.AGENT, batch_ms=0, levels=False, codec=AudioCodec.ULAW
+        )
+        (raw,) = batcher.push(24000, 1, 0, b"\x00\x01" * 480)
+        frame = unpack_audio_frame(raw)
+        assert frame.codec is AudioCodec.ULAW
+        assert len(frame.pcm) == 480
+
+    def test_opus_falls_back_when_unavailable(self, monkeypatch):
+        monkeypatch.setattr("paty.bus.compress.opuslib", None)
+        assert negotiate_codec(AudioCodec.OPUS) is AudioCodec.ULAW
+        assert negotiate_codec(AudioCodec.PCM16) is AudioCodec.PCM16
+
+    def test_opus_roundtrip(self):
+        pytest.importorskip("opuslib")
+        from paty.bus.compress import OpusDecoder
+
+        batcher = AudioBatcher(
+            AudioStream.MIC, batch_ms=0, levels=False, codec=AudioCodec.OPUS
+        )
+        # 10 ms pushes: a packet every other push.
+        out = []
+        for i in range(4):
+            out += batcher.push(16000, 1, i * 10, b"\x00\x00" * 160)
+        frames = [unpack_audio_frame(f) for f in out]
+        assert len(frames) == 2
+        assert all(f.codec is AudioCodec.OPUS for f in frames)
+        decoder = OpusDecoder(16000, 1)
+        assert len(decoder.decode(frames[0].pcm)) == 640
+
+
+class TestEventEncoding:
+    def test_json_encoder_matches_envelope_model(self):
+        enc = EventEncoder("abc123", EventType.USER_TRANSCRIPT_FINAL)
+        raw = enc.to_json(7, 1234, {"text": 'say "hi"'})
+        event = Event.model_validate_json(raw)
+        assert event.seq == 7
+        assert event.ts_ms == 1234
+        assert event.session_id == "abc123"
+        assert event.type == EventType.USER_TRANSCRIPT_FINAL
+        assert event.data == {"text": 'say "hi"'}
+
+    def test_msgpack_roundtrip(self):
+        pytest.importorskip("msgpack")
+        enc = EventEncoder("abc123", EventType.STATE_CHANGED)
+        raw = enc.to_msgpack(3, 50, {"state": "thinking"})
+        assert decode_event(raw) == {
+            "v": 1,
+            "session_id": "abc123",
+            "type": "state.changed",
+            "seq": 3,
+            "ts_ms": 50,
+            "data": {"state": "thinking"},
+        }
+
+    def test_decode_rejects_garbage_and_audio(self):
+        assert decode_event("not json") is None
+        assert decode_event("[1, 2]") is None
+        audio = pack_audio_frame(AudioStream.MIC, 16000, 1, 1, 0, b"\x00\x00")
+        assert decode_event(audio) is None
+
+    def test_negotiate_defaults_to_json(self):
+        assert negotiate(None, "/") is Encoding.JSON
+        assert negotiate(None, "/?encoding=bogus") is Encoding.JSON
+
+    def test_negotiate_prefers_subprotocol(self):
+        pytest.importorskip("msgpack")
+        assert negotiate("paty.msgpack.v1", "/?encoding=json") is Encoding.MSGPACK
+        assert negotiate(None, "/?encoding=msgpack") is Encoding.MSGPACK
+
 
 @pytest.fixture
 async def bus():
@@ -124,6 +300,133 @@ class TestWebSocketBus:
         assert json.loads(m1)["data"]["text"] == "hi"
         assert json.loads(m2)["data"]["text"] == "hi"
 
+    async def test_msgpack_subscriber_gets_binary_events(self, bus: WebSocketBus):
+        pytest.importorskip("msgpack")
+        async with (
+            websockets.connect(
+                f"ws://127.0.0.1:{bus.port}",
+                subprotocols=[SUBPROTOCOLS[Encoding.MSGPACK]],
+            ) as binary,
+            websockets.connect(f"ws://127.0.0.1:{bus.port}") as text,
+        ):
+            await _wait_for_subs(bus, 2)
+            bus.publish(EventType.AGENT_RESPONSE_DELTA, {"text": "hel"})
+            m_bin = await asyncio.wait_for(binary.recv(), timeout=1.0)
+            m_txt = await asyncio.wait_for(text.recv(), timeout=1.0)
+
+        assert isinstance(m_bin, bytes)
+        assert isinstance(m_txt, str)
+        assert decode_event(m_bin) == json.loads(m_txt)
+
+    async def test_encoding_query_param(self, bus: WebSocketBus):
+        pytest.importorskip("msgpack")
+        async with websockets.connect(
+            f"ws://127.0.0.1:{bus.port}/?encoding=msgpack"
+        ) as client:
+            await _wait_for_subs(bus, 1)
+            bus.publish(EventType.LOG, {"level": "info", "module": "x", "message": "m"})
+            msg = await asyncio.wait_for(client.recv(), timeout=1.0)
+
+        assert decode_event(msg)["data"]["message"] == "m"
+
+    async def test_subscribe_filters_events_and_audio(self, bus: WebSocketBus):
+        async with websockets.connect(f"ws://127.0.0.1:{bus.port}") as client:
+            await _wait_for_subs(bus, 1)
+            await client.send(
+                json.dumps(
+                    {"action": "subscribe", "events": ["state"], "audio": ["agent"]}
+                )
+            )
+            sub = next(iter(bus._subs))
+            await _wait_until(lambda: sub.event_prefixes is not None)
+
+            bus.publish_audio(AudioStream.MIC, 16000, 1, b"\x00\x00")
+            bus.publish(EventType.METRICS_TICK, {"ttfb_ms": 1.0})
+            bus.publish(EventType.STATE_CHANGED, {"state": "thinking"})
+            bus.publish_audio(AudioStream.AGENT, 24000, 1, b"\x00\x00")
+
+            first = await asyncio.wait_for(client.recv(), timeout=1.0)
+            second = await asyncio.wait_for(client.recv(), timeout=1.0)
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(client.recv(), timeout=0.1)
+
+        received = {type(first), type(second)}
+        assert received == {str, bytes}
+        event = json.loads(first if isinstance(first, str) else second)
+        frame = unpack_audio_frame(second if isinstance(second, bytes) else first)
+        assert event["type"] == "state.changed"
+        assert frame.stream == AudioStream.AGENT
+
+    async def test_subscribe_coalesces_audio(self, bus: WebSocketBus):
+        async with (
+            websockets.connect(f"ws://127.0.0.1:{bus.port}") as batched,
+            websockets.connect(f"ws://127.0.0.1:{bus.port}") as raw,
+        ):
+            await _wait_for_subs(bus, 2)
+            await batched.send(
+                json.dumps({"action": "subscribe", "events": [], "audio_batch_ms": 40})
+            )
+            await _wait_until(lambda: any(s.audio_batch_ms for s in bus._subs))
+
+            for _ in range(8):
+                bus.publish_audio(AudioStream.MIC, 16000, 1, b"\x00\x00" * 160)
+
+            frames = [
+                unpack_audio_frame(await asyncio.wait_for(batched.recv(), 1.0))
+                for _ in range(2)
+            ]
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(batched.recv(), timeout=0.1)
+            raw_frames = [await asyncio.wait_for(raw.recv(), 1.0) for _ in range(8)]
+
+        assert all(f.coalesced and len(f.pcm) == 1280 for f in frames)
+        assert all(not unpack_audio_frame(f).flags for f in raw_frames)
+
+    async def test_subscribe_levels_off_the_loop(self, bus: WebSocketBus):
+        async with websockets.connect(f"ws://127.0.0.1:{bus.port}") as client:
+            await _wait_for_subs(bus, 1)
+            await client.send(
+                json.dumps({"action": "subscribe", "events": [], "audio_levels": True})
+            )
+            await _wait_until(lambda: any(s.audio_levels for s in bus._subs))
+            bus.publish_audio(AudioStream.MIC, 16000, 1, b"\x00\x00" * 4)
+            bus.publish_audio(AudioStream.MIC, 16000, 1, os.urandom(640))
+            frame = unpack_audio_frame(await asyncio.wait_for(client.recv(), 1.0))
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(client.recv(), timeout=0.1)
+        assert frame.levels
+        assert len(unpack_levels(frame.pcm)) == LEVEL_BANDS
+
+    async def test_subscribe_compressed_audio(self, bus: WebSocketBus):
+        async with websockets.connect(f"ws://127.0.0.1:{bus.port}") as client:
+            await _wait_for_subs(bus, 1)
+            await client.send(
+                json.dumps({"action": "subscribe", "audio_codec": "ulaw"})
+            )
+            sub = next(iter(bus._subs))
+            await _wait_until(lambda: sub.audio_codec is AudioCodec.ULAW)
+
+            for _ in range(3):
+                bus.publish_audio(AudioStream.MIC, 16000, 1, b"\x00\x10" * 160)
+            frames = [
+                unpack_audio_frame(await asyncio.wait_for(client.recv(), 1.0))
+                for _ in range(3)
+            ]
+
+        assert [f.seq for f in frames] == [1, 2, 3]
+        assert all(f.codec is AudioCodec.ULAW and len(f.pcm) == 160 for f in frames)
+
+    async def test_subscribe_is_not_forwarded_to_handler(self, bus: WebSocketBus):
+        received: list[BusCommand] = []
+        bus.on_command(received.append)
+        async with websockets.connect(f"ws://127.0.0.1:{bus.port}") as client:
+            await _wait_for_subs(bus, 1)
+            await client.send(json.dumps({"action": "subscribe", "audio": []}))
+            await client.send(json.dumps({"action": "mute.toggle"}))
+            await _wait_until(lambda: bool(received))
+
+        assert [c.action for c in received] == [BusAction.MUTE_TOGGLE]
+
     async def test_publish_before_start_is_safe(self):
         b = WebSocketBus(port=_find_free_port())
         # No start() → no subscribers, should not raise.
@@ -165,6 +468,403 @@ class TestWebSocketBus:
         assert received[0].action == BusAction.MUTE_TOGGLE
 
 
+class TestReplay:
+    @staticmethod
+    def _envelope(seq: int, event_type: EventType = EventType.LOG) -> _Envelope:
+        return _Envelope(
+            EventEncoder("s1", event_type), event_type, seq, seq, {"n": seq}
+        )
+
+    def test_since_returns_gap_in_order(self):
+        ring = _ReplayBuffer(max_events=8, max_bytes=1 << 20)
+        for seq in range(1, 6):
+            ring.append(self._envelope(seq))
+        assert [e.seq for e in ring.since(2)] == [3, 4, 5]
+        assert [e.seq for e in ring.since(0)] == [1, 2, 3, 4, 5]
+        assert ring.since(5) == []
+
+    def test_caps_evict_oldest(self):
+        ring = _ReplayBuffer(max_events=3, max_bytes=1 << 20)
+        for seq in range(1, 6):
+            ring.append(self._envelope(seq))
+        assert [e.seq for e in ring.since(0)] == [3, 4, 5]
+
+        size = len(self._envelope(1).encode(Encoding.JSON))
+        ring = _ReplayBuffer(max_events=100, max_bytes=size * 2)
+        for seq in range(1, 6):
+            ring.append(self._envelope(seq))
+        assert len(ring) == 2
+        assert ring.nbytes <= size * 2
+
+    def test_session_started_is_pinned(self):
+        ring = _ReplayBuffer(max_events=2, max_bytes=1 << 20)
+        ring.append(self._envelope(1, EventType.SESSION_STARTED))
+        for seq in range(2, 6):
+            ring.append(self._envelope(seq))
+        assert [e.seq for e in ring.since(0)] == [1, 4, 5]
+        # A client that already saw session.started doesn't get it again.
+        assert [e.seq for e in ring.since(1)] == [4, 5]
+
+    def test_disabled(self):
+        ring = _ReplayBuffer(max_events=0, max_bytes=1 << 20)
+        ring.append(self._envelope(1, EventType.SESSION_STARTED))
+        assert ring.since(0) == []
+
+    def test_resume_seq_parsing(self):
+        assert _resume_seq(None) is None
+        assert _resume_seq("/") is None
+        assert _resume_seq("/?resume=12") == 12
+        assert _resume_seq("/?encoding=json&resume=0") == 0
+        assert _resume_seq("/?resume=-3") == 0
+        assert _resume_seq("/?resume=abc") is None
+
+    async def test_resume_replays_gap_before_live(self, bus: WebSocketBus):
+        bus.publish(EventType.SESSION_STARTED, {"pak": "paty"})
+        bus.publish(EventType.USER_TRANSCRIPT_FINAL, {"text": "hi"})
+        bus.publish(EventType.AGENT_RESPONSE_COMPLETED, {"text": "hello"})
+
+        async with websockets.connect(f"ws://127.0.0.1:{bus.port}/?resume=1") as c:
+            await _wait_for_subs(bus, 1)
+            bus.publish(EventType.STATE_CHANGED, {"state": "idle"})
+            events = [
+                json.loads(await asyncio.wait_for(c.recv(), timeout=1.0))
+                for _ in range(3)
+            ]
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(c.recv(), timeout=0.1)
+
+        assert [e["seq"] for e in events] == [2, 3, 4]
+        assert [e["type"] for e in events] == [
+            "user.transcript.final",
+            "agent.response.completed",
+            "state.changed",
+        ]
+
+    async def test_backlog_does_not_grow_the_live_queue(self, bus: WebSocketBus):
+        for n in range(8):
+            bus.publish(EventType.LOG, {"n": n})
+        async with websockets.connect(f"ws://127.0.0.1:{bus.port}/?resume=0") as c:
+            await _wait_for_subs(bus, 1)
+            sub = next(iter(bus._subs))
+            assert sub.control_queue.maxsize == CONTROL_QUEUE_MAX
+            events = [
+                json.loads(await asyncio.wait_for(c.recv(), timeout=1.0))
+                for _ in range(8)
+            ]
+        assert [e["seq"] for e in events] == list(range(1, 9))
+
+    async def test_backlog_honours_the_subscribe_filter(self, bus: WebSocketBus):
+        sent: list[str] = []
+
+        class _WS:
+            async def send(self, msg: str) -> None:
+                sent.append(msg)
+
+        sub = _Subscriber(
+            ws=_WS(),  # type: ignore[arg-type]
+            replay=deque(
+                [
+                    _env(1, EventType.SESSION_STARTED),
+                    _env(2, EventType.STATE_CHANGED, state="listening"),
+                    _env(3, EventType.METRICS_TICK),
+                ]
+            ),
+        )
+        sub.subscribe(events=["state"], audio=None)
+        sender = asyncio.create_task(bus._control_sender(sub))
+        await _wait_until(lambda: not sub.replay)
+        sender.cancel()
+        await sender
+        assert [json.loads(msg)["seq"] for msg in sent] == [2]
+
+    async def test_no_resume_means_live_only(self, bus: WebSocketBus):
+        bus.publish(EventType.SESSION_STARTED, {"pak": "paty"})
+        async with websockets.connect(f"ws://127.0.0.1:{bus.port}") as c:
+            await _wait_for_subs(bus, 1)
+            bus.publish(EventType.STATE_CHANGED, {"state": "idle"})
+            event = json.loads(await asyncio.wait_for(c.recv(), timeout=1.0))
+        assert event["seq"] == 2
+
+
+class TestSessions:
+    def test_session_param_parsing(self):
+        assert _session_param(None) is None
+        assert _session_param("/?resume=3") is None
+        assert _session_param("/?session=abc&resume=3") == "abc"
+        assert _session_param("/?session=*") == "*"
+
+    async def test_sessions_are_isolated(self, bus: WebSocketBus):
+        other = bus.open_session("agent-2")
+        url = f"ws://127.0.0.1:{bus.port}"
+        async with (
+            websockets.connect(url) as default,
+            websockets.connect(f"{url}/?session=agent-2") as second,
+        ):
+            await _wait_for_subs(bus, 2)
+            bus.publish(EventType.LOG, {"n": 1})
+            other.publish(EventType.LOG, {"n": 2})
+            other.publish_audio(AudioStream.MIC, 16000, 1, b"\0\0")
+            first = json.loads(await asyncio.wait_for(default.recv(), timeout=1.0))
+            got = [await asyncio.wait_for(second.recv(), timeout=1.0) for _ in range(2)]
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(default.recv(), timeout=0.1)
+
+        assert (first["session_id"], first["seq"]) == (bus.session_id, 1)
+        event = json.loads(next(m for m in got if isinstance(m, str)))
+        assert (event["session_id"], event["seq"]) == ("agent-2", 1)
+        assert any(isinstance(m, bytes) for m in got)
+
+    async def test_wildcard_gets_every_session_but_no_audio(self, bus: WebSocketBus):
+        other = bus.open_session("agent-2")
+        bus.publish(EventType.SESSION_STARTED, {"pak": "a"})
+        other.publish(EventType.SESSION_STARTED, {"pak": "b"})
+        url = f"ws://127.0.0.1:{bus.port}/?session=*&resume=0"
+        async with websockets.connect(url) as c:
+            await _wait_for_subs(bus, 1)
+            other.publish(EventType.LOG, {"n": 1})
+            other.publish_audio(AudioStream.MIC, 16000, 1, b"\0\0")
+            events = [
+                json.loads(await asyncio.wait_for(c.recv(), timeout=1.0))
+                for _ in range(3)
+            ]
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(c.recv(), timeout=0.1)
+
+        assert [(e["session_id"], e["type"]) for e in events] == [
+            (bus.session_id, "session.started"),
+            ("agent-2", "session.started"),
+            ("agent-2", "log"),
+        ]
+
+    async def test_unknown_session_is_rejected(self, bus: WebSocketBus):
+        url = f"ws://127.0.0.1:{bus.port}/?session=nope"
+        async with websockets.connect(url) as c:
+            with pytest.raises(websockets.exceptions.ConnectionClosed) as info:
+                await asyncio.wait_for(c.recv(), timeout=1.0)
+        assert info.value.rcvd.code == 1008
+
+    async def test_wildcard_only_resumes_from_zero(self, bus: WebSocketBus):
+        url = f"ws://127.0.0.1:{bus.port}/?session=*&resume=3"
+        async with websockets.connect(url) as c:
+            with pytest.raises(websockets.exceptions.ConnectionClosed) as info:
+                await asyncio.wait_for(c.recv(), timeout=1.0)
+        assert info.value.rcvd.code == 1008
+        assert bus.subscriber_count == 0
+
+    async def test_duplicate_session_id_raises(self, bus: WebSocketBus):
+        bus.open_session("agent-2")
+        with pytest.raises(ValueError):
+            bus.open_session("agent-2")
+        with pytest.raises(ValueError):
+            bus.open_session(bus.session_id)
+
+    async def test_close_session_disconnects_its_subscribers(self, bus: WebSocketBus):
+        bus.open_session("agent-2")
+        url = f"ws://127.0.0.1:{bus.port}/?session=agent-2"
+        async with websockets.connect(url) as c:
+            await _wait_for_subs(bus, 1)
+            await bus.close_session("agent-2")
+            with pytest.raises(websockets.exceptions.ConnectionClosed):
+                await asyncio.wait_for(c.recv(), timeout=1.0)
+        assert bus.session("agent-2") is None
+        assert [s.session_id for s in bus.sessions] == [bus.session_id]
+
+    async def test_commands_reach_their_own_session(self, bus: WebSocketBus):
+        other = bus.open_session("agent-2")
+        received: dict[str, list[BusCommand]] = {"default": [], "agent-2": []}
+        bus.on_command(received["default"].append)
+        other.on_command(received["agent-2"].append)
+        url = f"ws://127.0.0.1:{bus.port}/?session=agent-2"
+        async with websockets.connect(url) as c:
+            await c.send(json.dumps({"action": "mute.toggle"}))
+            await _wait_until(lambda: received["agent-2"])
+        assert received["default"] == []
+
+
+def _env(seq: int, event_type: EventType, **data) -> _Envelope:
+    return _Envelope(EventEncoder("s1", event_type), event_type, seq, seq, data)
+
+
+class TestControlQueue:
+    def test_fifo_below_pressure(self):
+        q = _ControlQueue(maxsize=8, pressure=4)
+        for seq in (1, 2, 3):
+            assert q.put_nowait(_env(seq, EventType.STATE_CHANGED)) is None
+        assert q.qsize() == 3
+
+    async def test_merges_consecutive_deltas_under_pressure(self):
+        q = _ControlQueue(maxsize=8, pressure=1)
+        q.put_nowait(_env(1, EventType.AGENT_RESPONSE_DELTA, text="Hel"))
+        assert q.put_nowait(_env(2, EventType.AGENT_RESPONSE_DELTA, text="lo")) == (
+            "merged"
+        )
+        merged = await q.get()
+        assert (merged.seq, merged.data) == (2, {"text": "Hello"})
+        assert q.qsize() == 0
+
+    async def test_supersedes_state_and_metrics_under_pressure(self):
+        q = _ControlQueue(maxsize=8, pressure=1)
+        q.put_nowait(_env(1, EventType.STATE_CHANGED, state="thinking"))
+        q.put_nowait(_env(2, EventType.USER_TRANSCRIPT_FINAL, text="hi"))
+        assert q.put_nowait(_env(3, EventType.STATE_CHANGED, state="speaking")) == (
+            "superseded"
+        )
+        assert [(await q.get()).seq for _ in range(2)] == [2, 3]
+
+    async def test_coalesced_events_move_to_the_back(self):
+        q = _ControlQueue(maxsize=8, pressure=1)
+        q.put_nowait(_env(1, EventType.AGENT_RESPONSE_DELTA, text="a"))
+        q.put_nowait(_env(2, EventType.STATE_CHANGED, state="speaking"))
+        q.put_nowait(_env(3, EventType.AGENT_RESPONSE_DELTA, text="b"))
+        q.put_nowait(_env(4, EventType.USER_TRANSCRIPT_FINAL, text="hi"))
+        q.put_nowait(_env(5, EventType.STATE_CHANGED, state="listening"))
+        sent = [await q.get() for _ in range(q.qsize())]
+        assert [(e.event_type, e.data) for e in sent] == [
+            (EventType.AGENT_RESPONSE_DELTA, {"text": "ab"}),
+            (EventType.USER_TRANSCRIPT_FINAL, {"text": "hi"}),
+            (EventType.STATE_CHANGED, {"state": "listening"}),
+        ]
+
+    async def test_seqs_stay_monotonic_under_coalescing(self):
+        q = _ControlQueue(maxsize=64, pressure=2)
+        kinds = [
+            EventType.AGENT_RESPONSE_DELTA,
+            EventType.STATE_CHANGED,
+            EventType.METRICS_TICK,
+            EventType.AGENT_RESPONSE_DELTA,
+            EventType.USER_TRANSCRIPT_FINAL,
+        ]
+        sent = []
+        for seq in range(1, 200):
+            q.put_nowait(_env(seq, kinds[seq * 7 % len(kinds)], text="x"))
+            if seq % 3 == 0:
+                sent.append((await q.get()).seq)
+        sent.extend([(await q.get()).seq for _ in range(q.qsize())])
+        assert sent == sorted(sent)
+        assert len(sent) < 199  # some were coalesced
+
+    def test_overflow_only_for_non_coalescible(self):
+        q = _ControlQueue(maxsize=2, pressure=1)
+        q.put_nowait(_env(1, EventType.METRICS_TICK))
+        q.put_nowait(_env(2, EventType.AGENT_RESPONSE_DELTA, text="a"))
+        # Full, but both of these coalesce.
+        q.put_nowait(_env(3, EventType.AGENT_RESPONSE_DELTA, text="b"))
+        q.put_nowait(_env(4, EventType.METRICS_TICK))
+        with pytest.raises(asyncio.QueueFull):
+            q.put_nowait(_env(5, EventType.USER_TRANSCRIPT_FINAL, text="hi"))
+
+    async def test_sent_events_are_not_superseded(self):
+        q = _ControlQueue(maxsize=8, pressure=0)
+        q.put_nowait(_env(1, EventType.STATE_CHANGED, state="idle"))
+        await q.get()
+        assert q.put_nowait(_env(2, EventType.STATE_CHANGED, state="listening")) is None
+
+
+class TestBackpressure:
+    """A stalled subscriber survives a long delta burst; counters record it."""
+
+    def setup_method(self):
+        self._reader = InMemoryMetricReader()
+        self._provider = MeterProvider(metric_readers=[self._reader])
+
+    def teardown_method(self):
+        self._provider.shutdown()
+
+    def _counters(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        data = self._reader.get_metrics_data()
+        for rm in data.resource_metrics if data else []:
+            for sm in rm.scope_metrics:
+                for metric in sm.metrics:
+                    out[metric.name] = sum(dp.value for dp in metric.data.data_points)
+        return out
+
+    async def test_delta_burst_is_coalesced_not_dropped(self, bus: WebSocketBus):
+        bus._metrics = BusMetrics(self._provider.get_meter("paty-test"))
+        sub = _Subscriber(ws=None)  # type: ignore[arg-type]
+        bus.default_session._subs.add(sub)
+        try:
+            for _ in range(CONTROL_QUEUE_MAX * 4):
+                bus.publish(EventType.AGENT_RESPONSE_DELTA, {"text": "x"})
+                bus.publish(EventType.METRICS_TICK, {"ttfb_ms": 1.0})
+        finally:
+            bus.default_session._subs.discard(sub)
+
+        assert not sub.closing
+        assert sub.control_queue.qsize() < CONTROL_QUEUE_MAX
+        counters = self._counters()
+        assert counters["paty_bus_events_coalesced_total"] > CONTROL_QUEUE_MAX
+        assert "paty_bus_subscribers_dropped_total" not in counters
+
+    async def test_non_coalescible_overflow_disconnects(self, bus: WebSocketBus):
+        bus._metrics = BusMetrics(self._provider.get_meter("paty-test"))
+        async with websockets.connect(f"ws://127.0.0.1:{bus.port}") as client:
+            await _wait_for_subs(bus, 1)
+            sub = next(iter(bus._subs))
+            sub.tasks[0].cancel()  # stall the control sender
+            await asyncio.sleep(0)
+            for _ in range(CONTROL_QUEUE_MAX + 1):
+                bus.publish(EventType.USER_TRANSCRIPT_FINAL, {"text": "hi"})
+            with pytest.raises(websockets.exceptions.ConnectionClosed):
+                while True:
+                    await asyncio.wait_for(client.recv(), timeout=1.0)
+        assert sub.closing
+        assert self._counters()["paty_bus_subscribers_dropped_total"] == 1
+
+
+class TestPublishAudioAllocations:
+    """Micro-benchmark: memory retained per published frame vs fan-out width.
+
+    Each frame should cost one shared buffer regardless of how many
+    subscriber queues hold it; the only per-subscriber cost is the queue
+    slot itself.
+    """
+
+    FRAMES = 200
+    PCM = b"\x01\x02" * 320  # 20 ms of 16 kHz mono PCM16
+
+    async def _measure(self, bus: WebSocketBus, n_subs: int) -> tuple[float, float]:
+        subs = [_Subscriber(ws=None) for _ in range(n_subs)]  # type: ignore[arg-type]
+        bus.default_session._subs.update(subs)
+        try:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            for _ in range(self.FRAMES):
+                bus.publish_audio(AudioStream.MIC, 16000, 1, self.PCM)
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        finally:
+            bus.default_session._subs.difference_update(subs)
+        stats = after.compare_to(before, "filename")
+        blocks = sum(s.count_diff for s in stats)
+        size = sum(s.size_diff for s in stats)
+        return blocks / self.FRAMES, size / self.FRAMES
+
+    async def test_allocations_per_frame_do_not_scale_with_subscribers(
+        self, bus: WebSocketBus
+    ):
+        results = {n: await self._measure(bus, n) for n in (1, 4, 16)}
+
+        frame_bytes = HEADER_SIZE + len(self.PCM)
+        blocks_1, size_1 = results[1]
+        # One shared buffer per frame: extra subscribers may only add
+        # amortized queue-slot overhead, never another copy of the frame.
+        for n in (4, 16):
+            blocks, size = results[n]
+            assert blocks - blocks_1 < 1.0, f"{n} subs: {blocks:.2f} blocks/frame"
+            assert size - size_1 < frame_bytes, f"{n} subs: {size:.0f} B/frame"
+        assert size_1 < 2 * frame_bytes
+
+
+async def _wait_until(predicate, timeout: float = 1.0) -> None:
+    """Poll until ``predicate()`` is true."""
+    deadline = asyncio.get_event_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_event_loop().time() > deadline:
+            raise TimeoutError("condition not met")
+        await asyncio.sleep(0.01)
+
+
 async def _wait_for_subs(bus: WebSocketBus, n: int, timeout: float = 1.0) -> None:
     """Poll until the bus has registered ``n`` subscribers."""
     deadline = asyncio.get_event_loop().time() + timeout
@@ -172,3 +872,218 @@ async def _wait_for_subs(bus: WebSocketBus, n: int, timeout: float = 1.0) -> Non
         if asyncio.get_event_loop().time() > deadline:
             raise TimeoutError(f"expected {n} subs, got {len(bus._subs)}")
         await asyncio.sleep(0.01)
+
+
+class TestRecorder:
+    @staticmethod
+    def _audio(seq: int, ts_ms: int) -> bytes:
+        return pack_audio_frame(
+            stream=AudioStream.MIC,
+            sample_rate=16000,
+            channels=1,
+            seq=seq,
+            ts_ms=ts_ms,
+            pcm=b"\x01\x00" * 160,
+        )
+
+    def test_round_trip_and_index(self, tmp_path):
+        path = tmp_path / "s.paty"
+        rec = SessionRecorder(path, chunk_max_bytes=512)
+        rec.start()
+        for i in range(1, 21):
+            rec.record_event(i, i * 10, json.dumps({"seq": i, "ts_ms": i * 10}))
+            rec.record_audio(self._audio(i, i * 10 + 5))
+        rec.close()
+
+        reader = SessionReader(path)
+        assert reader.record_count == rec.records == 40
+        assert len(reader.index) > 1  # small chunks -> several index rows
+        assert reader.duration_ms == 205
+        records = list(reader.records())
+        assert [r.kind for r in records[:2]] == [RecordKind.EVENT, RecordKind.AUDIO]
+        assert json.loads(records[0].payload) == {"seq": 1, "ts_ms": 10}
+        frame = unpack_audio_frame(records[1].payload)
+        assert (frame.seq, frame.ts_ms) == (1, 15)
+        assert (records[1].seq, records[1].ts_ms) == (1, 15)
+
+        late = list(reader.records(start_ms=150, kinds=frozenset({RecordKind.EVENT})))
+        assert [r.seq for r in late] == list(range(15, 21))
+
+    def test_missing_index_and_torn_tail_are_recovered(self, tmp_path):
+        path = tmp_path / "s.paty"
+        rec = SessionRecorder(path, chunk_max_bytes=64)
+        rec.start()
+        for i in range(1, 11):
+            rec.record_event(i, i, json.dumps({"seq": i}))
+        rec.close()
+        complete = SessionReader(path).record_count
+
+        (tmp_path / "s.paty.idx").unlink()
+        with open(path, "ab") as f:
+            f.write(b"CHNK\xff\x00")  # a crash mid-chunk-header
+        reader = SessionReader(path)
+        assert reader.record_count == complete == 10
+        assert [r.seq for r in reader.records()] == list(range(1, 11))
+
+    def test_drops_what_the_writer_cannot_keep_up_with(self, tmp_path):
+        gate = threading.Event()
+
+        class _Stalled(SessionRecorder):
+            def _run(self) -> None:
+                gate.wait()
+                super()._run()
+
+        rec = _Stalled(tmp_path / "s.paty", max_queued=4)
+        rec.start()
+        for i in range(1, 11):
+            rec.record_event(i, i, json.dumps({"seq": i}))
+        assert rec.dropped == 6
+        gate.set()
+        rec.close()
+        assert rec.records == 4
+        assert [r.seq for r in SessionReader(rec.path).records()] == [1, 2, 3, 4]
+
+    def test_drops_once_the_writer_is_gone(self, tmp_path):
+        class _Dead(SessionRecorder):
+            def _run(self) -> None:
+                pass
+
+        rec = _Dead(tmp_path / "s.paty", max_queued=1)
+        rec.start()
+        rec._thread.join()
+        for i in range(1, 4):
+            rec.record_event(i, i, json.dumps({"seq": i}))
+        assert rec.dropped == 3
+        rec.close()  # returns instead of waiting on a writer that isn't there
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "x.paty"
+        path.write_bytes(b"not a log")
+        with pytest.raises(ValueError):
+            SessionReader(path)
+
+    async def test_bus_records_in_process(self, tmp_path):
+        bus = WebSocketBus(
+            port=_find_free_port(), record_path=tmp_path / "{session}.paty"
+        )
+        await bus.start()
+        # Recorded even with nobody subscribed.
+        bus.publish(EventType.SESSION_STARTED, {"pak": "paty"})
+        bus.publish_audio(AudioStream.AGENT, 24000, 1, b"\x00\x00" * 240)
+        bus.publish(EventType.SESSION_ENDED, {"reason": "quit"})
+        await bus.stop()
+
+        reader = SessionReader(tmp_path / f"{bus.session_id}.paty")
+        records = list(reader.records())
+        assert [r.kind for r in records] == [
+            RecordKind.EVENT,
+            RecordKind.AUDIO,
+            RecordKind.EVENT,
+        ]
+        first = json.loads(records[0].payload)
+        assert first["type"] == "session.started"
+        assert first["session_id"] == bus.session_id
+        assert unpack_audio_frame(records[1].payload).stream == AudioStream.AGENT
+
+    async def test_record_subscriber(self, bus: WebSocketBus, tmp_path):
+        from paty.bus.recorder import record
+
+        bus.publish(EventType.SESSION_STARTED, {"pak": "paty"})
+        path = tmp_path / "sub.paty"
+        task = asyncio.create_task(record(f"ws://127.0.0.1:{bus.port}", path))
+        await _wait_for_subs(bus, 1)
+        bus.publish_audio(AudioStream.MIC, 16000, 1, b"\x00\x00" * 160)
+        bus.publish(EventType.STATE_CHANGED, {"state": "idle"})
+        await asyncio.sleep(0.05)
+        await bus.stop()
+        await asyncio.wait_for(task, timeout=2.0)
+
+        records = list(SessionReader(path).records())
+        # session.started predates the subscriber; resume=0 still records it.
+        events = [
+            json.loads(r.payload)["type"] for r in records if r.kind is RecordKind.EVENT
+        ]
+        assert events == ["session.started", "state.changed"]
+        assert sum(r.kind is RecordKind.AUDIO for r in records) == 1
+
+
+class TestReplaySession:
+    @staticmethod
+    def _log(tmp_path, deltas: int = 300) -> SessionReader:
+        path = tmp_path / "s.paty"
+        rec = SessionRecorder(path)
+        rec.start()
+        envelope = {"v": 1, "session_id": "old", "data": {}}
+        rec.record_event(
+            1,
+            0,
+            json.dumps({**envelope, "seq": 1, "ts_ms": 0, "type": "session.started"}),
+        )
+        for i in range(deltas):
+            rec.record_event(
+                i + 2,
+                i,
+                json.dumps(
+                    {
+                        **envelope,
+                        "seq": i + 2,
+                        "ts_ms": i,
+                        "type": "agent.response.delta",
+                        "data": {"text": str(i)},
+                    }
+                ),
+            )
+            rec.record_audio(TestRecorder._audio(i + 1, i))
+        rec.close()
+        return SessionReader(path)
+
+    async def test_fast_replay_delivers_everything_in_order(
+        self, bus: WebSocketBus, tmp_path
+    ):
+        from paty.bus.replay import replay_session
+
+        reader = self._log(tmp_path)
+        async with websockets.connect(f"ws://127.0.0.1:{bus.port}") as c:
+            await _wait_for_subs(bus, 1)
+            report = await replay_session(bus, reader, speed=None)
+            texts, frames = [], 0
+            while len(texts) < 300 or frames < 300:
+                msg = await asyncio.wait_for(c.recv(), timeout=2.0)
+                if isinstance(msg, bytes):
+                    frames += 1
+                    continue
+                event = json.loads(msg)
+                assert event["session_id"] == bus.session_id
+                if event["type"] == "agent.response.delta":
+                    texts.append(event["data"]["text"])
+
+        assert (report.events, report.audio_frames, report.skipped) == (301, 300, 0)
+        # Backpressure-aware: nothing coalesced, nobody dropped.
+        assert texts == [str(i) for i in range(300)]
+
+    async def test_speed_scales_original_timing(self, bus: WebSocketBus, tmp_path):
+        from paty.bus.replay import replay_session
+
+        reader = self._log(tmp_path, deltas=200)  # 199 ms of session
+        report = await replay_session(bus, reader, speed=4.0, audio=False)
+        assert report.session_ms == 199
+        assert report.audio_frames == 0
+        assert 0.045 <= report.wall_s < 0.5
+
+
+class TestBench:
+    async def test_smoke(self):
+        from paty.bus.bench import BenchConfig, run_bench
+
+        report = await run_bench(
+            BenchConfig(subscribers=2, slow_subscribers=1, duration_s=0.3)
+        )
+        assert report.published_audio >= 10
+        assert report.published_events >= 1
+        fast = [s for s in report.subscribers if not s.slow]
+        assert len(fast) == 2 and len(report.subscribers) == 3
+        for sub in fast:
+            assert not sub.disconnected
+            assert sub.audio_frames == report.published_audio
+            assert sub.events == report.published_events
+            assert sub.audio_latency_ms and sub.control_latency_ms
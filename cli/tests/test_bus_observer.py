@@ -0,0 +1,226 @@
+"""Tests for BusObserver's frame → bus event translation."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pipecat.frames.frames import (
+    InputAudioRawFrame,
+    InterimTranscriptionFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    MetricsFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSTextFrame,
+    UserMuteStartedFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.metrics.metrics import TTFBMetricsData
+from pipecat.observers.base_observer import FramePushed
+from pipecat.processors.frame_processor import FrameDirection
+
+from paty.bus.events import AudioStream, EventType
+from paty.bus.observer import _DISPATCH, _OVERFLOW_FACTOR, BusObserver
+from tests.conftest import metric_points
+
+
+class _RecordingBus:
+    """Stands in for WebSocketBus; records what the observer publishes."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple[EventType, object]] = []
+        self.times: list[int] = []
+        self.audio: list[AudioStream] = []
+        self.now = 0
+
+    def ts_ms(self) -> int:
+        return self.now
+
+    def publish(self, event_type, data=None, *, ts_ms=None) -> None:
+        self.events.append((event_type, data))
+        self.times.append(self.now if ts_ms is None else ts_ms)
+
+    def publish_audio(self, stream, sample_rate, channels, pcm) -> None:
+        self.audio.append(stream)
+
+
+def _pushed(frame, source: str = "proc") -> FramePushed:
+    return FramePushed(
+        source=SimpleNamespace(name=source),
+        destination=SimpleNamespace(name="next"),
+        frame=frame,
+        direction=FrameDirection.DOWNSTREAM,
+        timestamp=0,
+    )
+
+
+@pytest.fixture
+def observed():
+    bus = _RecordingBus()
+    return BusObserver(bus), bus  # type: ignore[arg-type]
+
+
+class TestBusObserver:
+    async def test_frame_observed_on_every_edge_publishes_once(self, observed):
+        observer, bus = observed
+        frame = TranscriptionFrame("hello", "u", "t")
+        for _ in range(5):
+            await observer.on_push_frame(_pushed(frame))
+        assert [e for e, _ in bus.events] == [EventType.USER_TRANSCRIPT_FINAL]
+
+    async def test_response_deltas_and_completion(self, observed):
+        observer, bus = observed
+        for frame in (
+            LLMFullResponseStartFrame(),
+            LLMTextFrame("Hi "),
+            LLMTextFrame("there"),
+            LLMFullResponseEndFrame(),
+        ):
+            await observer.on_push_frame(_pushed(frame))
+        types = [e for e, _ in bus.events]
+        assert types[0] == EventType.AGENT_THINKING_STARTED
+        assert types.count(EventType.AGENT_RESPONSE_DELTA) == 2
+        completed = [
+            d for e, d in bus.events if e == EventType.AGENT_RESPONSE_COMPLETED
+        ]
+        assert completed[0].text == "Hi there"
+
+    async def test_subclass_dispatches_through_mro(self, observed):
+        observer, bus = observed
+        await observer.on_push_frame(_pushed(TTSAudioRawFrame(b"\0\0", 24000, 1)))
+        assert bus.audio == [AudioStream.AGENT]
+        assert _DISPATCH[TTSAudioRawFrame] is BusObserver._on_output_audio
+
+    async def test_ignored_frames_exit_before_dedup(self, observed):
+        observer, bus = observed
+        frame = TTSTextFrame("word", "word")
+        await observer.on_push_frame(_pushed(frame))
+        assert _DISPATCH[TTSTextFrame] is None
+        assert bus.events == []
+        assert not hasattr(frame, observer._seen_attr)
+
+    async def test_muted_mic_is_not_published(self, observed):
+        observer, bus = observed
+        await observer.on_push_frame(_pushed(UserMuteStartedFrame()))
+        await observer.on_push_frame(_pushed(InputAudioRawFrame(b"\0\0", 16000, 1)))
+        assert bus.audio == []
+
+    async def test_metrics_only_from_the_measuring_processor(self, observed):
+        observer, bus = observed
+        ttfb = TTFBMetricsData(processor="KokoroTTSService", value=0.2)
+        await observer.on_push_frame(_pushed(MetricsFrame(data=[ttfb]), "Output"))
+        assert bus.events == []
+
+        await observer.on_push_frame(
+            _pushed(MetricsFrame(data=[ttfb]), "KokoroTTSService")
+        )
+        assert [d.tts_ms for _, d in bus.events] == [200]
+
+
+async def _settle() -> None:
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestObserverRing:
+    async def test_translates_off_the_push_path_in_order(self, metered):
+        meter, reader = metered
+        bus = _RecordingBus()
+        observer = BusObserver(bus, ring_size=256, meter=meter)  # type: ignore[arg-type]
+        frames = [LLMFullResponseStartFrame()]
+        frames += [LLMTextFrame(str(i)) for i in range(100)]
+        frames.append(LLMFullResponseEndFrame())
+        for frame in frames:
+            await observer.on_push_frame(_pushed(frame))
+        assert bus.events == []  # the push path only queued references
+
+        await _settle()
+        deltas = [d.text for e, d in bus.events if e == EventType.AGENT_RESPONSE_DELTA]
+        assert deltas == [str(i) for i in range(100)]
+        assert [e for e, _ in bus.events[-2:]] == [
+            EventType.AGENT_RESPONSE_COMPLETED,
+            EventType.STATE_CHANGED,  # thinking -> idle
+        ]
+        (lag,) = metric_points(reader, "paty_bus_observer_lag_seconds")
+        assert lag.count == len(frames)
+        await observer.cleanup()
+
+    async def test_full_ring_drops_audio_but_not_control(self, metered):
+        meter, reader = metered
+        bus = _RecordingBus()
+        observer = BusObserver(bus, ring_size=4, meter=meter)  # type: ignore[arg-type]
+        for _ in range(10):
+            await observer.on_push_frame(_pushed(InputAudioRawFrame(b"\0\0", 16000, 1)))
+        await observer.on_push_frame(_pushed(TranscriptionFrame("hi", "u", "t")))
+
+        await _settle()
+        assert len(bus.audio) == 4
+        assert [e for e, _ in bus.events] == [EventType.USER_TRANSCRIPT_FINAL]
+        (dropped,) = metric_points(reader, "paty_bus_observer_frames_dropped_total")
+        assert dropped.value == 6
+        assert dict(dropped.attributes) == {"kind": "audio"}
+        (overflow,) = metric_points(reader, "paty_bus_observer_ring_overflow_total")
+        assert overflow.value == 1
+        await observer.cleanup()
+
+    async def test_control_overflow_is_capped(self, metered):
+        meter, reader = metered
+        bus = _RecordingBus()
+        observer = BusObserver(bus, ring_size=4, meter=meter)  # type: ignore[arg-type]
+        for i in range(30):
+            await observer.on_push_frame(_pushed(TranscriptionFrame(str(i), "u", "t")))
+        assert len(observer._ring) == 4 * _OVERFLOW_FACTOR
+
+        await _settle()
+        assert len(bus.events) == 4 * _OVERFLOW_FACTOR
+        (overflow,) = metric_points(reader, "paty_bus_observer_ring_overflow_total")
+        assert overflow.value == 4 * _OVERFLOW_FACTOR - 4
+        (dropped,) = metric_points(reader, "paty_bus_observer_frames_dropped_total")
+        assert dropped.value == 30 - 4 * _OVERFLOW_FACTOR
+        assert dict(dropped.attributes) == {"kind": "control"}
+        await observer.cleanup()
+
+    async def test_events_are_timestamped_at_push(self, metered):
+        meter, _ = metered
+        bus = _RecordingBus()
+        observer = BusObserver(bus, ring_size=8, meter=meter)  # type: ignore[arg-type]
+        for now, frame in (
+            (100, UserStartedSpeakingFrame()),
+            (900, InterimTranscriptionFrame("hi", "u", "t")),
+            (1300, UserStoppedSpeakingFrame()),
+        ):
+            bus.now = now
+            await observer.on_push_frame(_pushed(frame))
+        bus.now = 5000  # drained long after
+        await _settle()
+
+        stopped = [
+            (d, t)
+            for (e, d), t in zip(bus.events, bus.times, strict=True)
+            if e == EventType.USER_SPEECH_STOPPED
+        ]
+        assert stopped[0][0].duration_ms == 1200
+        assert 5000 not in bus.times
+        await observer.cleanup()
+
+    async def test_cleanup_flushes_the_ring(self, metered):
+        meter, _ = metered
+        bus = _RecordingBus()
+        observer = BusObserver(bus, ring_size=8, meter=meter)  # type: ignore[arg-type]
+        await observer.on_push_frame(_pushed(TranscriptionFrame("bye", "u", "t")))
+        await observer.cleanup()
+        assert [e for e, _ in bus.events] == [EventType.USER_TRANSCRIPT_FINAL]
+
+
+class TestObserverBench:
+    async def test_smoke(self):
+        from paty.bus.bench import run_observer_bench
+
+        report = await run_observer_bench(turns=1)
+        assert report.observations > report.frames > 0
+        assert report.ns_per_observation > 0
@@ -0,0 +1,205 @@
+"""Tests for the LLM → TTS sentence chunker."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+
+import pytest
+from pipecat.frames.frames import (
+    AggregatedTextFrame,
+    InterruptionFrame,
+    LLMTextFrame,
+)
+from pipecat.processors.aggregators.llm_text_processor import LLMTextProcessor
+from pipecat.processors.frame_processor import FrameDirection
+
+from paty.config.schema import ChunkerConfig, PipelineConfig
+from paty.pipeline.bench import tokens
+from paty.pipeline.chunker import ClauseAggregator, SentenceChunker
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _feed(aggregator: ClauseAggregator, text: str) -> list[str]:
+    chunks = []
+    for token in tokens(text):
+        async for aggregation in aggregator.aggregate(token):
+            chunks.append(aggregation.text)
+    remaining = await aggregator.flush()
+    if remaining:
+        chunks.append(remaining.text)
+    return chunks
+
+
+class TestClauseAggregator:
+    async def test_first_clause_then_whole_sentences(self):
+        chunks = await _feed(
+            ClauseAggregator(),
+            "Well now, I think so. It is a fine day. Yes. We should go "
+            "outside and see it.",
+        )
+        assert chunks == [
+            "Well now,",
+            "I think so. It is a fine day.",  # 3 words < min_words: merged
+            "Yes. We should go outside and see it.",
+        ]
+
+    async def test_short_first_sentence_is_not_held_back(self):
+        chunks = await _feed(ClauseAggregator(), "Okay. Setting a timer now.")
+        assert chunks[0] == "Okay."
+
+    async def test_single_word_clause_waits_for_more(self):
+        chunks = await _feed(ClauseAggregator(), "Sure, I can do that for you.")
+        assert chunks == ["Sure, I can do that for you."]
+
+    async def test_numbers_and_times_are_not_split(self):
+        chunks = await _feed(
+            ClauseAggregator(ChunkerConfig(first_max_words=50)),
+            "It costs $29.99 at 3:30 today.",
+        )
+        assert chunks == ["It costs $29.99 at 3:30 today."]
+
+    async def test_first_chunk_cut_at_word_cap(self):
+        policy = ChunkerConfig(first_max_words=4)
+        chunks = await _feed(
+            ClauseAggregator(policy), "one two three four five six seven"
+        )
+        assert chunks[0] == "one two three four"
+
+    async def test_first_chunk_cut_after_wait(self):
+        clock = _Clock()
+        aggregator = ClauseAggregator(ChunkerConfig(first_max_wait_ms=300), clock=clock)
+        out = [a.text async for a in aggregator.aggregate("Let me")]
+        assert out == []
+        clock.now = 0.35
+        out = [a.text async for a in aggregator.aggregate(" think")]
+        assert out == ["Let me"]
+
+    async def test_long_run_is_cut_at_last_clause(self):
+        policy = ChunkerConfig(max_words=8)
+        text = "First off. " + "alpha beta gamma, delta epsilon zeta eta theta iota"
+        chunks = await _feed(ClauseAggregator(policy), text)
+        assert chunks[1] == "alpha beta gamma,"
+
+    async def test_flush_starts_the_next_response_eagerly(self):
+        aggregator = ClauseAggregator()
+        await _feed(aggregator, "One sentence here. And another one after it.")
+        chunks = await _feed(aggregator, "Right, of course.")
+        assert chunks == ["Right, of course."]
+
+
+class TestSentenceChunker:
+    @pytest.fixture
+    def make_chunker(self):
+        def make(policy: ChunkerConfig | None = None, clock=None):
+            chunker = SentenceChunker(policy, clock=clock or _Clock())
+            pushed: list = []
+
+            async def capture(frame, direction=FrameDirection.DOWNSTREAM):
+                pushed.append(frame)
+
+            async def cancel_task(task, timeout=None):
+                task.cancel()
+
+            def create_task(coro, name=None):
+                return asyncio.create_task(coro)
+
+            chunker.push_frame = capture  # type: ignore[method-assign]
+            chunker.create_task = create_task  # type: ignore[method-assign]
+            chunker.cancel_task = cancel_task  # type: ignore[method-assign]
+            return chunker, pushed
+
+        return make
+
+    @pytest.fixture
+    def chunker_and_pushed(self, make_chunker):
+        return make_chunker()
+
+    async def test_emits_aggregated_text_and_flushes_on_end(self, chunker_and_pushed):
+        chunker, pushed = chunker_and_pushed
+        for token in tokens("Hi there, friend. How are you"):
+            await chunker._handle_llm_text(LLMTextFrame(token))
+        await chunker._handle_llm_end()
+        texts = [f.text for f in pushed if isinstance(f, AggregatedTextFrame)]
+        assert texts == ["Hi there,", "friend. How are you"]
+
+    async def test_interruption_drops_buffered_text(self, chunker_and_pushed):
+        chunker, pushed = chunker_and_pushed
+        await chunker._handle_llm_text(LLMTextFrame("Half a"))
+        await chunker._handle_interruption(InterruptionFrame())
+        await chunker._handle_llm_end()
+        assert not [f for f in pushed if isinstance(f, AggregatedTextFrame)]
+
+    async def test_stalled_first_chunk_is_sent_at_the_deadline(self, make_chunker):
+        clock = _Clock()
+        chunker, pushed = make_chunker(ChunkerConfig(first_max_wait_ms=50), clock)
+        await chunker._handle_llm_text(LLMTextFrame("Let me"))
+        await chunker._handle_llm_text(LLMTextFrame(" see"))
+        assert pushed == []
+
+        clock.now = 0.06  # the LLM stalls; no more tokens come
+        await asyncio.wait_for(chunker._first_timer, timeout=1)
+        texts = [f.text for f in pushed if isinstance(f, AggregatedTextFrame)]
+        assert texts == ["Let me see"]
+
+        # Later text is chunked as whole sentences.
+        for token in tokens(" what I can find. Done."):
+            await chunker._handle_llm_text(LLMTextFrame(token))
+        await chunker._handle_llm_end()
+        texts = [f.text for f in pushed if isinstance(f, AggregatedTextFrame)]
+        assert texts == ["Let me see", "what I can find.", "Done."]
+
+    async def test_first_chunk_in_time_stops_the_timer(self, make_chunker):
+        chunker, pushed = make_chunker(ChunkerConfig(first_max_wait_ms=50))
+        await chunker._handle_llm_text(LLMTextFrame("Hi"))
+        timer = chunker._first_timer
+        await chunker._handle_llm_text(LLMTextFrame(" there, friend"))
+        await asyncio.wait_for(timer, timeout=1)
+        texts = [f.text for f in pushed if isinstance(f, AggregatedTextFrame)]
+        assert texts == ["Hi there,"]
+
+    def test_policy_lives_in_pipeline_config(self):
+        cfg = PipelineConfig.model_validate({"chunker": {"first_min_words": 1}})
+        assert cfg.chunker.first_min_words == 1
+        assert not cfg.chunker.enabled
+
+    @pytest.mark.parametrize(
+        "hook", ["_handle_llm_text", "_handle_llm_end", "_handle_interruption"]
+    )
+    def test_overridden_pipecat_hooks_still_exist(self, hook):
+        # Private LLMTextProcessor methods: if Pipecat renames one, the
+        # override would silently never run.
+        base = getattr(LLMTextProcessor, hook, None)
+        assert base is not None, f"LLMTextProcessor.{hook} is gone"
+        assert getattr(SentenceChunker, hook) is not base
+        ours = inspect.signature(getattr(SentenceChunker, hook)).parameters
+        assert len(ours) == len(inspect.signature(base).parameters)
+
+
+class TestTTSBench:
+    async def test_chunker_reaches_first_audio_no_later(self, monkeypatch):
+        # Pipecat's sentence aggregator needs NLTK data; stand in for it.
+        import re
+
+        import pipecat.utils.text.simple_text_aggregator as simple
+
+        from paty.pipeline.bench import TTSBenchConfig, run_tts_bench
+
+        def end_of_sentence(text: str) -> int:
+            m = re.search(r"[.!?]+(?=\s+\S)", text)
+            return m.end() if m else 0
+
+        monkeypatch.setattr(simple, "match_endofsentence", end_of_sentence)
+        sentence, chunker = await run_tts_bench(TTSBenchConfig())
+        for base, ours in zip(
+            sentence.first_audio_ms, chunker.first_audio_ms, strict=True
+        ):
+            assert ours <= base
+        assert max(chunker.first_audio_ms) < max(sentence.first_audio_ms)
@@ -0,0 +1,134 @@
+"""Tests for the priority GPU scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from paty.runtime.gpu_executor import Priority, create_gpu_executor, gpu_lane
+from tests.conftest import metric_points
+
+
+@pytest.fixture
+def scheduler(metered):
+    scheduler = create_gpu_executor(meter=metered[0])
+    yield scheduler
+    scheduler.shutdown(wait=True, cancel_futures=True)
+
+
+def _block(scheduler):
+    """Occupy the worker until the returned event is set (or 5 s pass)."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(timeout=5)
+
+    scheduler.submit(hold)
+    started.wait()
+    return release
+
+
+class TestGPUScheduler:
+    def test_every_job_runs_on_one_thread(self, scheduler):
+        stt = scheduler.lane("stt", Priority.TURN)
+        tts = scheduler.lane("tts", Priority.SPEECH)
+        futures = [
+            lane.submit(threading.get_ident) for lane in (stt, tts) for _ in range(10)
+        ]
+        assert len({f.result() for f in futures}) == 1
+
+    def test_most_urgent_first_then_fifo(self, scheduler):
+        release = _block(scheduler)
+        ran = []
+        jobs = [
+            ("interim", Priority.BACKGROUND),
+            ("segment 1", Priority.SPEECH),
+            ("turn", Priority.TURN),
+            ("segment 2", Priority.SPEECH),
+        ]
+        futures = [
+            scheduler.lane("x", priority).submit(ran.append, name)
+            for name, priority in jobs
+        ]
+        release.set()
+        for f in futures:
+            f.result()
+        assert ran == ["turn", "segment 1", "segment 2", "interim"]
+
+    def test_exceptions_reach_the_caller(self, scheduler):
+        future = scheduler.submit(lambda: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            future.result()
+        assert scheduler.submit(lambda: 42).result() == 42
+
+    async def test_cancelled_awaiter_drops_the_queued_job(self, scheduler, metered):
+        _, reader = metered
+        release = _block(scheduler)
+        ran = []
+        tts = scheduler.lane("tts", Priority.SPEECH)
+        loop = asyncio.get_running_loop()
+
+        async def synthesize():
+            await loop.run_in_executor(tts, ran.append, "segment")
+
+        task = asyncio.create_task(synthesize())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        scheduler.submit(lambda: None).result()
+
+        assert ran == []
+        (cancelled,) = metric_points(reader, "paty_gpu_jobs_cancelled_total")
+        assert dict(cancelled.attributes) == {"service": "tts"}
+        assert cancelled.value == 1
+
+    def test_idle_worker_keeps_no_job_alive(self, scheduler):
+        class Payload:
+            pass
+
+        arg = Payload()
+        future = scheduler.submit(lambda _: Payload(), arg)
+        refs = [weakref.ref(arg), weakref.ref(future.result())]
+        del arg, future
+        deadline = time.monotonic() + 1
+        while any(r() for r in refs) and time.monotonic() < deadline:
+            gc.collect()
+            time.sleep(0.01)
+        assert not any(r() for r in refs)
+
+    def test_queue_wait_is_recorded_per_service(self, scheduler, metered):
+        _, reader = metered
+        scheduler.lane("stt", Priority.TURN).submit(lambda: None).result()
+        scheduler.lane("tts", Priority.SPEECH).submit(lambda: None).result()
+
+        waits = {
+            dict(dp.attributes)["service"]: dict(dp.attributes)["priority"]
+            for dp in metric_points(reader, "paty_gpu_queue_wait_seconds")
+        }
+        assert waits == {"stt": "turn", "tts": "speech"}
+
+    def test_shutdown(self, metered):
+        scheduler = create_gpu_executor(meter=metered[0])
+        release = _block(scheduler)
+        queued = scheduler.submit(lambda: None)
+        scheduler.shutdown(wait=False, cancel_futures=True)
+        release.set()
+
+        assert queued.cancelled()
+        with pytest.raises(RuntimeError):
+            scheduler.submit(lambda: None)
+
+
+def test_other_executors_have_no_lanes():
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert gpu_lane(pool, "tts", Priority.SPEECH) is pool
@@ -9,7 +9,11 @@ from opentelemetry.sdk.metrics import MeterProvider
 from opentelemetry.sdk.metrics.export import InMemoryMetricReader
 
 from paty.config.schema import MetricsConfig
-from paty.metrics.observer import PipelineMetricsObserver, _classify_processor
+from paty.metrics.observer import (
+    FirstPushObserver,
+    PipelineMetricsObserver,
+    _classify_processor,
+)
 
 
 class TestClassifyProcessor:
@@ -85,16 +89,46 @@ class TestPipelineMetricsObserver:
             processor="OpenAILLMService", model="gpt-4", value=0.35
         )
         frame = MetricsFrame(data=[ttfb_data])
+        # First push from the LLM, then the same frame on downstream hops.
+        for source in ("OpenAILLMService", "KokoroTTSService", "Output"):
+            pushed = MagicMock()
+            pushed.frame = frame
+            pushed.source.name = source
+            await observer.on_push_frame(pushed)
+
+        data = self._reader.get_metrics_data()
+        counts = [
+            dp.count
+            for rm in data.resource_metrics
+            for sm in rm.scope_metrics
+            for m in sm.metrics
+            if m.name == "paty_llm_ttfb_seconds"
+            for dp in m.data.data_points
+        ]
+        assert counts == [1]
+
+    @pytest.mark.asyncio
+    async def test_entries_from_other_processors_are_not_recorded(self):
+        """A frame first pushed by a processor that didn't measure it is skipped."""
+        from pipecat.frames.frames import MetricsFrame
+        from pipecat.metrics.metrics import TTFBMetricsData
+
+        observer = PipelineMetricsObserver(meter=self._meter)
+
+        ttfb_data = TTFBMetricsData(processor="OpenAILLMService", value=0.35)
         pushed = MagicMock()
-        pushed.frame = frame
-        # Downstream hop: source is the TTS processor, not the LLM that emitted it.
+        pushed.frame = MetricsFrame(data=[ttfb_data])
         pushed.source.name = "KokoroTTSService"
-
         await observer.on_push_frame(pushed)
 
         data = self._reader.get_metrics_data()
-        # No resource_metrics means nothing was recorded, which is what we want.
-        assert data is None or not data.resource_metrics
+        names = [
+            m.name
+            for rm in (data.resource_metrics if data else [])
+            for sm in rm.scope_metrics
+            for m in sm.metrics
+        ]
+        assert "paty_llm_ttfb_seconds" not in names
 
     @pytest.mark.asyncio
     async def test_tts_chars_recording(self):
@@ -121,6 +155,41 @@ class TestPipelineMetricsObserver:
         assert "paty_tts_characters_total" in metric_names
 
 
+class TestFirstPushObserver:
+    def test_each_observer_sees_a_frame_once(self):
+        from pipecat.frames.frames import TextFrame
+
+        a, b = FirstPushObserver(), FirstPushObserver()
+        frame = TextFrame("hi")
+        assert a._first_push(frame) and b._first_push(frame)
+        assert not a._first_push(frame) and not b._first_push(frame)
+        assert a._first_push(TextFrame("again"))
+
+    def test_new_observer_sees_frames_tagged_by_a_gone_one(self):
+        import gc
+
+        from pipecat.frames.frames import TextFrame
+
+        a = FirstPushObserver()
+        frame = TextFrame("hi")
+        a._first_push(frame)
+        attr = a._seen_attr
+        del a
+        gc.collect()
+        b = FirstPushObserver()
+        assert b._seen_attr != attr
+        assert b._first_push(frame)
+
+    def test_frames_carry_only_their_observers_tags(self):
+        from pipecat.frames.frames import TextFrame
+
+        observers = [FirstPushObserver() for _ in range(100)]
+        frame = TextFrame("hi")
+        observers[-1]._first_push(frame)
+        tags = [name for name in vars(frame) if name.startswith("_paty_seen_")]
+        assert tags == [observers[-1]._seen_attr]
+
+
 class TestSetupMetrics:
     def test_setup_returns_handle(self):
         from paty.metrics.setup import setup_metrics
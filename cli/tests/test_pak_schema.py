@@ -50,6 +50,7 @@ class TestPakManifest:
         assert m.pak.soul == "soul.md"
         assert isinstance(m.voice, PakVoiceConfig)
         assert m.voice.tts.provider == "kokoro"
+        assert m.voice.phrases == []
 
     def test_full(self):
         data = {
@@ -62,6 +63,7 @@ class TestPakManifest:
             "voice": {
                 "tts": {"provider": "kokoro", "voice": "af_nova"},
                 "llm": {"model": "qwen3:8b"},
+                "phrases": ["Hi, I'm Nova!", "Sure."],
             },
             "conversation": {"retention_days": 7, "max_turns_loaded": 25},
         }
@@ -69,6 +71,7 @@ class TestPakManifest:
         assert m.pak.version == "0.2.0"
         assert m.voice.tts.voice == "af_nova"
         assert m.voice.llm.model == "qwen3:8b"
+        assert m.voice.phrases == ["Hi, I'm Nova!", "Sure."]
         assert m.conversation.retention_days == 7
 
     def test_missing_pak_block_raises(self):
@@ -0,0 +1,231 @@
+"""Tests for speculative LLM prefill on interim transcripts (server faked)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from pipecat.frames.frames import (
+    InterimTranscriptionFrame,
+    MetricsFrame,
+    TranscriptionFrame,
+)
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection
+
+from paty.config.schema import LLMPrefillConfig
+from paty.metrics.observer import PipelineMetricsObserver
+from paty.pipeline.prefill import (
+    LLMPrefillMetricsData,
+    SpeculativePrefill,
+    stable_prefix,
+)
+
+PERSONA = {"role": "system", "content": "You are PATY."}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def make_prefill():
+    def make(status: int = 200, **policy):
+        requests: list[dict] = []
+        clock = _Clock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            clock.now += 0.25  # server time per prefill
+            return httpx.Response(status, json={"choices": []})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        prefill = SpeculativePrefill(
+            "http://127.0.0.1:8080/v1/",
+            "qwen",
+            policy=LLMPrefillConfig(**policy),
+            context=LLMContext([PERSONA]),
+            client=client,
+            clock=clock,
+        )
+        prefill.pushed = []
+
+        async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+            prefill.pushed.append(frame)
+
+        prefill.push_frame = push_frame
+        prefill.tasks = []
+
+        def create_task(coro, name=None):
+            prefill.tasks.append(asyncio.create_task(coro))
+            return prefill.tasks[-1]
+
+        prefill.create_task = create_task
+        return prefill, requests
+
+    return make
+
+
+async def _hear(prefill, *interims: str, final: str | None = None) -> None:
+    for text in interims:
+        await prefill.process_frame(
+            InterimTranscriptionFrame(text, "user", "now"), FrameDirection.DOWNSTREAM
+        )
+        while prefill.tasks:
+            await prefill.tasks.pop()
+    if final is not None:
+        await prefill.process_frame(
+            TranscriptionFrame(final, "user", "now"), FrameDirection.DOWNSTREAM
+        )
+
+
+def _outcomes(prefill) -> list[LLMPrefillMetricsData]:
+    return [
+        entry
+        for frame in prefill.pushed
+        if isinstance(frame, MetricsFrame)
+        for entry in frame.data
+    ]
+
+
+class TestStablePrefix:
+    def test_words_both_interims_agree_on(self):
+        assert stable_prefix("what is the", "what is their name") == "what is"
+
+    def test_nothing_before_the_first_interim(self):
+        assert stable_prefix("", "what is") == ""
+
+    def test_ignores_case_and_punctuation(self):
+        assert stable_prefix("hello there", "Hello, there friend") == "Hello, there"
+
+
+class TestSpeculativePrefill:
+    async def test_prefills_stable_words_with_the_context(self, make_prefill):
+        prefill, requests = make_prefill()
+        await _hear(
+            prefill,
+            "what's the weather",
+            "what's the weather like",
+            final="what's the weather like today",
+        )
+
+        (request,) = requests
+        assert request["model"] == "qwen"
+        assert request["max_tokens"] == 1
+        assert request["messages"] == [
+            PERSONA,
+            {"role": "user", "content": "what's the weather"},
+        ]
+        (outcome,) = _outcomes(prefill)
+        assert outcome.hit
+        assert outcome.value == pytest.approx(0.25)
+        # The transcript goes ahead of its metrics.
+        assert isinstance(prefill.pushed[-2], TranscriptionFrame)
+
+    async def test_waits_for_enough_new_words(self, make_prefill):
+        prefill, requests = make_prefill(min_words=2, min_new_words=2)
+        await _hear(
+            prefill,
+            "one two",
+            "one two three",
+            "one two three",
+            "one two three four",
+            "one two three four five",
+            final="one two three four five",
+        )
+
+        assert [r["messages"][-1]["content"] for r in requests] == [
+            "one two",
+            "one two three four",
+        ]
+        (outcome,) = _outcomes(prefill)
+        assert outcome.value == pytest.approx(0.5)
+
+    async def test_revised_words_are_a_miss(self, make_prefill):
+        prefill, requests = make_prefill()
+        await _hear(
+            prefill, "wreck a nice", "wreck a nice beach", final="recognize speech"
+        )
+
+        assert len(requests) == 1
+        (outcome,) = _outcomes(prefill)
+        assert not outcome.hit
+        assert outcome.value == 0
+
+    async def test_punctuation_differences_still_hit(self, make_prefill):
+        prefill, requests = make_prefill(min_words=2)
+        await _hear(prefill, "hello there", "hello there how", final="Hello, there.")
+
+        assert [r["messages"][-1]["content"] for r in requests] == ["hello there"]
+        (outcome,) = _outcomes(prefill)
+        assert outcome.hit
+        assert outcome.value == pytest.approx(0.25)
+
+    async def test_no_prefill_no_metrics(self, make_prefill):
+        prefill, requests = make_prefill()
+        await _hear(prefill, "hi", "hi there", final="hi there")
+
+        assert requests == []
+        assert [type(f) for f in prefill.pushed] == [
+            InterimTranscriptionFrame,
+            InterimTranscriptionFrame,
+            TranscriptionFrame,
+        ]
+
+    async def test_failed_prefill_is_forgotten(self, make_prefill):
+        prefill, requests = make_prefill(status=503)
+        await _hear(prefill, "a b c", "a b c d", final="a b c d")
+
+        assert len(requests) == 1
+        assert _outcomes(prefill) == []
+
+    async def test_state_resets_between_turns(self, make_prefill):
+        prefill, requests = make_prefill()
+        await _hear(prefill, "a b c", "a b c d", final="a b c d")
+        await _hear(prefill, "e f g", "e f g h", final="e f g h")
+
+        assert [r["messages"][-1]["content"] for r in requests] == ["a b c", "e f g"]
+        assert [o.hit for o in _outcomes(prefill)] == [True, True]
+
+
+class TestObserver:
+    async def test_records_hits_and_saved_time(self):
+        reader = InMemoryMetricReader()
+        provider = MeterProvider(metric_readers=[reader])
+        observer = PipelineMetricsObserver(meter=provider.get_meter("paty-test"))
+
+        class _Pushed:
+            def __init__(self, frame):
+                self.frame = frame
+                self.source = SimpleNamespace(name="prefill")
+
+        for data in (
+            LLMPrefillMetricsData(processor="prefill", value=0.2, hit=True),
+            LLMPrefillMetricsData(processor="prefill", value=0.0, hit=False),
+        ):
+            await observer.on_push_frame(_Pushed(MetricsFrame(data=[data])))
+
+        metrics = {
+            m.name: m.data.data_points
+            for rm in reader.get_metrics_data().resource_metrics
+            for sm in rm.scope_metrics
+            for m in sm.metrics
+        }
+        provider.shutdown()
+        results = {
+            dict(dp.attributes)["result"]: dp.value
+            for dp in metrics["paty_llm_prefills_total"]
+        }
+        assert results == {"hit": 1, "miss": 1}
+        (saved,) = metrics["paty_llm_prefill_saved_seconds"]
+        assert saved.count == 1
+        assert saved.sum == pytest.approx(0.2)
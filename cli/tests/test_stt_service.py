@@ -0,0 +1,265 @@
+"""Tests for MLXAudioSTTService's input handling and streaming (model faked)."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import itertools
+import sys
+import threading
+import wave
+from types import ModuleType, SimpleNamespace
+
+import numpy as np
+import pytest
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    InterimTranscriptionFrame,
+    TranscriptionFrame,
+    VADUserStartedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+
+from paty.runtime.gpu_executor import create_gpu_executor
+from paty.runtime.speculative_stt import speculate_stt
+from paty.runtime.stt_service import SAMPLE_RATE, MLXAudioSTTService
+from tests.conftest import metric_points
+
+FRAME_S = 0.02
+WORD_S = 0.3
+GAP_S = 0.15
+
+
+class _FakeRecognizer:
+    """Hears each distinct nonzero amplitude (in hundredths) as one word."""
+
+    def __init__(self) -> None:
+        self.heard: list[np.ndarray] = []
+
+    def generate(self, audio):
+        audio = np.array(audio)
+        self.heard.append(audio)
+        levels = np.rint(np.abs(audio) * 100).astype(int)
+        words = [
+            w for i, w in enumerate(levels) if w and (i == 0 or levels[i - 1] != w)
+        ]
+        return SimpleNamespace(text=" " + " ".join(f"w{w}" for w in words) + " ")
+
+
+def _wav(pcm: bytes) -> bytes:
+    """A WAV file the way Pipecat's SegmentedSTTService writes one."""
+    content = io.BytesIO()
+    with wave.open(content, "wb") as wav:
+        wav.setsampwidth(2)
+        wav.setnchannels(1)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+    return content.getvalue()
+
+
+def _speech(words: int) -> np.ndarray:
+    """Words of WORD_S at amplitude n/100, each followed by GAP_S of silence."""
+    parts = []
+    for n in range(1, words + 1):
+        parts.append(np.full(int(WORD_S * SAMPLE_RATE), n * 327, dtype=np.int16))
+        parts.append(np.zeros(int(GAP_S * SAMPLE_RATE), dtype=np.int16))
+    return np.concatenate(parts)
+
+
+@pytest.fixture
+def make_stt(monkeypatch):
+    # ``_transcribe_sync`` hands the samples to MLX; stand in with NumPy.
+    mlx, core = ModuleType("mlx"), ModuleType("mlx.core")
+    mlx.__path__, mlx.core, core.array = [], core, np.array
+    monkeypatch.setitem(sys.modules, "mlx", mlx)
+    monkeypatch.setitem(sys.modules, "mlx.core", core)
+    executor = create_gpu_executor()
+
+    def make(**kwargs):
+        model = _FakeRecognizer()
+        monkeypatch.setattr(MLXAudioSTTService, "_load_model", lambda self: model)
+        service = MLXAudioSTTService(compute_executor=executor, **kwargs)
+        service._sample_rate = SAMPLE_RATE  # what StartFrame sets
+        service.gpu = executor
+        service.pushed = []
+
+        async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+            service.pushed.append(frame)
+
+        service.push_frame = push_frame
+        service.tasks = []
+
+        def create_task(coro, name=None):
+            service.tasks.append(asyncio.create_task(coro))
+            return service.tasks[-1]
+
+        service.create_task = create_task
+        return service, model
+
+    yield make
+    executor.shutdown(wait=True)
+
+
+async def _say(service, samples: np.ndarray) -> None:
+    """Feed ``samples`` as VAD-bracketed 20 ms frames, letting jobs finish."""
+    step = int(FRAME_S * SAMPLE_RATE)
+    await service.process_audio_frame(
+        AudioRawFrame(bytes(step * 2), SAMPLE_RATE, 1), FrameDirection.DOWNSTREAM
+    )
+    await service._handle_user_started_speaking(VADUserStartedSpeakingFrame())
+    for i in range(0, samples.size, step):
+        chunk = samples[i : i + step].tobytes()
+        await service.process_audio_frame(
+            AudioRawFrame(chunk, SAMPLE_RATE, 1), FrameDirection.DOWNSTREAM
+        )
+        while service.tasks:
+            await asyncio.wait([service.tasks.pop()])
+    await service._handle_user_stopped_speaking(VADUserStoppedSpeakingFrame())
+
+
+def _quiet(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16)
+
+
+def _speculations(reader) -> dict[str, int]:
+    return {
+        dict(dp.attributes)["result"]: dp.value
+        for dp in metric_points(reader, "paty_stt_speculations_total")
+    }
+
+
+def _expected(words: int) -> str:
+    return " ".join(f"w{n}" for n in range(1, words + 1))
+
+
+class TestInput:
+    async def test_wav_header_is_not_transcribed(self, make_stt):
+        service, model = make_stt()
+        pcm = np.full(160, 16384, dtype=np.int16).tobytes()
+        frames = [frame async for frame in service.run_stt(_wav(pcm))]
+
+        assert [f.text for f in frames if isinstance(f, TranscriptionFrame)] == ["w50"]
+        (heard,) = model.heard
+        assert heard.size == 160
+
+
+class TestStreaming:
+    async def test_interims_grow_during_speech(self, make_stt):
+        service, _ = make_stt(interim_interval_s=0.5, window_s=30)
+        await _say(service, _speech(6))
+
+        interims = [
+            f.text for f in service.pushed if isinstance(f, InterimTranscriptionFrame)
+        ]
+        assert len(interims) >= 4
+        assert all(
+            later.startswith(earlier.rsplit(" ", 1)[0])
+            for earlier, later in itertools.pairwise(interims)
+        )
+        assert isinstance(service.pushed[-1], TranscriptionFrame)
+        assert service.pushed[-1].text == _expected(6)
+
+    async def test_commits_keep_the_final_pass_short(self, make_stt):
+        service, model = make_stt(interim_interval_s=0.5, window_s=2.0)
+        await _say(service, _speech(20))
+
+        # Cuts land in the gaps, so no word is lost or heard twice.
+        assert service.pushed[-1].text == _expected(20)
+        # The final pass only covered the open window, not 9 s of speech.
+        assert model.heard[-1].size <= (2.0 + 0.5 + FRAME_S) * SAMPLE_RATE
+
+    async def test_state_resets_between_utterances(self, make_stt):
+        service, _ = make_stt(interim_interval_s=0.5, window_s=2.0)
+        await _say(service, _speech(8))
+        service.pushed.clear()
+        await _say(service, _speech(3))
+        assert service.pushed[-1].text == _expected(3)
+
+    async def test_queued_interim_is_dropped_at_the_end_of_the_turn(self, make_stt):
+        service, model = make_stt(interim_interval_s=0.5, window_s=30)
+        step = int(FRAME_S * SAMPLE_RATE)
+        samples = _speech(2)
+        # The GPU is busy (with TTS, say) while the interim is due.
+        service.gpu.submit(threading.Event().wait, 0.2)
+        await service._handle_user_started_speaking(VADUserStartedSpeakingFrame())
+        for i in range(0, samples.size, step):
+            await service.process_audio_frame(
+                AudioRawFrame(samples[i : i + step].tobytes(), SAMPLE_RATE, 1),
+                FrameDirection.DOWNSTREAM,
+            )
+        await asyncio.sleep(0)
+        assert service._interim is not None
+        await service._handle_user_stopped_speaking(VADUserStoppedSpeakingFrame())
+
+        assert [f.text for f in service.pushed] == [_expected(2)]
+        assert len(model.heard) == 1  # only the final pass
+
+    async def test_off_is_plain_segmented(self, make_stt):
+        service, model = make_stt()
+        await _say(service, _speech(8))
+
+        assert [type(f) for f in service.pushed] == [TranscriptionFrame]
+        assert service.pushed[0].text == _expected(8)
+        assert len(model.heard) == 1
+
+
+class TestSpeculation:
+    async def test_streaming_service_skips_the_final_pass(self, make_stt, metered):
+        meter, reader = metered
+        service, model = make_stt(
+            interim_interval_s=5.0, window_s=30, pause_s=0.1, meter=meter
+        )
+        await _say(service, np.concatenate([_speech(4), _quiet(0.8)]))
+
+        assert service.pushed[-1].text == _expected(4)
+        # One interim per pause and no final pass.
+        assert len(model.heard) == 4
+        assert _speculations(reader) == {"discarded": 3, "used": 1}
+
+    async def test_segmented_service_uses_the_speculation(self, make_stt, metered):
+        meter, reader = metered
+        service, model = make_stt()
+        speculate_stt(service, pause_s=0.1, meter=meter)
+        await _say(service, np.concatenate([_speech(4), _quiet(0.8)]))
+
+        assert [type(f) for f in service.pushed] == [TranscriptionFrame]
+        assert service.pushed[0].text == _expected(4)
+        assert len(model.heard) == 4
+        assert _speculations(reader) == {"discarded": 3, "used": 1}
+
+    async def test_speech_after_the_pause_falls_back(self, make_stt, metered):
+        meter, reader = metered
+        service, model = make_stt()
+        speculate_stt(service, pause_s=0.1, meter=meter)
+        late_word = np.full(int(WORD_S * SAMPLE_RATE), 3 * 327, dtype=np.int16)
+        await _say(service, np.concatenate([_speech(2), late_word]))
+
+        assert service.pushed[-1].text == _expected(3)
+        assert len(model.heard) == 3  # two speculations, then the real pass
+        assert _speculations(reader) == {"discarded": 2}
+
+    async def test_stale_speculation_is_cancelled_not_awaited(self, make_stt):
+        service, model = make_stt()
+        speculate_stt(service, pause_s=0.1)
+        late_word = np.full(int(WORD_S * SAMPLE_RATE), 3 * 327, dtype=np.int16)
+        samples = np.concatenate([_speech(2), late_word])
+        step = int(FRAME_S * SAMPLE_RATE)
+        await service._handle_user_started_speaking(VADUserStartedSpeakingFrame())
+        # Nothing yields to the speculations, so the last one is still pending.
+        for i in range(0, samples.size, step):
+            await service.process_audio_frame(
+                AudioRawFrame(samples[i : i + step].tobytes(), SAMPLE_RATE, 1),
+                FrameDirection.DOWNSTREAM,
+            )
+        (speculation,) = service.tasks
+        await service._handle_user_stopped_speaking(VADUserStoppedSpeakingFrame())
+
+        assert speculation.cancelled()
+        assert service.pushed[-1].text == _expected(3)
+        assert len(model.heard) == 1  # only the real pass
+
+    def test_only_segmented_services_are_wrapped(self):
+        service = SimpleNamespace(process_audio_frame=None)
+        assert speculate_stt(service, pause_s=0.1) is service
+        assert service.process_audio_frame is None
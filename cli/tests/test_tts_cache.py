@@ -0,0 +1,178 @@
+"""Tests for the TTS phrase cache."""
+
+from __future__ import annotations
+
+from pipecat.frames.frames import ErrorFrame, TTSAudioRawFrame
+
+from paty.runtime.tts_cache import CachedAudio, TTSCache, cache_tts, prewarm
+from paty.runtime.tts_service import MLXAudioTTSSettings
+from tests.conftest import metric_points
+
+
+class _FakeTTS:
+    """Stands in for a Pipecat TTSService: one audio frame per word."""
+
+    def __init__(self, voice: str = "af_bella") -> None:
+        self._settings = MLXAudioTTSSettings(model="kokoro", voice=voice, language=None)
+        self._init_sample_rate = None
+        self._sample_rate = 24000
+        self._lang_code = "a"
+        self.calls: list[str] = []
+        self.fail = False
+        self.ttfb_stops = 0
+
+    async def _handle_interruption(self, frame, direction) -> None:
+        pass
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    async def stop_ttfb_metrics(self) -> None:
+        self.ttfb_stops += 1
+
+    async def run_tts(self, text: str, context_id: str):
+        self.calls.append(text)
+        if self.fail:
+            yield ErrorFrame(error="boom")
+            return
+        for word in text.split():
+            yield TTSAudioRawFrame(
+                word.encode() * 2, self.sample_rate or 24000, 1, context_id=context_id
+            )
+
+
+async def _speak(service, text: str, context_id: str = "ctx") -> list:
+    return [frame async for frame in service.run_tts(text, context_id)]
+
+
+def _lookups(reader) -> dict[str, int]:
+    return {
+        dict(dp.attributes)["result"]: dp.value
+        for dp in metric_points(reader, "paty_tts_cache_lookups_total")
+    }
+
+
+class TestTTSCache:
+    def test_key_covers_everything_that_changes_the_audio(self):
+        cache = TTSCache()
+        svc = _FakeTTS()
+        key = cache.key("kokoro", svc, "Thank you.")
+        assert key == cache.key("kokoro", svc, "  Thank   you. ")
+        assert key != cache.key("piper", svc, "Thank you.")
+        assert key != cache.key("kokoro", _FakeTTS(voice="am_adam"), "Thank you.")
+        assert key != cache.key("kokoro", svc, "thank you.")
+        svc._lang_code = "b"
+        assert key != cache.key("kokoro", svc, "Thank you.")
+        svc._sample_rate = 16000
+        assert key != cache.key("kokoro", svc, "Thank you.")
+
+    def test_long_and_empty_texts_are_not_cached(self):
+        cache = TTSCache(max_chars=10)
+        assert cache.key("kokoro", _FakeTTS(), "far too long a sentence") is None
+        assert cache.key("kokoro", _FakeTTS(), "   ") is None
+
+    async def test_lru_evicts_oldest_past_budget(self):
+        cache = TTSCache(max_bytes=250)
+        for key in ("a", "b", "c"):
+            await cache.put(key, CachedAudio(24000, 1, (b"x" * 100,)))
+        assert len(cache) == 2
+        assert cache.nbytes == 200
+        assert await cache.get("a") is None
+        assert await cache.get("c") is not None
+
+    async def test_disk_tier_survives_a_new_cache(self, tmp_path):
+        entry = CachedAudio(24000, 1, (b"ab", b"", b"cdef"))
+        await TTSCache(directory=tmp_path).put("k" * 64, entry)
+        assert await TTSCache(directory=tmp_path).get("k" * 64) == entry
+
+    def test_unpack_rejects_truncated_entries(self):
+        packed = CachedAudio(24000, 1, (b"abcd",)).pack()
+        assert CachedAudio.unpack(packed[:-1]) is None
+        assert CachedAudio.unpack(b"nope") is None
+
+
+class TestCacheTTS:
+    async def test_repeat_is_served_from_cache(self, metered):
+        meter, reader = metered
+        svc = cache_tts(_FakeTTS(), TTSCache(meter=meter), provider="kokoro")
+        first = await _speak(svc, "Could you repeat that?", "c1")
+        again = await _speak(svc, "Could you repeat that?", "c2")
+
+        assert svc.calls == ["Could you repeat that?"]
+        assert [f.audio for f in again] == [f.audio for f in first]
+        assert {f.context_id for f in again} == {"c2"}
+        assert svc.ttfb_stops == 1
+        assert _lookups(reader) == {"miss": 1, "memory": 1}
+
+    async def test_errors_and_interruptions_are_not_cached(self):
+        svc = cache_tts(_FakeTTS(), TTSCache(), provider="kokoro")
+        svc.fail = True
+        await _speak(svc, "Hello there.")
+        svc.fail = False
+        stream = svc.run_tts("Hello there.", "ctx")
+        await anext(stream)
+        await stream.aclose()
+        await _speak(svc, "Hello there.")
+        assert len(svc.calls) == 3
+
+    async def test_disk_hit_after_restart(self, tmp_path, metered):
+        meter, reader = metered
+        await _speak(
+            cache_tts(_FakeTTS(), TTSCache(directory=tmp_path), provider="kokoro"),
+            "Good morning.",
+        )
+        svc = cache_tts(
+            _FakeTTS(), TTSCache(directory=tmp_path, meter=meter), provider="kokoro"
+        )
+        frames = await _speak(svc, "Good morning.")
+        assert svc.calls == []
+        assert len(frames) == 2
+        assert _lookups(reader) == {"disk": 1}
+
+
+class TestPrewarm:
+    async def test_prewarmed_phrases_are_memory_hits(self, metered):
+        meter, reader = metered
+        svc = cache_tts(_FakeTTS(), TTSCache(meter=meter), provider="kokoro")
+        assert (
+            await prewarm(svc, ["Sure.", "Hmm, let me think."], sample_rate=24000) == 2
+        )
+        assert _lookups(reader) == {}
+
+        await _speak(svc, "Hmm, let me think.")
+        assert svc.calls == ["Sure.", "Hmm, let me think."]
+        assert _lookups(reader) == {"memory": 1}
+
+    async def test_skips_cached_and_uncacheable_phrases(self, tmp_path):
+        await _speak(
+            cache_tts(_FakeTTS(), TTSCache(directory=tmp_path), provider="kokoro"),
+            "Okay.",
+        )
+        svc = cache_tts(
+            _FakeTTS(), TTSCache(directory=tmp_path, max_chars=20), provider="kokoro"
+        )
+        phrases = ["Okay.", "Okay.", "", "Far too long to be worth caching."]
+        assert await prewarm(svc, phrases, sample_rate=24000) == 0
+        assert svc.calls == []
+
+    async def test_keys_match_the_started_pipeline(self):
+        svc = cache_tts(_FakeTTS(), TTSCache(), provider="kokoro")
+        svc._sample_rate = 0  # not started yet
+        assert await prewarm(svc, ["Sure."], sample_rate=24000) == 1
+        assert svc.sample_rate == 0
+
+        svc._sample_rate = 24000  # what StartFrame sets
+        await _speak(svc, "Sure.")
+        assert svc.calls == ["Sure."]
+
+    async def test_audio_at_another_rate_is_not_kept(self):
+        svc = cache_tts(_FakeTTS(), TTSCache(), provider="kokoro")
+        svc._sample_rate = 0  # makes 24 kHz until started
+        assert await prewarm(svc, ["Sure."], sample_rate=16000) == 0
+        assert len(svc.run_tts.cache) == 0
+
+    async def test_without_a_cache_is_a_noop(self):
+        svc = _FakeTTS()
+        assert await prewarm(svc, ["Sure."], sample_rate=24000) == 0
+        assert svc.calls == []
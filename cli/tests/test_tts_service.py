@@ -0,0 +1,100 @@
+"""Tests for MLXAudioTTSService's segment streaming (model faked)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from pipecat.frames.frames import InterruptionFrame, TTSAudioRawFrame
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.services.tts_service import TTSService
+
+from paty.runtime.gpu_executor import create_gpu_executor
+from paty.runtime.tts_cache import TTSCache, cache_tts
+from paty.runtime.tts_service import MLXAudioTTSService
+
+SEGMENT_S = 0.05
+
+
+class _FakeKokoro:
+    """Yields ``segments`` segments, each taking SEGMENT_S to "synthesize"."""
+
+    def __init__(self, segments: int = 4) -> None:
+        self.segments = segments
+        self.produced = 0
+        self.threads: set[str] = set()
+
+    def generate(self, **kwargs):
+        for _ in range(self.segments):
+            self.threads.add(threading.current_thread().name)
+            time.sleep(SEGMENT_S)
+            self.produced += 1
+            yield SimpleNamespace(audio=np.zeros(240), sample_rate=24000)
+
+
+@pytest.fixture
+def tts(monkeypatch):
+    model = _FakeKokoro()
+    monkeypatch.setattr(MLXAudioTTSService, "_load_model", lambda self: model)
+    executor = create_gpu_executor()
+    service = MLXAudioTTSService(compute_executor=executor)
+    service._sample_rate = 24000
+    yield service, model
+    executor.shutdown(wait=True)
+
+
+class TestSegmentStreaming:
+    async def test_first_segment_arrives_before_the_utterance_is_done(self, tts):
+        service, model = tts
+        start = time.monotonic()
+        arrivals = []
+        async for frame in service.run_tts("Hello there. How are you?", "ctx"):
+            assert isinstance(frame, TTSAudioRawFrame)
+            arrivals.append(time.monotonic() - start)
+        assert len(arrivals) == model.segments
+        assert arrivals[0] < 2 * SEGMENT_S
+        assert model.threads == {"paty-mlx"}
+
+    async def test_closing_early_stops_synthesis(self, tts):
+        service, model = tts
+        stream = service.run_tts("Hello there. How are you?", "ctx")
+        await anext(stream)
+        await stream.aclose()
+        await asyncio.get_running_loop().run_in_executor(service._executor, int)
+        assert model.produced == 1
+
+    async def test_interruption_stops_between_segments(self, tts, monkeypatch):
+        # As when Pipecat can't cancel the consumer (an uninterruptible
+        # frame is being processed): it keeps pulling frames.
+        async def base_handler(self, frame, direction):
+            pass
+
+        monkeypatch.setattr(TTSService, "_handle_interruption", base_handler)
+        service, model = tts
+        stream = service.run_tts("Hello there. How are you?", "ctx")
+        await anext(stream)
+        await service._handle_interruption(
+            InterruptionFrame(), FrameDirection.DOWNSTREAM
+        )
+        assert [frame async for frame in stream] == []
+        assert model.produced == 1
+
+    async def test_interrupted_utterance_is_not_cached(self, tts, monkeypatch):
+        async def base_handler(self, frame, direction):
+            pass
+
+        monkeypatch.setattr(TTSService, "_handle_interruption", base_handler)
+        service, _ = tts
+        cache = TTSCache()
+        cache_tts(service, cache, provider="kokoro")
+        stream = service.run_tts("Sure.", "ctx")
+        await anext(stream)
+        await service._handle_interruption(
+            InterruptionFrame(), FrameDirection.DOWNSTREAM
+        )
+        assert [frame async for frame in stream] == []
+        assert len(cache) == 0
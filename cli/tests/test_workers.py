@@ -0,0 +1,284 @@
+"""Tests for process-isolated model workers (engines faked)."""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from paty.runtime.workers import ModelWorker, ShmRing, WorkerCrashedError, _Releases
+
+# Engines are loaded in a spawned process, so they must be importable from
+# this module by name.
+
+
+class EchoSTT:
+    def __init__(self, model_repo: str) -> None:
+        self.model_repo = model_repo
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        if audio.size == 0:
+            os._exit(3)  # a model crashing hard
+        return f"{audio.size} {audio.sum():.1f}"
+
+
+class PickySTT:
+    def __init__(self, model_repo: str) -> None:
+        pass
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        if audio[0] < 0:
+            msg = "can't hear that"
+            raise ValueError(msg)
+        return "ok"
+
+
+class CountingTTS:
+    """One segment per word: ``len(word)`` samples at 0.5."""
+
+    def __init__(self, model_repo: str) -> None:
+        pass
+
+    def generate(self, *, text: str, **kwargs):
+        for word in text.split():
+            yield np.full(len(word), 0.5, dtype=np.float32), 24000
+
+
+class Unloadable:
+    def __init__(self, model_repo: str) -> None:
+        msg = f"no such model: {model_repo}"
+        raise OSError(msg)
+
+
+@pytest.fixture
+def make_worker():
+    workers = []
+
+    def make(engine, ring_bytes: int = 1 << 16) -> ModelWorker:
+        workers.append(ModelWorker(engine, "fake/model", ring_bytes=ring_bytes))
+        return workers[-1]
+
+    yield make
+    for worker in workers:
+        worker.stop()
+
+
+class TestShmRing:
+    def test_regions_wrap_to_the_start(self):
+        ring = ShmRing(16)
+        try:
+            assert ring.write(memoryview(b"abcdefghij"), released=0) == (0, 10)
+            assert ring.write(memoryview(b"123456"), released=0) == (10, 16)
+            # Starts over at 0, once the reader is done with what was there.
+            assert ring.write(memoryview(b"xyz"), released=2) is None
+            assert ring.write(memoryview(b"xyz"), released=3) == (0, 19)
+            assert bytes(ring.view(10, 6)) == b"123456"
+            assert bytes(ring.view(0, 3)) == b"xyz"
+        finally:
+            ring.close()
+
+    def test_skipped_tail_counts_as_used(self):
+        ring = ShmRing(16)
+        try:
+            ring.write(memoryview(b"abcdefghij"), released=0)
+            # 6 left at the end, 8 needed: placed at 0, ending at 24.
+            assert ring.write(memoryview(b"12345678"), released=7) is None
+            assert ring.write(memoryview(b"12345678"), released=8) == (0, 24)
+        finally:
+            ring.close()
+
+    def test_attaching_sees_the_same_bytes(self):
+        ring = ShmRing(16)
+        other = ShmRing(16, name=ring.name)
+        try:
+            ring.write(memoryview(np.arange(4, dtype=np.int16)), released=0)
+            pcm = np.frombuffer(other.view(0, 8), dtype=np.int16)
+            assert pcm.tolist() == [0, 1, 2, 3]
+            del pcm
+        finally:
+            other.close()
+            ring.close()
+
+
+def test_releases_advance_in_order():
+    releases = _Releases()
+    for end in (10, 20, 30):
+        releases.hold(end)
+    releases.done(20)
+    assert releases.position == 0
+    releases.done(10)
+    assert releases.position == 20
+    releases.done(30)
+    assert releases.position == 30
+
+
+class TestModelWorker:
+    def test_transcribes_in_its_own_process(self, make_worker):
+        worker = make_worker(EchoSTT)
+        audio = np.linspace(0, 1, 1000, dtype=np.float32)
+        for _ in range(200):  # cycles the 64 KiB ring many times over
+            assert worker.transcribe(audio) == f"1000 {audio.sum():.1f}"
+        assert worker.alive
+        assert worker._process.pid != os.getpid()
+
+    def test_audio_too_big_for_the_ring_goes_inline(self, make_worker):
+        worker = make_worker(EchoSTT, ring_bytes=1024)
+        audio = np.ones(4096, dtype=np.float32)
+        assert worker.transcribe(audio) == "4096 4096.0"
+
+    def test_failed_call_still_releases_its_region(self, make_worker):
+        worker = make_worker(PickySTT, ring_bytes=1024)
+        bad = np.full(200, -1, dtype=np.float32)  # 800 bytes: one at a time
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="can't hear that"):
+                worker.transcribe(bad)
+            assert worker._inbox_released == worker._inbox.head
+        assert worker.transcribe(np.ones(200, dtype=np.float32)) == "ok"
+        assert worker._inbox_released == worker._inbox.head
+
+    def test_synthesizes_segment_by_segment(self, make_worker):
+        worker = make_worker(CountingTTS)
+        segments = [
+            (bytes(pcm), rate)
+            for pcm, rate in worker.synthesize(text="a bb ccc", voice="af_bella")
+        ]
+        half = np.int16(0.5 * 32767).tobytes()
+        assert segments == [(half * n, 24000) for n in (1, 2, 3)]
+
+    def test_segments_too_big_for_the_ring_go_inline(self, make_worker):
+        worker = make_worker(CountingTTS, ring_bytes=8)
+        lengths = [len(pcm) for pcm, _ in worker.synthesize(text="abcdefgh ab")]
+        assert lengths == [16, 4]
+
+    def test_abandoned_stream_is_closed(self, make_worker):
+        worker = make_worker(CountingTTS)
+        segments = worker.synthesize(text="a b c")
+        next(segments)
+        segments.close()
+        with pytest.raises(RuntimeError, match="KeyError"):
+            worker._call("next", 0, 0)
+
+    def test_crash_fails_the_call_and_the_next_restarts(self, make_worker):
+        worker = make_worker(EchoSTT)
+        worker.start()
+        with pytest.raises(WorkerCrashedError):
+            worker.transcribe(np.zeros(0, dtype=np.float32))
+        assert not worker.alive
+        assert worker.transcribe(np.ones(4, dtype=np.float32)) == "4 4.0"
+        assert worker.starts == 2
+
+    def test_load_failure_is_reported(self, make_worker):
+        worker = make_worker(Unloadable)
+        with pytest.raises(RuntimeError, match="no such model"):
+            worker.start()
+        assert not worker.alive
+
+    def test_stt_and_tts_workers_run_side_by_side(self, make_worker):
+        stt, tts = make_worker(EchoSTT), make_worker(CountingTTS)
+        stt.start()
+        tts.start()
+        results = {}
+
+        def speak():
+            results["tts"] = sum(1 for _ in tts.synthesize(text="one two three"))
+
+        thread = threading.Thread(target=speak)
+        thread.start()
+        results["stt"] = stt.transcribe(np.ones(2, dtype=np.float32))
+        thread.join()
+        assert results == {"stt": "2 2.0", "tts": 3}
+        assert stt.executor is not tts.executor
+
+    def test_scheduler_records_with_the_given_meter(self):
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+        from paty.runtime.gpu_executor import Priority
+
+        reader = InMemoryMetricReader()
+        provider = MeterProvider(metric_readers=[reader])
+        worker = ModelWorker(EchoSTT, "fake/model", meter=provider.get_meter("t"))
+        try:
+            worker.executor.lane("stt", Priority.TURN).submit(lambda: None).result()
+            data = reader.get_metrics_data()
+            names = {
+                m.name
+                for rm in data.resource_metrics
+                for sm in rm.scope_metrics
+                for m in sm.metrics
+            }
+            assert "paty_gpu_queue_wait_seconds" in names
+        finally:
+            worker.stop()
+            provider.shutdown()
+
+    def test_workers_do_not_import_opentelemetry(self):
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, paty.runtime.workers; "
+            "sys.exit(any(m.startswith('opentelemetry') for m in sys.modules))"
+        )
+        assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+    def test_attaching_leaves_the_resource_tracker_alone(self):
+        import subprocess
+        import sys
+
+        code = (
+            "import numpy as np\n"
+            "from paty.runtime.workers import ModelWorker\n"
+            "from tests.test_workers import CountingTTS, EchoSTT\n"
+            "if __name__ == '__main__':\n"
+            "    stt = ModelWorker(EchoSTT, 'fake/model')\n"
+            "    tts = ModelWorker(CountingTTS, 'fake/model')\n"
+            "    stt.transcribe(np.ones(4, dtype=np.float32))\n"
+            "    list(tts.synthesize(text='a b'))\n"
+            "    stt.stop()\n"
+            "    tts.stop()\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        assert "Traceback" not in result.stderr
+        assert "resource_tracker" not in result.stderr
+
+
+class TestServices:
+    async def test_tts_service_streams_from_a_worker(self, make_worker):
+        from pipecat.frames.frames import TTSAudioRawFrame
+
+        from paty.runtime.tts_service import MLXAudioTTSService
+
+        service = MLXAudioTTSService(worker=make_worker(CountingTTS))
+        service._sample_rate = 24000
+        frames = [f async for f in service.run_tts("a bb ccc", "ctx")]
+        assert all(isinstance(f, TTSAudioRawFrame) for f in frames)
+        assert [len(f.audio) for f in frames] == [2, 4, 6]
+
+    async def test_stt_service_reports_a_crash_and_recovers(self, make_worker):
+        from pipecat.frames.frames import ErrorFrame, TranscriptionFrame
+
+        from paty.runtime.stt_service import MLXAudioSTTService
+
+        service = MLXAudioSTTService(worker=make_worker(EchoSTT))
+        # Raw PCM16 stands in for the WAV file; no samples crashes the model.
+        (crashed,) = [f async for f in service.run_stt(b"")]
+        assert isinstance(crashed, ErrorFrame)
+        assert "exited" in crashed.error
+        (heard,) = [f async for f in service.run_stt(b"\0\0" * 3)]
+        assert isinstance(heard, TranscriptionFrame)
+        assert heard.text == "3 0.0"
+
+    def test_needs_an_executor_or_a_worker(self):
+        from paty.runtime.stt_service import MLXAudioSTTService
+
+        with pytest.raises(ValueError, match="compute_executor or a worker"):
+            MLXAudioSTTService()